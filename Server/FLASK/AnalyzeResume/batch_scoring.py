@@ -0,0 +1,220 @@
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+from AnalyzeResume.nlp import candidate_names, names_enabled
+from AnalyzeResume.pdf_extraction import PdfExtractionError, PdfExtractor, read_source
+from AnalyzeResume.resume_analyzer import SKILL_MATCHER, SKILL_TO_ROLE, match_target_role, pattern_skills
+
+logger = logging.getLogger('resume_batch')
+
+# Extraction processes used for batches (separate from the per-request pool)
+BATCH_EXTRACTION_WORKERS = int(os.environ.get('BATCH_EXTRACTION_WORKERS', os.cpu_count() or 2))
+
+# The known skills, matched exactly as the single-resume report matches them
+VOCABULARY = sorted(SKILL_TO_ROLE)
+SKILL_INDEX = {skill: i for i, skill in enumerate(VOCABULARY)}
+VOCABULARY_MATCHER = SKILL_MATCHER
+# Skills that start or end with a non-word character ("c++"): whether they
+# appear as a whole word follows regex \b semantics, checked directly
+EDGE_PATTERNS = {
+    skill: re.compile(r'\b' + re.escape(skill) + r'\b')
+    for skill in VOCABULARY if not (skill[0].isalnum() and skill[-1].isalnum())
+}
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_batch_extractor():
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = PdfExtractor(workers=BATCH_EXTRACTION_WORKERS)
+    return _extractor
+
+
+def source_name(source, index):
+    """Display name for an upload, path or stream"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    return getattr(source, 'filename', None) or getattr(source, 'name', None) or f"resume-{index + 1}"
+
+
+def extract_texts(sources):
+    """Extract every PDF concurrently; returns a list of text-or-PdfExtractionError"""
+    extractor = get_batch_extractor()
+    # Read uploads up front so request streams are only touched by this thread
+    payloads = [read_source(source) for source in sources]
+
+    def extract(data):
+        try:
+            return extractor.extract(data)["text"]
+        except PdfExtractionError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max(1, extractor.workers)) as pool:
+        return list(pool.map(extract, payloads))
+
+
+def term_matrix(texts):
+    """
+    One matcher pass per resume gives the skills extract_skills() would find:
+    a sparse (documents x vocabulary) count matrix, and a same-shaped 0/1
+    matrix of the skills present in their own spelling as whole words (what
+    the ATS keyword score counts). vocabulary is VOCABULARY followed by any
+    pattern-matched skills found in this batch. Also returns each
+    document's whitespace token count.
+    """
+    vocabulary, index = list(VOCABULARY), dict(SKILL_INDEX)
+    rows, cols, counts, in_context = [], [], [], []
+    token_counts = np.zeros(len(texts))
+    for row, text in enumerate(texts):
+        lower = text.lower()
+        token_counts[row] = len(lower.split())
+        matched, exact = Counter(), set()
+        for start, end, skill in VOCABULARY_MATCHER.iter_matches(lower):
+            matched[skill] += 1
+            if end - start == len(skill) and lower[start:end] == skill:
+                exact.add(skill)
+        for skill, count in matched.items():
+            rows.append(row)
+            cols.append(index[skill])
+            counts.append(count)
+            edge = EDGE_PATTERNS.get(skill)
+            in_context.append(skill in exact if edge is None else edge.search(lower) is not None)
+        # Pattern-matched skills are whole words by construction
+        for skill in pattern_skills(lower, matched):
+            if skill not in index:
+                index[skill] = len(vocabulary)
+                vocabulary.append(skill)
+            rows.append(row)
+            cols.append(index[skill])
+            counts.append(max(1, lower.count(skill)))
+            in_context.append(True)
+    shape = (len(texts), len(vocabulary))
+    matrix = sparse.csr_matrix((counts, (rows, cols)), shape=shape, dtype=np.float64)
+    keywords = sparse.csr_matrix((in_context, (rows, cols)), shape=shape, dtype=np.float64)
+    return matrix, keywords, vocabulary, token_counts
+
+
+def job_vectors(job_title, job_description=None, vocabulary=VOCABULARY):
+    """
+    Indicator vectors over vocabulary for the target role's critical skills
+    and the job description, plus the number of critical skills (some may
+    not be in the vocabulary at all, but still count as missing).
+    """
+    target_role, critical_skills = match_target_role(job_title)
+    critical = np.array([skill in critical_skills for skill in vocabulary], dtype=np.float64)
+    described = np.zeros(len(vocabulary))
+    if job_description:
+        job_desc_lower = job_description.lower()
+        described[[i for i, skill in enumerate(vocabulary) if skill in job_desc_lower]] = 1
+    return target_role, critical, described, len(critical_skills)
+
+
+def score_texts(texts, names=None, job_title=None, job_description=None, top_skills=10, people=None):
+    """
+    Score already extracted resume texts together and return them ranked.
+
+    Skills are found per resume exactly as in the single-resume report, and
+    the scores match its values, computed for the whole batch as sparse
+    matrix products over the skill vocabulary:
+      keywordScore   - skills present as whole words (ATS keyword optimization, max 20)
+      jobMatchScore  - share of the target role's critical skills present, plus
+                       2 points per skill also in the job description (max 20)
+      relevantDensity - combined density (%) of the critical/job skills
+    Candidates are ranked by jobMatchScore, then keywordScore, then relevantDensity.
+    people optionally gives each resume's candidateName.
+    """
+    names = names or [f"resume-{i + 1}" for i in range(len(texts))]
+    if not texts:
+        return []
+    counts, keywords, vocabulary, token_counts = term_matrix(texts)
+    present = (counts > 0).astype(np.float64)
+
+    keyword_scores = np.minimum(20, np.asarray(keywords.sum(axis=1)).ravel())
+    # Densities in percent of each document's tokens
+    scale = 100 / np.maximum(token_counts, 1)
+    density = sparse.diags(scale) @ counts
+
+    if job_title:
+        target_role, critical, described, critical_total = job_vectors(job_title, job_description, vocabulary)
+        if critical_total:
+            match = present @ critical / critical_total * 100
+            match = np.minimum(100, match + np.minimum(20, (present @ described) * 2))
+        else:
+            match = np.full(len(texts), 50.0)  # Default moderate score, as for a single resume
+        relevant = np.maximum(critical, described)
+    else:
+        target_role = None
+        match = np.zeros(len(texts))
+        relevant = np.ones(len(vocabulary))
+    job_match_scores = np.round(match).astype(int)
+    relevant_density = density @ relevant
+
+    order = np.lexsort((-relevant_density, -keyword_scores, -job_match_scores))
+    results = []
+    for rank, row in enumerate(order, start=1):
+        start, end = counts.indptr[row], counts.indptr[row + 1]
+        skill_ids = counts.indices[start:end]
+        row_density = counts.data[start:end] * scale[row]
+        strongest = np.argsort(-row_density, kind='stable')[:top_skills]
+        results.append({
+            "rank": rank,
+            "fileName": names[row],
+            **({"candidateName": people[row]} if people is not None else {}),
+            "jobMatchScore": int(job_match_scores[row]),
+            "keywordScore": int(keyword_scores[row]),
+            "relevantDensity": round(float(relevant_density[row]), 2),
+            "targetRole": target_role,
+            "wordCount": int(token_counts[row]),
+            "skills": sorted(vocabulary[i] for i in skill_ids),
+            "keywordDensity": {
+                vocabulary[skill_ids[i]]: {
+                    "count": int(counts.data[start + i]),
+                    "density": round(float(row_density[i]), 2)
+                }
+                for i in strongest
+            }
+        })
+    return results
+
+
+def analyze_resumes_batch(files, job_title=None, job_description=None):
+    """
+    Rank many resumes against one job: parallel text extraction, then
+    vectorized scoring over the whole batch (see score_texts). files may be
+    paths, bytes, binary streams or uploaded FileStorage objects. Resumes
+    that could not be read are listed after the ranked ones with their error.
+    """
+    names = [source_name(source, i) for i, source in enumerate(files)]
+    extracted = extract_texts(files)
+
+    texts, text_names, failed = [], [], []
+    for name, result in zip(names, extracted):
+        if isinstance(result, PdfExtractionError):
+            failed.append({"fileName": name, "rank": None, **result.to_dict()})
+        elif not result.strip():
+            failed.append({"fileName": name, "rank": None, "error": "Could not extract text from resume"})
+        else:
+            texts.append(result)
+            text_names.append(name)
+
+    # Opt-in (SPACY_COMPONENTS=ner): names for the whole batch go through one nlp.pipe stream
+    people = candidate_names(texts) if names_enabled() else None
+    ranked = score_texts(texts, text_names, job_title, job_description, people=people)
+    logger.info(f"Scored {len(ranked)} resumes ({len(failed)} failed)")
+    return {
+        "jobTitle": job_title,
+        "count": len(files),
+        "scored": len(ranked),
+        "candidates": ranked + failed
+    }
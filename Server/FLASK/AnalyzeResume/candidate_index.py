@@ -0,0 +1,282 @@
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from AnalyzeResume.batch_scoring import VOCABULARY_MATCHER
+
+logger = logging.getLogger('candidate_index')
+
+# SQLite file holding every indexed candidate (shared by all workers)
+CANDIDATE_INDEX_DB = os.environ.get('CANDIDATE_INDEX_DB', 'data/candidates.sqlite3')
+# Changes kept for other processes to replay; one further behind reloads fully
+CHANGE_LOG_SIZE = 10000
+# Rows are renumbered once removed or replaced candidates make up this share of them
+COMPACT_DEAD_FRACTION = 0.25
+
+
+def skill_counts(text):
+    """Word-bounded occurrences of each known skill in text"""
+    return Counter(skill for _, _, skill in VOCABULARY_MATCHER.iter_matches(text.lower()))
+
+
+class CandidateIndex:
+    """
+    Persistent inverted index of skill -> candidate postings with TF-IDF ranking.
+
+    Postings (candidate, skill, term frequency) live in SQLite, so the index
+    survives restarts and candidates can be added, replaced or removed one
+    at a time. Each process keeps an in-memory copy: per-skill NumPy arrays
+    of candidate rows and log-scaled term frequencies. A search only touches
+    the postings of the skills in the job description, accumulating
+    tf-idf cosine scores for the candidates that have them, so answering a
+    job against tens of thousands of resumes takes milliseconds.
+    """
+
+    def __init__(self, db_path=CANDIDATE_INDEX_DB):
+        self.db_path = db_path
+        self._reset()
+        # A forked worker must open its own SQLite connection
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._db = None
+        self._loaded_version = None
+        self._last_change = 0
+        self._ids = []            # row -> candidate id (None once removed)
+        self._names = []          # row -> display name
+        self._skills = []         # row -> skills with a posting for it
+        self._rows = {}           # candidate id -> row
+        self._postings = {}       # skill -> {row: tf}
+        self._arrays = {}         # skill -> (rows, log tf) cache, dropped when the skill changes
+        self._norms = None        # row -> tf-idf vector norm, recomputed after changes
+
+    def _connection(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.executescript(
+                'CREATE TABLE IF NOT EXISTS candidates ('
+                '  id TEXT PRIMARY KEY, name TEXT, indexed_at REAL NOT NULL);'
+                'CREATE TABLE IF NOT EXISTS postings ('
+                '  skill TEXT NOT NULL, candidate_id TEXT NOT NULL, tf INTEGER NOT NULL,'
+                '  PRIMARY KEY (candidate_id, skill));'
+                'CREATE INDEX IF NOT EXISTS postings_skill ON postings (skill);'
+                'CREATE TABLE IF NOT EXISTS changes ('
+                '  seq INTEGER PRIMARY KEY AUTOINCREMENT, candidate_id TEXT NOT NULL);'
+            )
+        return self._db
+
+    def _sync(self):
+        """Bring the in-memory copy up to date with changes committed by other processes"""
+        db = self._connection()
+        version = db.execute('PRAGMA data_version').fetchone()[0]
+        if version == self._loaded_version:
+            return
+        oldest = db.execute('SELECT MIN(seq) FROM changes').fetchone()[0]
+        if self._loaded_version is not None and (oldest is None or oldest <= self._last_change + 1):
+            self._replay_changes(db)
+        else:
+            self._load(db)
+        self._loaded_version = version
+
+    def _replay_changes(self, db):
+        changed = db.execute('SELECT seq, candidate_id FROM changes WHERE seq > ?', (self._last_change,)).fetchall()
+        for candidate_id in dict.fromkeys(candidate_id for _, candidate_id in changed):
+            self._drop_row(candidate_id)
+            row = db.execute('SELECT name FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
+            if row is not None:
+                new_row = self._add_row(candidate_id, row[0])
+                for skill, tf in db.execute('SELECT skill, tf FROM postings WHERE candidate_id = ?', (candidate_id,)):
+                    self._add_posting(new_row, skill, tf)
+        if changed:
+            self._last_change = changed[-1][0]
+            self._norms = None
+
+    def _load(self, db):
+        started = time.perf_counter()
+        self._last_change = db.execute('SELECT COALESCE(MAX(seq), 0) FROM changes').fetchone()[0]
+        self._ids, self._names, self._skills, self._rows = [], [], [], {}
+        self._postings, self._arrays, self._norms = {}, {}, None
+        for candidate_id, name in db.execute('SELECT id, name FROM candidates'):
+            self._add_row(candidate_id, name)
+        for skill, candidate_id, tf in db.execute('SELECT skill, candidate_id, tf FROM postings'):
+            row = self._rows.get(candidate_id)
+            if row is not None:
+                self._add_posting(row, skill, tf)
+        logger.info(f"Loaded {len(self._rows)} candidates in {time.perf_counter() - started:.2f}s")
+
+    def _add_row(self, candidate_id, name):
+        row = len(self._ids)
+        self._ids.append(candidate_id)
+        self._names.append(name)
+        self._skills.append([])
+        self._rows[candidate_id] = row
+        return row
+
+    def _add_posting(self, row, skill, tf):
+        self._postings.setdefault(skill, {})[row] = tf
+        self._skills[row].append(skill)
+        self._arrays.pop(skill, None)
+
+    def _drop_row(self, candidate_id):
+        row = self._rows.pop(candidate_id, None)
+        if row is None:
+            return
+        for skill in self._skills[row]:
+            postings = self._postings[skill]
+            del postings[row]
+            if not postings:
+                del self._postings[skill]
+            self._arrays.pop(skill, None)
+        self._ids[row] = self._names[row] = self._skills[row] = None
+        if len(self._ids) - len(self._rows) > COMPACT_DEAD_FRACTION * len(self._ids):
+            self._compact()
+
+    def _compact(self):
+        """Renumber the live rows densely so per-row arrays don't grow with removed candidates"""
+        live = [row for row, candidate_id in enumerate(self._ids) if candidate_id is not None]
+        renumbered = {row: new for new, row in enumerate(live)}
+        self._ids = [self._ids[row] for row in live]
+        self._names = [self._names[row] for row in live]
+        self._skills = [self._skills[row] for row in live]
+        self._rows = {candidate_id: row for row, candidate_id in enumerate(self._ids)}
+        self._postings = {skill: {renumbered[row]: tf for row, tf in postings.items()}
+                          for skill, postings in self._postings.items()}
+        self._arrays, self._norms = {}, None
+
+    def add(self, candidate_id, text, name=None):
+        """Index (or re-index) one candidate's resume text; returns the skills found"""
+        counts = skill_counts(text)
+        with self._lock:
+            self._sync()
+            db = self._connection()
+            with db:
+                db.execute('DELETE FROM postings WHERE candidate_id = ?', (candidate_id,))
+                db.execute('INSERT OR REPLACE INTO candidates VALUES (?, ?, ?)', (candidate_id, name, time.time()))
+                db.executemany('INSERT INTO postings VALUES (?, ?, ?)',
+                               [(skill, candidate_id, tf) for skill, tf in counts.items()])
+                self._log_change(db, candidate_id)
+            # Apply the same change in memory instead of reloading everything
+            self._drop_row(candidate_id)
+            row = self._add_row(candidate_id, name)
+            for skill, tf in counts.items():
+                self._add_posting(row, skill, tf)
+            self._norms = None
+            self._loaded_version = db.execute('PRAGMA data_version').fetchone()[0]
+        return {"candidateId": candidate_id, "name": name, "skills": sorted(counts)}
+
+    def remove(self, candidate_id):
+        with self._lock:
+            self._sync()
+            if candidate_id not in self._rows:
+                return False
+            db = self._connection()
+            with db:
+                db.execute('DELETE FROM postings WHERE candidate_id = ?', (candidate_id,))
+                db.execute('DELETE FROM candidates WHERE id = ?', (candidate_id,))
+                self._log_change(db, candidate_id)
+            self._drop_row(candidate_id)
+            self._norms = None
+            self._loaded_version = db.execute('PRAGMA data_version').fetchone()[0]
+        return True
+
+    def _log_change(self, db, candidate_id):
+        seq = db.execute('INSERT INTO changes (candidate_id) VALUES (?)', (candidate_id,)).lastrowid
+        if seq % 1000 == 0:
+            db.execute('DELETE FROM changes WHERE seq <= ?', (seq - CHANGE_LOG_SIZE,))
+        # Our own change is already applied in memory; don't replay it
+        if seq == self._last_change + 1:
+            self._last_change = seq
+
+    def __len__(self):
+        with self._lock:
+            self._sync()
+            return len(self._rows)
+
+    def _idf(self, skill):
+        # Smoothed idf, as in scikit-learn's TfidfTransformer
+        return math.log((1 + len(self._rows)) / (1 + len(self._postings.get(skill, ())))) + 1
+
+    def _posting_arrays(self, skill):
+        arrays = self._arrays.get(skill)
+        if arrays is None:
+            postings = self._postings.get(skill, {})
+            rows = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            tfs = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            arrays = self._arrays[skill] = (rows, 1 + np.log(tfs))
+        return arrays
+
+    def _document_norms(self):
+        if self._norms is None:
+            squares = np.zeros(len(self._ids))
+            for skill in self._postings:
+                rows, weights = self._posting_arrays(skill)
+                squares[rows] += (weights * self._idf(skill)) ** 2
+            self._norms = np.sqrt(squares)
+        return self._norms
+
+    def search(self, job_text, k=10):
+        """Top-k candidates by tf-idf cosine similarity between their skills and the job text"""
+        query = skill_counts(job_text)
+        with self._lock:
+            self._sync()
+            if not query or not self._rows:
+                return []
+            norms = self._document_norms()
+            scores = np.zeros(len(self._ids))
+            query_weights = {}
+            for skill, tf in query.items():
+                if skill not in self._postings:
+                    continue
+                idf = self._idf(skill)
+                query_weights[skill] = (1 + math.log(tf)) * idf
+                rows, weights = self._posting_arrays(skill)
+                scores[rows] += query_weights[skill] * weights * idf
+            if not query_weights:
+                return []
+            query_norm = math.sqrt(sum(w * w for w in query_weights.values()))
+            hits = np.flatnonzero(scores)
+            scores = scores[hits] / (norms[hits] * query_norm)
+            k = min(k, len(hits))
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(hits) else np.arange(len(hits))
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [
+                {
+                    "candidateId": self._ids[hits[i]],
+                    "name": self._names[hits[i]],
+                    "score": round(float(scores[i]), 4),
+                    "matchedSkills": sorted(s for s in query_weights if hits[i] in self._postings[s]),
+                }
+                for i in top
+            ]
+
+    def stats(self):
+        with self._lock:
+            self._sync()
+            return {
+                "candidates": len(self._rows),
+                "skills": len(self._postings),
+                "postings": sum(len(p) for p in self._postings.values()),
+                "database": self.db_path,
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CandidateIndex()
+    return _index
@@ -0,0 +1,70 @@
+import re
+from collections import Counter
+
+# Maximal runs of word characters; a term made only of word characters
+# matches \bterm\b exactly when it equals one of these runs
+_WORD_RUN = re.compile(r'\w+')
+
+
+class ResumeDocument:
+    """
+    A resume tokenized and sectionized once, then shared by every scorer.
+
+    Holds the text and its lowercase form, line offsets, section texts and
+    their character spans, the whitespace token array with a frequency
+    Counter, and the set of word runs for O(1) whole-word lookups. Scorers
+    read these instead of re-lowercasing, re-splitting and re-scanning the
+    text for every skill.
+    """
+
+    def __init__(self, text, sections=None, section_lines=None):
+        self.text = text
+        self.lower = text.lower()
+        self.lines = text.split('\n')
+        self.line_offsets = []
+        offset = 0
+        for line in self.lines:
+            self.line_offsets.append(offset)
+            offset += len(line) + 1
+
+        # Lowercased whitespace tokens, as used for word counts and keyword density
+        self.tokens = self.lower.split()
+        self.token_counts = Counter(self.tokens)
+        self.words = set(_WORD_RUN.findall(self.lower))
+
+        self.sections = sections
+        self.section_spans = {}
+        for name, (first, last) in (section_lines or {}).items():
+            self.section_spans[name] = self._char_span(first, last)
+        self._lowered = {text: self.lower}
+
+    def _char_span(self, first, last):
+        """Character offsets covering lines [first, last)"""
+        if last <= first:
+            start = self.line_offsets[first] if first < len(self.lines) else len(self.text)
+            return start, start
+        return self.line_offsets[first], self.line_offsets[last - 1] + len(self.lines[last - 1])
+
+    def lowered(self, fragment):
+        """Lowercase form of a fragment of the text (e.g. a section), cached"""
+        lower = self._lowered.get(fragment)
+        if lower is None:
+            lower = self._lowered[fragment] = fragment.lower()
+        return lower
+
+    def count(self, term):
+        """Occurrences of a lowercase term: whole tokens for one word, substrings for phrases"""
+        if " " in term:
+            return self.lower.count(term)
+        return self.token_counts[term]
+
+    def contains_word(self, term):
+        """Same result as re.search(r'\\b' + re.escape(term) + r'\\b', self.lower)"""
+        if _WORD_RUN.fullmatch(term):
+            return term in self.words
+        return re.search(r'\b' + re.escape(term) + r'\b', self.lower) is not None
+
+
+def as_document(text):
+    """Accept a plain string or an existing ResumeDocument"""
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
@@ -0,0 +1,109 @@
+import logging
+import os
+import re
+
+logger = logging.getLogger('resume_nlp')
+
+# spaCy package name or path of a saved pipeline
+SPACY_MODEL = os.environ.get('SPACY_MODEL', 'en_core_web_sm')
+# Components to load, comma-separated; every other trained component is
+# excluded and never read from disk. Empty (the default) skips spaCy entirely;
+# 'ner' opts in to candidate names in batch rankings; 'all' loads the full pipeline
+SPACY_COMPONENTS = os.environ.get('SPACY_COMPONENTS', '')
+# nlp.pipe settings for multi-resume workloads; n_process > 1 forks workers,
+# so keep it at 1 inside web workers and raise it for CLI/batch jobs
+SPACY_N_PROCESS = int(os.environ.get('SPACY_N_PROCESS', 1))
+SPACY_BATCH_SIZE = int(os.environ.get('SPACY_BATCH_SIZE', 64))
+
+# Trained components shipped in the en_core_web_* pipelines
+TRAINED_COMPONENTS = ('tok2vec', 'tagger', 'morphologizer', 'parser', 'senter',
+                      'attribute_ruler', 'lemmatizer', 'ner', 'entity_ruler')
+# What each component needs from earlier ones (ner has its own embedding layer)
+COMPONENT_DEPENDENCIES = {
+    'tagger': ['tok2vec'],
+    'morphologizer': ['tok2vec'],
+    'parser': ['tok2vec'],
+    'attribute_ruler': ['tagger'],
+    'lemmatizer': ['attribute_ruler', 'tagger'],
+}
+
+# The candidate's name is at the top of the resume; only this much is tagged
+NAME_SEARCH_CHARS = 500
+NAME_REJECT = re.compile(r'[\d@/:|]')
+
+
+def required_components(components=SPACY_COMPONENTS):
+    """Requested components plus the ones they depend on"""
+    needed = set()
+    pending = [c.strip() for c in components.split(',') if c.strip()]
+    while pending:
+        component = pending.pop()
+        if component not in needed:
+            needed.add(component)
+            pending.extend(COMPONENT_DEPENDENCIES.get(component, []))
+    return needed
+
+
+def names_enabled(components=SPACY_COMPONENTS):
+    """Whether the configured pipeline includes NER for candidate names"""
+    return components.strip() == 'all' or 'ner' in required_components(components)
+
+
+def load_nlp(model=SPACY_MODEL, components=SPACY_COMPONENTS):
+    """spaCy pipeline with only the configured components; None when none are, or spaCy/the model is missing"""
+    if not components.strip():
+        return None
+    try:
+        import spacy
+    except ImportError:
+        logger.warning("spaCy is not installed; NLP features are disabled")
+        return None
+    exclude = [] if components.strip() == 'all' else \
+        [c for c in TRAINED_COMPONENTS if c not in required_components(components)]
+    try:
+        nlp = spacy.load(model, exclude=exclude)
+    except OSError:
+        logger.warning(f"Spacy model {model} not found. Using simple tokenization.")
+        return None
+    logger.info(f"Loaded {model} with components {nlp.pipe_names}")
+    return nlp
+
+
+def get_nlp():
+    from model_registry import registry
+    return registry.get('spacy')
+
+
+def _name_from_doc(doc):
+    for ent in doc.ents:
+        name = " ".join(ent.text.split())
+        if ent.label_ == 'PERSON' and 2 <= len(name.split()) <= 4 and not NAME_REJECT.search(name):
+            return name
+    return None
+
+
+def _header(text):
+    return text[:NAME_SEARCH_CHARS]
+
+
+def _ner_pipeline():
+    nlp = get_nlp()
+    return nlp if nlp is not None and 'ner' in nlp.pipe_names else None
+
+
+def candidate_name(text):
+    """Candidate's name from the top of the resume (spaCy NER), or None"""
+    nlp = _ner_pipeline()
+    if nlp is None:
+        return None
+    return _name_from_doc(nlp(_header(text)))
+
+
+def candidate_names(texts, n_process=SPACY_N_PROCESS, batch_size=SPACY_BATCH_SIZE):
+    """candidate_name for many resumes through one nlp.pipe stream"""
+    texts = list(texts)
+    nlp = _ner_pipeline()
+    if nlp is None:
+        return [None] * len(texts)
+    docs = nlp.pipe((_header(t) for t in texts), n_process=n_process, batch_size=batch_size)
+    return [_name_from_doc(doc) for doc in docs]
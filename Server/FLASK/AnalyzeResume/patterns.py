@@ -0,0 +1,91 @@
+import re
+
+# ---------------------------
+# Precompiled patterns shared by the resume analyzer
+#
+# Patterns whose matches are only tested for presence are merged into one
+# alternation. Patterns whose individual match counts or capture groups
+# feed a score are kept separate so results stay identical.
+# ---------------------------
+
+# Section headers, checked in priority order (first match wins)
+SECTION_HEADERS = {
+    "summary": r'^(?:professional\s+)?summary|profile|objective|about\s+me',
+    "experience": r'^(?:work\s+)?experience|employment|work\s+history|career',
+    "education": r'^education|academic|qualification',
+    "skills": r'^(?:technical\s+)?skills|technologies|expertise|competencies',
+    "projects": r'^projects|personal\s+projects|portfolio|works',
+    "certifications": r'^certifications|certificates|qualifications',
+    "contact": r'^contact|personal\s+details|contact\s+information',
+}
+SECTION_PATTERNS = {name: re.compile(header, re.IGNORECASE) for name, header in SECTION_HEADERS.items()}
+# Cheap prefilter: a line matching none of the section patterns is body text
+ANY_SECTION_HEADER = re.compile('|'.join(f'(?:{header})' for header in SECTION_HEADERS.values()), re.IGNORECASE)
+
+# Skills not in the dictionary
+TECH_PATTERNS = [
+    re.compile(r'\b[A-Za-z]+[Jj][Ss]\b'),  # Match frameworks ending with JS/js
+    re.compile(r'\b[A-Za-z]+\.[A-Za-z]+\b'),  # Match tech with dots
+    re.compile(r'\b[A-Za-z]+(?:-[A-Za-z]+)+\b'),  # Match hyphenated tech names
+]
+
+# Contact details
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_INTERNATIONAL = re.compile(r'\b(?:\+\d{1,3}[-\s]?)?\d{3}[-\s]?\d{3}[-\s]?\d{4}\b')
+PHONE_SIMPLE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+SOCIAL_HANDLE = re.compile(r'(?:linkedin|github|twitter|ï|§)\s*[a-zA-Z0-9_-]+', re.IGNORECASE)
+LINKEDIN = re.compile(
+    r"linkedin\.com\/in\/[a-zA-Z0-9-_%]+"
+    r"|linkedin:?\s*[a-zA-Z0-9-_%]+"
+    r"|linkedin\.com\/[a-zA-Z0-9-_%]+"
+)
+PORTFOLIO_OR_GITHUB = re.compile(
+    r"github\.com\/[a-zA-Z0-9-_%]+"
+    r"|github:?\s*[a-zA-Z0-9-_%]+"
+    r"|portfolio:?\s*https?:\/\/[a-zA-Z0-9-_%\.\/]+"
+    r"|portfolio:?\s*[a-zA-Z0-9-_%\.\/]+\.(com|io|net|org)"
+    r"|(website|site|blog):?\s*https?:\/\/[a-zA-Z0-9-_%\.\/]+"
+    r"|Link\s*$"  # For "Link" text at end of project descriptions
+    r"|§\s*[a-zA-Z0-9-_%]+",  # For LinkedIn/GitHub usernames after § symbol
+    re.IGNORECASE
+)
+
+# Experience
+YEARS_OF_EXPERIENCE = [
+    re.compile(r'(\d+)\+?\s*years?\s+(?:of\s+)?experience'),
+    re.compile(r'experience\s+(?:of\s+)?(\d+)\+?\s*years?'),
+    re.compile(r'worked\s+(?:for\s+)?(\d+)\+?\s*years?'),
+]
+# Each pattern is counted separately, as before
+JOB_DATE_RANGES = [
+    re.compile(r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]* \d{4}\s*[–-]\s*((jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]* \d{4}|present|current)'),
+    re.compile(r'\b\d{4}\s*[–-]\s*(\d{4}|present|current)'),
+    re.compile(r'\b\d{2}/\d{4}\s*[–-]\s*(\d{2}/\d{4}|present|current)'),
+]
+GAP_DATE_RANGES = [
+    re.compile(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]* (\d{4})\s*[–-]\s*((jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]* (\d{4})|present|current)'),
+    re.compile(r'(\d{4})\s*[–-]\s*((\d{4})|present|current)'),
+]
+ANY_YEAR = re.compile(r'\b(20\d{2}|19\d{2})\b')
+
+# Content quality
+METRICS = re.compile(r'\b\d+%|\$\d+|\d+\s+(?:users|clients|team|people|developers|students)\b')
+QUANTIFIED_ACHIEVEMENT = re.compile(r'\b\d+%|\$\d+|\d+ (users|clients|customers|projects)\b')
+PERSONAL_PRONOUN = re.compile(r'\b(I|my|me)\b', re.IGNORECASE)
+PAST_TENSE_VERB = re.compile(r'\b(managed|developed|created|implemented|led|designed)\b')
+PRESENT_TENSE_VERB = re.compile(r'\b(manage|develop|create|implement|lead|design)\b')
+
+# Education
+DEGREE_PATTERNS = {
+    "phd": re.compile(r'\b(?:ph\.?d|doctorate|doctor of philosophy)\b'),
+    "masters": re.compile(r'\bm\.?(?:sc|tech|eng|s|a|b\.?a|arch|phil|fa|com)\b|master of|masters'),
+    "bachelors": re.compile(r'\bb\.?(?:tech|sc|a|arch|des|com)\b|bachelor of|bachelors'),
+    "diploma": re.compile(r'\bdiploma\b'),
+}
+INSTITUTION_KEYWORD = re.compile(r'(?i)college|university|institute|school')
+INSTITUTION = re.compile(r'(?i)([A-Z][A-Za-z\s]+(?:College|University|Institute|School)[A-Za-z\s]*)')
+GPA = re.compile(r'(?i)(?:CGPA|GPA):\s*(\d+\.\d+)')
+PERCENTAGE = re.compile(r'(?i)percentage:\s*(\d+(?:\.\d+)?)')
+GRADUATION_YEAR = re.compile(r'(20\d{2})(?:\s*[-–]\s*(20\d{2}|present))?')
+ACADEMIC_HONORS = re.compile(r'\b(gpa|grade|cum laude|honors)\b')
+RESUME_FILE_NAME = re.compile(r'resume|cv', re.IGNORECASE)
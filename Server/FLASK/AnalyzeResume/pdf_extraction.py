@@ -0,0 +1,365 @@
+import io
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+import pdfplumber
+import pypdfium2
+
+logger = logging.getLogger('pdf_extraction')
+
+# Worker processes (0 extracts inline, without a hard timeout)
+PDF_WORKERS = int(os.environ.get('PDF_EXTRACTION_WORKERS', 2))
+# Wall-clock budget per document before its worker is killed
+PDF_TIMEOUT = float(os.environ.get('PDF_EXTRACTION_TIMEOUT', 10))
+# Pages beyond this are ignored; resumes rarely need more
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 10))
+# Recycle a worker after this many documents to contain memory creep
+PDF_MAX_TASKS_PER_CHILD = int(os.environ.get('PDF_MAX_TASKS_PER_CHILD', 50))
+# auto: pdfium fast path, pdfplumber when it yields nothing; or force one backend
+PDF_TEXT_BACKEND = os.environ.get('PDF_TEXT_BACKEND', 'auto')
+# How workers are started. The server already runs model, batcher and OpenCV
+# threads, and forking such a process can deadlock the child, so workers
+# come from a forkserver that imports only this module (spawn where
+# forkserver is unavailable)
+PDF_START_METHOD = os.environ.get('PDF_START_METHOD', 'forkserver')
+# How long a request waits for a free worker before giving up with 'busy'
+PDF_ACQUIRE_TIMEOUT = float(os.environ.get('PDF_ACQUIRE_TIMEOUT', PDF_TIMEOUT))
+
+
+class PdfExtractionError(Exception):
+    """Extraction failure with a machine-readable code: invalid_pdf, timeout, worker_crashed or busy"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+    def to_dict(self):
+        return {"error": self.message, "errorCode": self.code}
+
+
+def read_source(source):
+    """Return the raw bytes of a path, bytes object or binary stream"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source.read()
+
+
+def _extract_pdfium(data, max_pages):
+    """Fast path: PDFium's native text layer, several times faster than pdfplumber"""
+    pdf = pypdfium2.PdfDocument(data)
+    try:
+        page_count = len(pdf)
+        texts = []
+        for i in range(min(page_count, max_pages)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+        return texts, page_count
+    finally:
+        pdf.close()
+
+
+def _extract_pdfplumber(data, max_pages):
+    """Layout-aware extraction in pure Python; slower but groups words by position"""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        page_count = len(pdf.pages)
+        return [page.extract_text() or "" for page in pdf.pages[:max_pages]], page_count
+
+
+TEXT_BACKENDS = {
+    "pdfium": _extract_pdfium,
+    "pdfplumber": _extract_pdfplumber,
+}
+
+
+def _extract(data, max_pages, backend=PDF_TEXT_BACKEND):
+    # auto tries pdfium first and falls back when it fails or finds no text
+    candidates = ["pdfium", "pdfplumber"] if backend == "auto" else [backend]
+    errors = []
+    for name in candidates:
+        try:
+            texts, page_count = TEXT_BACKENDS[name](data, max_pages)
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+            continue
+        text = "\n".join(texts)
+        if text.strip() or name == candidates[-1]:
+            return {
+                "text": text,
+                "backend": name,
+                "pageCount": page_count,
+                "pagesExtracted": len(texts),
+                "truncated": page_count > max_pages,
+            }
+    return {"error": f"Could not parse PDF: {'; '.join(errors)}", "errorCode": "invalid_pdf"}
+
+
+def _iter_pages(data, max_pages, backend=PDF_TEXT_BACKEND):
+    """
+    Yield page texts one at a time so callers can start on page 1 before
+    later pages are parsed. auto uses PDFium and switches to pdfplumber if
+    PDFium finds no text at all. Raises PdfExtractionError for unreadable PDFs.
+    """
+    pdf = None
+    if backend in ("auto", "pdfium"):
+        try:
+            pdf = pypdfium2.PdfDocument(data)
+        except Exception as e:
+            if backend == "pdfium":
+                raise PdfExtractionError("invalid_pdf", f"Could not parse PDF: {e}")
+
+    if pdf is not None:
+        try:
+            # Hold back leading empty pages until we know PDFium can read this file
+            held_empty = 0
+            found_text = False
+            for i in range(min(len(pdf), max_pages)):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range().replace("\r\n", "\n")
+                textpage.close()
+                page.close()
+                if not found_text and not text.strip() and backend == "auto":
+                    held_empty += 1
+                    continue
+                if not found_text:
+                    found_text = True
+                    yield from [""] * held_empty
+                yield text
+        finally:
+            pdf.close()
+        if found_text or backend == "pdfium":
+            return
+
+    try:
+        with pdfplumber.open(io.BytesIO(data)) as plumber_pdf:
+            for page in plumber_pdf.pages[:max_pages]:
+                yield page.extract_text() or ""
+    except Exception as e:
+        raise PdfExtractionError("invalid_pdf", f"Could not parse PDF: {e}")
+
+
+def _worker_main(conn):
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        data, max_pages, backend, by_page = task
+        if not by_page:
+            conn.send(_extract(data, max_pages, backend))
+            continue
+        # Page by page: ('page', text)... then ('done', None) or ('error', {...})
+        try:
+            for text in _iter_pages(data, max_pages, backend):
+                conn.send(('page', text))
+            conn.send(('done', None))
+        except PdfExtractionError as e:
+            conn.send(('error', e.to_dict()))
+        except Exception as e:
+            conn.send(('error', {"error": f"Could not parse PDF: {e}", "errorCode": "invalid_pdf"}))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self):
+        # Ask explicitly: a child started by fork also holds our end of the
+        # pipe, so closing it alone would never reach it as EOF
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class PdfExtractor:
+    """
+    Pool of extraction processes with a hard per-document timeout.
+
+    Unlike ProcessPoolExecutor, each document is bound to one worker, so a
+    document that overruns its timeout is handled by killing only that
+    worker and starting a replacement. Workers are also replaced after
+    max_tasks_per_child documents.
+    """
+
+    def __init__(self, workers=PDF_WORKERS, timeout=PDF_TIMEOUT, max_pages=PDF_MAX_PAGES,
+                 max_tasks_per_child=PDF_MAX_TASKS_PER_CHILD, start_method=PDF_START_METHOD,
+                 acquire_timeout=PDF_ACQUIRE_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_tasks_per_child = max_tasks_per_child
+        self.acquire_timeout = acquire_timeout
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = 'spawn'
+        self._ctx = multiprocessing.get_context(start_method)
+        if start_method == 'forkserver':
+            # pdfplumber and pypdfium2 are imported once in the fork server,
+            # so each worker starts already warm
+            self._ctx.set_forkserver_preload([__name__])
+        self._reset()
+        # A forked server worker must not share the parent's pipes
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._idle = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._started < self.workers:
+                self._started += 1
+                return _Worker(self._ctx)
+        # Raises queue.Empty when every worker stays busy (or wedged) too long
+        return self._idle.get(timeout=self.acquire_timeout)
+
+    def _release(self, worker):
+        worker.tasks += 1
+        if worker.tasks >= self.max_tasks_per_child:
+            worker.stop()
+            worker = _Worker(self._ctx)
+        self._idle.put(worker)
+
+    def extract(self, source, backend=PDF_TEXT_BACKEND):
+        """Extract text from a path/bytes/stream; raises PdfExtractionError"""
+        if backend not in TEXT_BACKENDS and backend != "auto":
+            raise ValueError(f"Unknown PDF text backend: {backend}")
+        data = read_source(source)
+        if self.workers <= 0:
+            result = _extract(data, self.max_pages, backend)
+        else:
+            result = self._extract_in_worker(data, backend)
+
+        if "errorCode" in result:
+            raise PdfExtractionError(result["errorCode"], result["error"])
+        if result["truncated"]:
+            logger.info(f"PDF has {result['pageCount']} pages; extracted the first {result['pagesExtracted']}")
+        return result
+
+    def _busy(self):
+        return {"error": f"All PDF extraction workers busy for {self.acquire_timeout:g}s", "errorCode": "busy"}
+
+    def _extract_in_worker(self, data, backend):
+        try:
+            worker = self._acquire()
+        except queue.Empty:
+            return self._busy()
+        try:
+            worker.conn.send((data, self.max_pages, backend, False))
+            if not worker.conn.poll(self.timeout):
+                worker.kill()
+                self._idle.put(_Worker(self._ctx))
+                return {"error": f"PDF extraction timed out after {self.timeout:g}s", "errorCode": "timeout"}
+            result = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            worker.kill()
+            self._idle.put(_Worker(self._ctx))
+            return {"error": f"PDF extraction worker crashed: {e}", "errorCode": "worker_crashed"}
+        self._release(worker)
+        return result
+
+    def iter_pages(self, source, backend=PDF_TEXT_BACKEND):
+        """
+        Yield page texts as a worker extracts them; raises PdfExtractionError.
+
+        Same limits as extract(): the timeout covers the worker's time on the
+        whole document, and a worker that overruns, crashes or is abandoned
+        mid-document (the caller stopped iterating) is killed and replaced.
+        """
+        if backend not in TEXT_BACKENDS and backend != "auto":
+            raise ValueError(f"Unknown PDF text backend: {backend}")
+        data = read_source(source)
+        if self.workers <= 0:
+            yield from _iter_pages(data, self.max_pages, backend)
+            return
+        try:
+            worker = self._acquire()
+        except queue.Empty:
+            busy = self._busy()
+            raise PdfExtractionError(busy["errorCode"], busy["error"])
+
+        finished = False
+        try:
+            worker.conn.send((data, self.max_pages, backend, True))
+            remaining = self.timeout
+            while True:
+                # Only time spent waiting on the worker counts, not the caller's work between pages
+                waited = time.perf_counter()
+                if not worker.conn.poll(max(0.0, remaining)):
+                    raise PdfExtractionError("timeout", f"PDF extraction timed out after {self.timeout:g}s")
+                remaining -= time.perf_counter() - waited
+                kind, value = worker.conn.recv()
+                if kind == 'page':
+                    yield value
+                    continue
+                finished = True
+                if kind == 'error':
+                    raise PdfExtractionError(value["errorCode"], value["error"])
+                return
+        except (EOFError, OSError) as e:
+            raise PdfExtractionError("worker_crashed", f"PDF extraction worker crashed: {e}")
+        finally:
+            if finished:
+                self._release(worker)
+            else:
+                worker.kill()
+                self._idle.put(_Worker(self._ctx))
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_extractor():
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = PdfExtractor()
+    return _extractor
+
+
+def iter_pdf_pages(source):
+    """Page texts of a PDF, one at a time, from the shared extractor's workers"""
+    return get_extractor().iter_pages(source)
+
+
+def extract_pdf(source, layout=False):
+    """
+    Extract a PDF through the shared extractor; returns text plus page metadata.
+    layout=True forces pdfplumber for callers that depend on its word grouping.
+    """
+    return get_extractor().extract(source, "pdfplumber" if layout else PDF_TEXT_BACKEND)
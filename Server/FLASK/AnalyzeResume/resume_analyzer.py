@@ -1,15 +1,16 @@
-import pdfplumber
-import re
 import io
 import json
 import numpy as np
 from collections import Counter
-import spacy
 from dateutil.parser import parse
 import logging
 import os
 from datetime import datetime
 from collections import defaultdict
+from AnalyzeResume import patterns
+from AnalyzeResume.document import ResumeDocument, as_document
+from AnalyzeResume.pdf_extraction import PdfExtractionError, extract_pdf, iter_pdf_pages
+from AnalyzeResume.skill_matcher import SkillMatcher
 
 # Common English stopwords for filtering noise from skill extraction
 common_words = {
@@ -28,12 +29,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger('resume_analyzer')
 
-# Load NLP model for better text processing
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    logger.warning("Spacy model not found. Using simple tokenization.")
-    nlp = None
+# Bump when report contents change so cached results are not reused
+ANALYZER_VERSION = "2"
 
 # Comprehensive skill-role mapping with weights
 SKILL_TO_ROLE = {
@@ -139,6 +136,9 @@ SKILL_TO_ROLE = {
     "siem": {"roles": ["Security Analyst", "Security Engineer"], "weight": 0.75},
 }
 
+# All known skills and their spelling variations, matched in one pass
+SKILL_MATCHER = SkillMatcher(SKILL_TO_ROLE)
+
 # Comprehensive skill categories
 SKILL_CATEGORIES = {
     "Programming Languages": {
@@ -244,77 +244,109 @@ ATS_BOOSTERS = {
 # 📄 Extract text from PDF with error handling
 # ---------------------------
 def extract_text_from_pdf(file_stream):
-    try:
-        with pdfplumber.open(file_stream) as pdf:
-            text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-            logger.info(f"Successfully extracted {len(text)} characters from PDF")
-            return text
-    except Exception as e:
-        logger.error(f"Error extracting text from PDF: {str(e)}")
-        return ""
+    # Runs in a worker process with a hard timeout; raises PdfExtractionError
+    result = extract_pdf(file_stream)
+    logger.info(f"Successfully extracted {len(result['text'])} characters from "
+                f"{result['pagesExtracted']}/{result['pageCount']} PDF pages")
+    return result["text"]
 
 # ---------------------------
 # 🔍 Identify resume sections
 # ---------------------------
-def identify_sections(text):
-    lines = text.split('\n')
-    sections = {}
-    current_section = "header"
-    
-    # More robust section detection patterns
-    section_patterns = {
-        "summary": r'(?i)^(?:professional\s+)?summary|profile|objective|about\s+me',
-        "experience": r'(?i)^(?:work\s+)?experience|employment|work\s+history|career',
-        "education": r'(?i)^education|academic|qualification',
-        "skills": r'(?i)^(?:technical\s+)?skills|technologies|expertise|competencies',
-        "projects": r'(?i)^projects|personal\s+projects|portfolio|works',
-        "certifications": r'(?i)^certifications|certificates|qualifications',
-        "contact": r'(?i)^contact|personal\s+details|contact\s+information'
-    }
-    
-    for i, line in enumerate(lines):
+class SectionTracker:
+    """Line-by-line section detection, so sections can be built up page by page"""
+
+    def __init__(self):
+        self.sections = {}
+        self.current_section = "header"
+        self._previous_line = None
+        # Line ranges of each section, for ResumeDocument.section_spans
+        self._line_number = 0
+        self._first_line = {}
+        self._end_line = {}
+
+    def feed_text(self, text):
+        for line in text.split('\n'):
+            self.feed(line)
+
+    def feed(self, line):
         line_lower = line.strip().lower()
         
         # Check section headers based on patterns
         found_section = False
-        for section_name, pattern in section_patterns.items():
-            if re.search(pattern, line_lower) and len(line_lower) < 40:
-                current_section = section_name
-                sections[current_section] = []
-                found_section = True
-                break
+        if len(line_lower) < 40 and patterns.ANY_SECTION_HEADER.search(line_lower):
+            for section_name, pattern in patterns.SECTION_PATTERNS.items():
+                if pattern.search(line_lower):
+                    self._switch_to(section_name, self._line_number + 1)
+                    self.sections[self.current_section] = []
+                    found_section = True
+                    break
         
         # Handle bullet points as potential section markers
+        previous = self._previous_line
         if not found_section and (line_lower.startswith('•') or line_lower.startswith('-')):
             content = line.strip()
-            if i > 0 and lines[i-1].strip() and not lines[i-1].strip().startswith('•') and not lines[i-1].strip().startswith('-'):
-                potential_section = lines[i-1].strip().lower()
+            if previous is not None and previous.strip() and not previous.strip().startswith('•') and not previous.strip().startswith('-'):
+                potential_section = previous.strip().lower()
                 if len(potential_section) < 30 and not potential_section.startswith('•') and not potential_section.startswith('-'):
                     # Previous line might be a section header
                     for section_name in RESUME_SECTIONS:
                         if section_name.lower() in potential_section:
-                            current_section = section_name
-                            sections[current_section] = [content]
+                            self._switch_to(section_name, self._line_number)
+                            self.sections[self.current_section] = [content]
                             found_section = True
                             break
         
         # Add line to current section
         if not found_section:
-            if current_section in sections:
-                sections[current_section].append(line)
+            if self.current_section in self.sections:
+                self.sections[self.current_section].append(line)
             else:
-                sections[current_section] = [line]
-    
-    # Convert lists to strings
-    for section, content in sections.items():
-        sections[section] = "\n".join(content)
-    
-    return sections
+                self.sections[self.current_section] = [line]
+                self._first_line[self.current_section] = self._line_number
+
+        self._previous_line = line
+        self._line_number += 1
+
+    def _switch_to(self, section_name, first_line):
+        # A section that starts again replaces its earlier content
+        self._end_line[self.current_section] = self._line_number
+        self.current_section = section_name
+        self._first_line[section_name] = first_line
+        self._end_line.pop(section_name, None)
+
+    def result(self):
+        # Convert lists to strings
+        return {section: "\n".join(content) for section, content in self.sections.items()}
+
+    def line_spans(self):
+        """[first, last) line numbers of each section's content"""
+        return {
+            section: (self._first_line[section], self._end_line.get(section, self._line_number))
+            for section in self.sections
+        }
+
+def identify_sections(text):
+    tracker = SectionTracker()
+    tracker.feed_text(text)
+    return tracker.result()
+
+def build_document(text):
+    """Tokenize and sectionize a resume once; every analyzer stage reads the result"""
+    if isinstance(text, ResumeDocument) and text.sections is not None:
+        return text
+    if isinstance(text, ResumeDocument):
+        text = text.text
+    tracker = SectionTracker()
+    tracker.feed_text(text)
+    return ResumeDocument(text, tracker.result(), tracker.line_spans())
+
 # ---------------------------
 # 🧠 Extract skills with context awareness
 # ---------------------------
 def extract_skills(text, sections=None):
-    text = text.lower()
+    doc = as_document(text)
+    text = doc.lower
     
     # Prioritize specific sections for skills detection
     skills_text = text
@@ -327,48 +359,32 @@ def extract_skills(text, sections=None):
         if section_texts:
             skills_text = "\n".join(section_texts) + "\n" + text
     
-    # Enhanced skills detection with better context handling
-    skills_found = []
-    
-    # Direct matching of known skills
-    for skill, info in SKILL_TO_ROLE.items():
-        # Handle variations of the skill (e.g., "nodejs" vs "node.js")
-        variations = [
-            skill, 
-            skill.replace(" ", ""), 
-            skill.replace(".", ""), 
-            skill.replace("-", ""),
-            skill.replace(" ", "-"),
-            skill.replace("-", " ")
-        ]
-        
-        # Check for skills with variations
-        if any(var in skills_text for var in variations):
-            skills_found.append(skill)
-            continue
-            
-        # Check for skills in context (with word boundaries)
-        skill_pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(skill_pattern, skills_text):
-            skills_found.append(skill)
+    # Direct matching of known skills and their variations (e.g., "nodejs"
+    # vs "node.js") in a single word-bounded pass over the text
+    skills_found = SKILL_MATCHER.find_skills(text)
     
     # Additional technology pattern matching (for skills not in our predefined list)
-    tech_patterns = [
-        r'\b[A-Za-z]+[Jj][Ss]\b',  # Match frameworks ending with JS/js
-        r'\b[A-Za-z]+\.[A-Za-z]+\b',  # Match tech with dots
-        r'\b[A-Za-z]+(?:-[A-Za-z]+)+\b'  # Match hyphenated tech names
-    ]
-    
-    for pattern in tech_patterns:
-        matches = re.findall(pattern, skills_text)
-        for match in matches:
-            match_lower = match.lower()
-            if match_lower not in [s.lower() for s in skills_found]:
-                # Verify it's not just a common word
-                if len(match) > 2 and match_lower not in common_words:
-                    skills_found.append(match_lower)
+    skills_found += pattern_skills(skills_text, skills_found)
     
     return list(set(skills_found))
+
+def pattern_skills(text, known):
+    """Technology-like words (x.js, a.b, hyphen-ated) not already in known, lowercase, in order found"""
+    seen = {skill.lower() for skill in known}
+    found = []
+    for pattern in patterns.TECH_PATTERNS:
+        for match in pattern.findall(text):
+            match_lower = match.lower()
+            # Verify it's not just a common word
+            if match_lower not in seen and len(match) > 2 and match_lower not in common_words:
+                seen.add(match_lower)
+                found.append(match_lower)
+    return found
+
+def find_skill_matches(text):
+    """Every known-skill occurrence with its offsets into text.lower()"""
+    return SKILL_MATCHER.find_matches(text)
+
 # ---------------------------
 # 🧩 Predict roles with weighted algorithm
 # ---------------------------
@@ -395,20 +411,16 @@ def predict_roles(skills):
 # 📊 Experience level detection
 # ---------------------------
 def detect_experience_level(text, sections=None):
-    exp_text = text
+    doc = as_document(text)
+    exp_text = doc.text
     if sections and "experience" in sections:
         exp_text = sections["experience"]
+    exp_lower = doc.lowered(exp_text)
     
     # Look for years of experience
-    year_patterns = [
-        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-        r'experience\s+(?:of\s+)?(\d+)\+?\s*years?',
-        r'worked\s+(?:for\s+)?(\d+)\+?\s*years?'
-    ]
-    
     max_years = 0
-    for pattern in year_patterns:
-        matches = re.findall(pattern, exp_text.lower())
+    for pattern in patterns.YEARS_OF_EXPERIENCE:
+        matches = pattern.findall(exp_lower)
         for match in matches:
             try:
                 years = int(match)
@@ -420,14 +432,8 @@ def detect_experience_level(text, sections=None):
     job_count = 0
     if sections and "experience" in sections:
         # Simple heuristic: count date patterns
-        date_patterns = [
-            r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]* \d{4}\s*[–-]\s*((jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]* \d{4}|present|current)',
-            r'\b\d{4}\s*[–-]\s*(\d{4}|present|current)',
-            r'\b\d{2}/\d{4}\s*[–-]\s*(\d{2}/\d{4}|present|current)'
-        ]
-        
-        for pattern in date_patterns:
-            job_count += len(re.findall(pattern, sections["experience"].lower()))
+        for pattern in patterns.JOB_DATE_RANGES:
+            job_count += len(pattern.findall(exp_lower))
     
     # Determine level based on years and job count
     if max_years > 10 or job_count >= 5:
@@ -453,10 +459,8 @@ def categorize_skills(skills):
 # ---------------------------
 # 🎯 Resume compatibility scoring (for specific job match)
 # ---------------------------
-def compute_job_match_score(skills, job_title, job_description=None):
-    if not job_title:
-        return 0
-    
+def match_target_role(job_title):
+    """Closest role in CRITICAL_SKILLS to a job title, and that role's critical skills"""
     job_title_lower = job_title.lower()
     
     # Find most relevant target role based on job title
@@ -478,10 +482,14 @@ def compute_job_match_score(skills, job_title, job_description=None):
     
     # If no good match, use Generalist skills
     if not target_role or max_similarity < 0.3:
-        target_role = "Generalist"
-        critical_skills = set()
-    else:
-        critical_skills = CRITICAL_SKILLS.get(target_role, set())
+        return "Generalist", set()
+    return target_role, CRITICAL_SKILLS.get(target_role, set())
+
+def compute_job_match_score(skills, job_title, job_description=None):
+    if not job_title:
+        return 0
+    
+    target_role, critical_skills = match_target_role(job_title)
     
     # Calculate match percentage
     if not critical_skills:
@@ -511,6 +519,8 @@ def compute_job_match_score(skills, job_title, job_description=None):
 # 📐 ATS compatibility scoring
 # ---------------------------
 def compute_ats_compatibility_score(resume_text, skills, sections=None):
+    doc = as_document(resume_text)
+    resume_text, resume_lower = doc.text, doc.lower
     score_components = {
         "formatting": 0,
         "contentQuality": 0,
@@ -520,14 +530,14 @@ def compute_ats_compatibility_score(resume_text, skills, sections=None):
     }
     
     # Check for contact information (improved detection)
-    if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text):  # Email
+    if patterns.EMAIL.search(resume_text):  # Email
         score_components["contactInfo"] += 3
     
-    if re.search(r'\b(?:\+\d{1,3}[-\s]?)?\d{3}[-\s]?\d{3}[-\s]?\d{4}\b', resume_text):  # Phone with international format
+    if patterns.PHONE_INTERNATIONAL.search(resume_text):  # Phone with international format
         score_components["contactInfo"] += 3
     
     # Check for LinkedIn/social presence (even if just username)
-    if re.search(r'(?:linkedin|github|twitter|ï|§)\s*[a-zA-Z0-9_-]+', resume_text, re.IGNORECASE):
+    if patterns.SOCIAL_HANDLE.search(resume_text):
         score_components["contactInfo"] += 4
     
     # Better section detection and scoring
@@ -547,12 +557,11 @@ def compute_ats_compatibility_score(resume_text, skills, sections=None):
     # Content quality - look for action verbs and metrics
     action_verbs = ["developed", "implemented", "created", "designed", "managed", "led", "improved", 
                    "built", "collaborated", "maintained", "authored", "integrated", "deployed"]
-    verb_count = sum(1 for verb in action_verbs if verb in resume_text.lower())
+    verb_count = sum(1 for verb in action_verbs if verb in resume_lower)
     score_components["contentQuality"] = min(15, verb_count * 2)
     
     # Check for quantifiable results 
-    metrics_pattern = r'\b\d+%|\$\d+|\d+\s+(?:users|clients|team|people|developers|students)\b'
-    metrics_count = len(re.findall(metrics_pattern, resume_text.lower()))
+    metrics_count = len(patterns.METRICS.findall(resume_lower))
     score_components["contentQuality"] += min(10, metrics_count * 2)
     
     # Skills presentation
@@ -564,17 +573,11 @@ def compute_ats_compatibility_score(resume_text, skills, sections=None):
             score_components["skillsPresentation"] += 10
     else:
         # Even if no dedicated skills section, check if skills are clearly presented
-        skills_in_text = sum(1 for skill in skills if skill in resume_text.lower())
+        skills_in_text = sum(1 for skill in skills if skill in resume_lower)
         score_components["skillsPresentation"] += min(10, skills_in_text)
     
     # Keyword optimization
-    for skill in skills:
-        # Check if skill appears in context
-        skill_pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(skill_pattern, resume_text.lower()):
-            score_components["keywordOptimization"] += 1
-    
-    score_components["keywordOptimization"] = min(20, score_components["keywordOptimization"])
+    score_components["keywordOptimization"] = keyword_optimization_score(doc, skills)
     
     # Calculate total score
     total_score = sum(score_components.values())
@@ -583,53 +586,49 @@ def compute_ats_compatibility_score(resume_text, skills, sections=None):
         "total": total_score,
         "breakdown": score_components
     }
+
+def keyword_optimization_score(doc, skills):
+    """Skills that appear in context as whole words (max 20)"""
+    return min(20, sum(1 for skill in skills if doc.contains_word(skill)))
+
 # ---------------------------
 # 🔍 Education quality assessment
 # ---------------------------
 def assess_education(text, sections=None):
-    education_text = text
+    doc = as_document(text)
+    education_text = doc.text
     if sections and "education" in sections:
         education_text = sections["education"]
+    education_lower = doc.lowered(education_text)
     
     edu_score = 0
     institutions = []
     degrees = []
     
     # Extract degree information with better pattern matching
-    degree_patterns = {
-        "phd": r'\b(?:ph\.?d|doctorate|doctor of philosophy)\b',
-        "masters": r'\bm\.?(?:sc|tech|eng|s|a|b\.?a|arch|phil|fa|com)\b|master of|masters',
-        "bachelors": r'\bb\.?(?:tech|sc|a|arch|des|com)\b|bachelor of|bachelors',
-        "diploma": r'\bdiploma\b'
-    }
-    
-    for degree, pattern in degree_patterns.items():
-        if re.search(pattern, education_text.lower()):
+    for degree, pattern in patterns.DEGREE_PATTERNS.items():
+        if pattern.search(education_lower):
             edu_score = max(edu_score, DEGREE_LEVELS.get(degree, 0) * 5)
             degrees.append(degree)
     
     # Detect institutions with better name extraction
-    if re.search(r'(?i)college|university|institute|school', education_text):
-        institution_pattern = r'(?i)([A-Z][A-Za-z\s]+(?:College|University|Institute|School)[A-Za-z\s]*)'
-        matches = re.findall(institution_pattern, education_text)
+    if patterns.INSTITUTION_KEYWORD.search(education_text):
+        matches = patterns.INSTITUTION.findall(education_text)
         if matches:
             institutions = matches
             edu_score += 5
     
     # Check for CGPA/percentage
-    gpa_pattern = r'(?i)(?:CGPA|GPA):\s*(\d+\.\d+)'
-    gpa_matches = re.findall(gpa_pattern, education_text)
+    gpa_matches = patterns.GPA.findall(education_text)
     if gpa_matches:
         edu_score += 5
         
-    percentage_pattern = r'(?i)percentage:\s*(\d+(?:\.\d+)?)'
-    percentage_matches = re.findall(percentage_pattern, education_text)
+    percentage_matches = patterns.PERCENTAGE.findall(education_text)
     if percentage_matches:
         edu_score += 5
         
     # Extract graduation years
-    year_pattern = r'(20\d{2})(?:\s*[-–]\s*(20\d{2}|present))?'
-    if re.search(year_pattern, education_text):
+    if patterns.GRADUATION_YEAR.search(education_text):
         edu_score += 5
     
     # Cap at 25 points
@@ -645,13 +644,15 @@ def assess_education(text, sections=None):
 # ---------------------------
 def get_advanced_formatting_suggestions(text, sections=None):
     suggestions = []
+    doc = as_document(text)
+    text, text_lower = doc.text, doc.lower
     
     # Contact information
-    if not has_linkedin(text):
+    if not has_linkedin(doc):
         suggestions.append("Include a LinkedIn profile link.")
-    if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
+    if not patterns.EMAIL.search(text):
         suggestions.append("Add an email address.")
-    if not re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text):
+    if not patterns.PHONE_SIMPLE.search(text):
         suggestions.append("Include a phone number for contact.")
     
     # Core sections
@@ -666,7 +667,7 @@ def get_advanced_formatting_suggestions(text, sections=None):
         suggestions.append(f"Add these essential sections: {', '.join(missing_sections)}.")
     
     # Length check
-    word_count = len(text.split())
+    word_count = len(doc.tokens)
     if word_count < 300:
         suggestions.append("Resume is too short. Aim for at least 400–600 words.")
     elif word_count > 1000:
@@ -678,39 +679,36 @@ def get_advanced_formatting_suggestions(text, sections=None):
     
     # Check for action verbs and quantifiable achievements
     action_verbs = ["managed", "developed", "created", "improved", "increased", "reduced"]
-    if not any(verb in text.lower() for verb in action_verbs):
+    if not any(verb in text_lower for verb in action_verbs):
         suggestions.append("Use more action verbs to describe your experience.")
     
-    if not re.search(r'\b\d+%|\$\d+|\d+ (users|clients|customers|projects)\b', text):
+    if not patterns.QUANTIFIED_ACHIEVEMENT.search(text):
         suggestions.append("Include quantifiable achievements (e.g., 'Increased sales by 20%', 'Managed a team of 15 developers').")
     
     # Check for personal pronouns (I, my, me)
-    if re.search(r'\b(I|my|me)\b', text, re.IGNORECASE):
+    if patterns.PERSONAL_PRONOUN.search(text):
         suggestions.append("Avoid personal pronouns (I, my, me) - use action verbs instead.")
     
-    # Check for consistent tense
-    past_tense = ["managed", "developed", "created", "implemented", "led", "designed"]
-    present_tense = ["manage", "develop", "create", "implement", "lead", "design"]
-    
-    past_count = sum(1 for word in past_tense if re.search(rf'\b{word}\b', text.lower()))
-    present_count = sum(1 for word in present_tense if re.search(rf'\b{word}\b', text.lower()))
+    # Check for consistent tense (number of distinct verbs used in each tense)
+    past_count = len(set(patterns.PAST_TENSE_VERB.findall(text_lower)))
+    present_count = len(set(patterns.PRESENT_TENSE_VERB.findall(text_lower)))
     
     if past_count > 0 and present_count > 0 and sections and "experience" in sections:
         if past_count < present_count:
             suggestions.append("Use past tense consistently for previous positions.")
         
     # Check for dates in experience
-    if sections and "experience" in sections and not re.search(r'\b(20\d{2}|19\d{2})\b', sections["experience"]):
+    if sections and "experience" in sections and not patterns.ANY_YEAR.search(sections["experience"]):
         suggestions.append("Include dates (month/year) for each position in your experience section.")
     
     # Check for file naming
-    if hasattr(text, 'name') and not re.search(r'resume|cv', text.name, re.IGNORECASE):
+    if hasattr(text, 'name') and not patterns.RESUME_FILE_NAME.search(text.name):
         suggestions.append("Name your file appropriately (e.g., 'FirstName_LastName_Resume.pdf').")
     
     # Check for education details
     if sections and "education" in sections:
-        edu_text = sections["education"].lower()
-        if not re.search(r'\b(gpa|grade|cum laude|honors)\b', edu_text):
+        edu_text = doc.lowered(sections["education"])
+        if not patterns.ACADEMIC_HONORS.search(edu_text):
             suggestions.append("Consider adding GPA or academic honors if they strengthen your application.")
     
     # Check for contact section placement
@@ -719,7 +717,7 @@ def get_advanced_formatting_suggestions(text, sections=None):
     
     # Check for modern skills
     modern_tech = ["cloud", "machine learning", "data", "agile", "mobile", "analytics"]
-    if not any(tech in text.lower() for tech in modern_tech) and "technology" in " ".join(suggestions).lower():
+    if not any(tech in text_lower for tech in modern_tech) and "technology" in " ".join(suggestions).lower():
         suggestions.append("Consider highlighting modern technology skills relevant to your field.")
     
     # Check for proper section ordering
@@ -739,11 +737,12 @@ def get_advanced_formatting_suggestions(text, sections=None):
 # 📊 Generate comprehensive report
 # ---------------------------
 def generate_resume_report(text, file_name=None):
-    # Extract sections
-    sections = identify_sections(text)
+    # Tokenize and extract sections once; every scorer below reuses the document
+    doc = build_document(text)
+    sections = doc.sections
     
     # Extract skills
-    skills = extract_skills(text, sections)
+    skills = extract_skills(doc, sections)
     categorized_skills = categorize_skills(skills)
     
     # Role predictions
@@ -751,19 +750,19 @@ def generate_resume_report(text, file_name=None):
     primary_role = predicted_roles[0] if predicted_roles else "Generalist"
     
     # Experience level
-    experience_level = detect_experience_level(text, sections)
+    experience_level = detect_experience_level(doc, sections)
     
     # Education assessment
-    education_assessment = assess_education(text, sections)
+    education_assessment = assess_education(doc, sections)
     
     # ATS compatibility
-    ats_score = compute_ats_compatibility_score(text, skills, sections)
+    ats_score = compute_ats_compatibility_score(doc, skills, sections)
     
     # Get missing skills for primary role
     missing_skills = get_missing_skills_for_role(primary_role, skills)
     
     # Formatting suggestions
-    formatting_suggestions = get_advanced_formatting_suggestions(text, sections)
+    formatting_suggestions = get_advanced_formatting_suggestions(doc, sections)
     
     # Calculate overall score
     overall_score = calculate_overall_score(ats_score, education_assessment["score"], skills, experience_level)
@@ -782,7 +781,7 @@ def generate_resume_report(text, file_name=None):
         "educationAssessment": education_assessment,
         "missingCriticalSkills": missing_skills,
         "improvementSuggestions": formatting_suggestions,
-        "keywordDensity": calculate_keyword_density(text, skills)
+        "keywordDensity": calculate_keyword_density(doc, skills)
     }
     
     return report
@@ -842,20 +841,16 @@ def get_missing_skills_for_role(role, current_skills):
 # 📝 Calculate keyword density
 # ---------------------------
 def calculate_keyword_density(text, skills):
-    words = text.lower().split()
-    total_words = len(words)
+    doc = as_document(text)
+    total_words = len(doc.tokens)
     
     if total_words == 0:
         return {}
     
-    # Count occurrences of each skill
+    # Count occurrences of each skill (token counts; substring counts for multi-word skills)
     skill_counts = {}
     for skill in skills:
-        # Count occurrences of skill (handling multi-word skills)
-        if " " in skill:
-            count = text.lower().count(skill)
-        else:
-            count = sum(1 for word in words if word == skill)
+        count = doc.count(skill)
         
         if count > 0:
             skill_counts[skill] = {
@@ -876,35 +871,13 @@ def calculate_keyword_density(text, skills):
 # 🧠 LinkedIn profile detection
 # ---------------------------
 def has_linkedin(text):
-    patterns = [
-        r"linkedin\.com\/in\/[a-zA-Z0-9-_%]+",
-        r"linkedin:?\s*[a-zA-Z0-9-_%]+",
-        r"linkedin\.com\/[a-zA-Z0-9-_%]+"
-    ]
-    
-    for pattern in patterns:
-        if re.search(pattern, text.lower()):
-            return True
-    return False
+    return patterns.LINKEDIN.search(as_document(text).lower) is not None
 
 # ---------------------------
 # 💼 Check for portfolio/GitHub links
 # ---------------------------
 def has_portfolio_or_github(text):
-    patterns = [
-        r"github\.com\/[a-zA-Z0-9-_%]+",
-        r"github:?\s*[a-zA-Z0-9-_%]+",
-        r"portfolio:?\s*https?:\/\/[a-zA-Z0-9-_%\.\/]+",
-        r"portfolio:?\s*[a-zA-Z0-9-_%\.\/]+\.(com|io|net|org)",
-        r"(website|site|blog):?\s*https?:\/\/[a-zA-Z0-9-_%\.\/]+",
-        r"Link\s*$",  # For "Link" text at end of project descriptions
-        r"§\s*[a-zA-Z0-9-_%]+"  # For LinkedIn/GitHub usernames after § symbol
-    ]
-    
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
+    return patterns.PORTFOLIO_OR_GITHUB.search(as_document(text).text) is not None
 # ---------------------------
 # 📊 Detect resume gaps
 # ---------------------------
@@ -912,18 +885,13 @@ def detect_resume_gaps(text, sections=None):
     if not sections or "experience" not in sections:
         return {"hasGaps": False, "details": "No experience section found"}
     
-    experience_text = sections["experience"]
+    experience_lower = as_document(text).lowered(sections["experience"])
     
     # Extract all date ranges
-    date_patterns = [
-        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]* (\d{4})\s*[–-]\s*((jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]* (\d{4})|present|current)',
-        r'(\d{4})\s*[–-]\s*((\d{4})|present|current)'
-    ]
-    
     date_ranges = []
     
-    for pattern in date_patterns:
-        matches = re.finditer(pattern, experience_text.lower())
+    for pattern in patterns.GAP_DATE_RANGES:
+        matches = pattern.finditer(experience_lower)
         for match in matches:
             if match.groups()[0] in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']:
                 # Month year format
@@ -1013,37 +981,110 @@ def generate_action_items(report):
 # ---------------------------
 # 🚀 MAIN ANALYSIS FUNCTION
 # ---------------------------
+def build_full_report(resume_text, file_name=None, job_title=None, job_description=None):
+    # resume_text may be a string or an already built ResumeDocument
+    doc = build_document(resume_text)
+    
+    # Generate full report
+    report = generate_resume_report(doc, file_name)
+    
+    # Additional checks
+    report["hasLinkedIn"] = has_linkedin(doc)
+    report["hasPortfolio"] = has_portfolio_or_github(doc)
+    report["gapAnalysis"] = detect_resume_gaps(doc, doc.sections)
+    
+    # If job title provided, calculate job match score
+    if job_title:
+        report["jobMatchScore"] = compute_job_match_score(
+            report["skillsExtracted"], 
+            job_title, 
+            job_description
+        )
+    
+    # Generate prioritized action items
+    report["actionItems"] = generate_action_items(report)
+    
+    return report
+
 def analyze_resume1(file_stream, job_title=None, job_description=None):
     try:
         # Extract text from PDF
         resume_text = extract_text_from_pdf(file_stream)
-        if not resume_text:
-            return {"error": "Could not extract text from resume"}
-        
-        # Generate full report
-        report = generate_resume_report(resume_text, getattr(file_stream, 'name', None))
-        
-        # Additional checks
-        report["hasLinkedIn"] = has_linkedin(resume_text)
-        report["hasPortfolio"] = has_portfolio_or_github(resume_text)
-        report["gapAnalysis"] = detect_resume_gaps(resume_text, identify_sections(resume_text))
-        
-        # If job title provided, calculate job match score
-        if job_title:
-            report["jobMatchScore"] = compute_job_match_score(
-                report["skillsExtracted"], 
-                job_title, 
-                job_description
-            )
+    except PdfExtractionError as e:
+        logger.error(f"Error extracting text from PDF: {e.message}")
+        return e.to_dict()
+    return analyze_resume_text(resume_text, getattr(file_stream, 'name', None), job_title, job_description)
+
+def analyze_resume_text(resume_text, file_name=None, job_title=None, job_description=None):
+    """Report for already extracted text (e.g. from the result cache)"""
+    if not resume_text:
+        return {"error": "Could not extract text from resume"}
+    try:
+        return build_full_report(resume_text, file_name, job_title, job_description)
+    except Exception as e:
+        logger.error(f"Error analyzing resume: {str(e)}")
+        return {"error": f"Analysis failed: {str(e)}"}
+
+# ---------------------------
+# 📡 Streaming analysis (page by page)
+# ---------------------------
+def extract_contact_info(text):
+    email = patterns.EMAIL.search(text)
+    phone = patterns.PHONE_INTERNATIONAL.search(text)
+    return {
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0) if phone else None,
+        "hasLinkedIn": has_linkedin(text),
+        "hasPortfolio": has_portfolio_or_github(text)
+    }
+
+def analyze_resume_stream(file_stream, job_title=None, job_description=None):
+    """
+    Analyze a resume page by page, yielding events as results become available:
+    "contact" when new contact details are found, "page" with the sections and
+    skills found so far after each page, then the full "report" (or "error").
+    """
+    tracker = SectionTracker()
+    skills = set()
+    contact = {}
+    pages = []
+    
+    try:
+        for page_number, page_text in enumerate(iter_pdf_pages(file_stream), start=1):
+            pages.append(page_text)
+            tracker.feed_text(page_text)
+            
+            new_skills = set(extract_skills(page_text)) - skills
+            skills |= new_skills
+            
+            new_contact = {k: v for k, v in extract_contact_info(page_text).items() if v and not contact.get(k)}
+            if new_contact:
+                contact.update(new_contact)
+                yield {"event": "contact", "page": page_number, "contact": dict(contact)}
+            
+            yield {
+                "event": "page",
+                "page": page_number,
+                "sectionsFound": list(tracker.sections),
+                "newSkills": sorted(new_skills),
+                "skillsSoFar": sorted(skills)
+            }
         
-        # Generate prioritized action items
-        report["actionItems"] = generate_action_items(report)
+        resume_text = "\n".join(pages)
+        if not resume_text.strip():
+            yield {"event": "error", "error": "Could not extract text from resume"}
+            return
         
-        return report
+        doc = ResumeDocument(resume_text, tracker.result(), tracker.line_spans())
+        report = build_full_report(doc, getattr(file_stream, 'name', None), job_title, job_description)
+        yield {"event": "report", "report": report}
         
+    except PdfExtractionError as e:
+        logger.error(f"Error extracting text from PDF: {e.message}")
+        yield {"event": "error", **e.to_dict()}
     except Exception as e:
         logger.error(f"Error analyzing resume: {str(e)}")
-        return {"error": f"Analysis failed: {str(e)}"}
+        yield {"event": "error", "error": f"Analysis failed: {str(e)}"}
 
 # ---------------------------
 # 🛠️ Command Line Interface 
@@ -1051,17 +1092,33 @@ def analyze_resume1(file_stream, job_title=None, job_description=None):
 def main():
     import argparse
     
-    parser = argparse.ArgumentParser(description='Analyze a resume PDF file.')
-    parser.add_argument('pdf_path', help='Path to the resume PDF file')
+    parser = argparse.ArgumentParser(description='Analyze resume PDF files.')
+    parser.add_argument('pdf_paths', nargs='+', help='Resume PDF files or directories of PDFs')
     parser.add_argument('--job-title', help='Optional job title for targeted analysis')
     parser.add_argument('--job-desc', help='Optional job description for detailed matching')
+    parser.add_argument('--batch', action='store_true',
+                        help='Rank all resumes against the job (implied for several files or a directory)')
     parser.add_argument('--output', help='Output path for JSON results')
     
     args = parser.parse_args()
     
+    paths = []
+    for path in args.pdf_paths:
+        if os.path.isdir(path):
+            paths.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith('.pdf')))
+        else:
+            paths.append(path)
+    
     try:
-        with open(args.pdf_path, 'rb') as f:
-            results = analyze_resume(f, args.job_title, args.job_desc)
+        if args.batch or len(paths) > 1 or len(args.pdf_paths) != len(paths):
+            from AnalyzeResume.batch_scoring import analyze_resumes_batch
+            missing = [path for path in paths if not os.path.isfile(path)]
+            if missing:
+                raise FileNotFoundError(missing[0])
+            results = analyze_resumes_batch(paths, args.job_title, args.job_desc)
+        else:
+            with open(paths[0], 'rb') as f:
+                results = analyze_resume1(f, args.job_title, args.job_desc)
             
         if args.output:
             with open(args.output, 'w') as f:
@@ -1070,8 +1127,8 @@ def main():
         else:
             print(json.dumps(results, indent=2))
             
-    except FileNotFoundError:
-        print(f"Error: File not found: {args.pdf_path}")
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename or e}")
         return 1
     except Exception as e:
         print(f"Error: {str(e)}")
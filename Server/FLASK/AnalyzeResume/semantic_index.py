@@ -0,0 +1,648 @@
+import logging
+import os
+import pickle
+import random
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from model_registry import registry
+
+logger = logging.getLogger('semantic_index')
+
+# SQLite file holding indexed resumes/jobs, their vectors and the fitted encoder
+SEMANTIC_INDEX_DB = os.environ.get('SEMANTIC_INDEX_DB', 'data/semantic.sqlite3')
+# Optional local sentence-transformers model directory; the hashed TF-IDF + SVD
+# encoder (fitted on the indexed documents) is used when unset
+SEMANTIC_MODEL = os.environ.get('SEMANTIC_MODEL', '')
+SEMANTIC_DIMENSIONS = int(os.environ.get('SEMANTIC_DIMENSIONS', 128))
+# Hashed word/bigram features; the SVD components are dimensions x this float32
+SEMANTIC_HASH_FEATURES = int(os.environ.get('SEMANTIC_HASH_FEATURES', 2 ** 16))
+# The hashed encoder is fitted automatically once this many documents are indexed
+SEMANTIC_FIT_MIN_DOCUMENTS = int(os.environ.get('SEMANTIC_FIT_MIN_DOCUMENTS', 50))
+# Fitting samples at most this many documents (SVD cost grows with the sample)
+SEMANTIC_FIT_MAX_DOCUMENTS = int(os.environ.get('SEMANTIC_FIT_MAX_DOCUMENTS', 5000))
+# ANN structure: auto (hnsw if hnswlib is installed, else ivf), hnsw, ivf or exact
+SEMANTIC_ANN = os.environ.get('SEMANTIC_ANN', 'auto')
+# Collections smaller than this are searched exactly
+SEMANTIC_ANN_MIN_SIZE = int(os.environ.get('SEMANTIC_ANN_MIN_SIZE', 2000))
+# IVF lists probed per query / HNSW candidate list size; higher is slower and more exact
+SEMANTIC_IVF_NPROBE = int(os.environ.get('SEMANTIC_IVF_NPROBE', 32))
+SEMANTIC_HNSW_EF = int(os.environ.get('SEMANTIC_HNSW_EF', 128))
+# Changes kept for other processes to replay; one further behind reloads fully
+CHANGE_LOG_SIZE = 10000
+
+KINDS = ('resume', 'job')
+
+
+class SemanticModelUnavailable(Exception):
+    """No encoder yet: too few documents to fit one and no local model configured"""
+
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class HashedTfidfEncoder:
+    """
+    Hashed word/bigram TF-IDF reduced to dense vectors with truncated SVD (LSA).
+
+    Hashing keeps the vocabulary unbounded without storing it; the SVD maps
+    resumes and job descriptions that use related terms close together.
+    Only the IDF weights and the float32 SVD components are kept. The
+    components are by far the larger part: they are saved as a .npy file
+    and memory-mapped, so they are not part of the pickled encoder.
+    """
+
+    def __init__(self, dimensions=SEMANTIC_DIMENSIONS, n_features=SEMANTIC_HASH_FEATURES):
+        self.dimensions = dimensions
+        self.n_features = n_features
+        self.fitted_on = 0
+        self.name = None
+        self.idf = None
+        self.components = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['components'] = None
+        return state
+
+    def _hasher(self):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        return HashingVectorizer(n_features=self.n_features, ngram_range=(1, 2), alternate_sign=False, norm=None,
+                                 stop_words='english', token_pattern=r'(?u)\b\w[\w+#.]*\w\b|\b\w\b')
+
+    def fit(self, texts):
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfTransformer
+
+        texts = list(texts)
+        if len(texts) > SEMANTIC_FIT_MAX_DOCUMENTS:
+            texts = random.Random(0).sample(texts, SEMANTIC_FIT_MAX_DOCUMENTS)
+        self.fitted_on = len(texts)
+        components = max(1, min(self.dimensions, len(texts) - 1))
+        tfidf = TfidfTransformer(sublinear_tf=True)
+        svd = TruncatedSVD(n_components=components, random_state=0)
+        svd.fit(tfidf.fit_transform(self._hasher().transform(texts)))
+        self.idf = tfidf.idf_.astype(np.float32)
+        self.components = svd.components_.astype(np.float32)
+        # Fingerprint of the fitted weights: processes reload the encoder only when it changes
+        fingerprint = zlib.crc32(self.components.tobytes(), zlib.crc32(self.idf.tobytes()))
+        self.name = f"hashed-tfidf-svd:{components}x{self.n_features}:{fingerprint:08x}"
+        return self
+
+    def encode(self, texts):
+        from sklearn.preprocessing import normalize
+
+        # Same as TfidfTransformer(sublinear_tf=True).transform + TruncatedSVD.transform
+        counts = self._hasher().transform(list(texts)).astype(np.float32)
+        counts.data = np.log(counts.data) + 1
+        tfidf = normalize(counts.multiply(self.idf).tocsr())
+        return normalize_rows(tfidf @ self.components.T)
+
+    def save_components(self, path):
+        """Write the SVD components to path (atomically) and memory-map them from there"""
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, 'wb') as f:
+            np.save(f, self.components)
+        os.replace(partial, path)
+        self.load_components(path)
+
+    def load_components(self, path):
+        self.components = np.load(path, mmap_mode='r')
+
+
+class LocalModelEncoder:
+    """Sentence embeddings from a sentence-transformers model on local disk (never downloads)"""
+
+    def __init__(self, path):
+        from sentence_transformers import SentenceTransformer
+        self.name = f"local:{os.path.abspath(path)}"
+        self._model = SentenceTransformer(path, device='cpu', local_files_only=True)
+
+    def encode(self, texts):
+        return normalize_rows(self._model.encode(list(texts), batch_size=32, show_progress_bar=False))
+
+
+def _load_semantic_model():
+    return LocalModelEncoder(SEMANTIC_MODEL) if SEMANTIC_MODEL else None
+
+
+# torch starts thread pools that don't survive fork()
+registry.register('semantic_model', _load_semantic_model, fork_safe=False)
+
+
+def top_k(rows, scores, k):
+    """The k highest-scoring (row, score) pairs, best first"""
+    if len(rows) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        rows, scores = rows[keep], scores[keep]
+    order = np.argsort(-scores, kind='stable')
+    return rows[order], scores[order]
+
+
+class IvfIndex:
+    """
+    Inverted-file index in NumPy: vectors are bucketed by their nearest of
+    ~sqrt(N) spherical k-means centroids, and a query only scores the
+    vectors in its nprobe closest buckets.
+    """
+
+    def __init__(self, vectors, rows=None, nprobe=SEMANTIC_IVF_NPROBE):
+        self.nprobe = nprobe
+        self.trained_size = len(vectors)
+        self._centroids = self._train(vectors, max(1, int(np.sqrt(len(vectors)))))
+        assignment = self._nearest(vectors)
+        # Bucket entries are row ids: positions in vectors unless given explicitly
+        rows = np.arange(len(vectors)) if rows is None else rows
+        self._lists = [list(rows[assignment == c]) for c in range(len(self._centroids))]
+        self._arrays = {}
+
+    @staticmethod
+    def _train(vectors, lists, iterations=10):
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), lists * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = normalize_rows(sums)
+        return centroids
+
+    def _nearest(self, vectors):
+        return np.argmax(vectors @ self._centroids.T, axis=1)
+
+    def add(self, row, vector):
+        bucket = int(self._nearest(vector[None, :])[0])
+        self._lists[bucket].append(row)
+        self._arrays.pop(bucket, None)
+
+    def search(self, vectors, alive, query, k, nprobe=None):
+        probes = np.argsort(-(self._centroids @ query))[:nprobe or self.nprobe]
+        for bucket in probes:
+            if bucket not in self._arrays:
+                self._arrays[bucket] = np.array(self._lists[bucket], dtype=np.int64)
+        rows = np.concatenate([self._arrays[bucket] for bucket in probes])
+        rows = rows[alive[rows]]
+        return top_k(rows, vectors[rows] @ query, k)
+
+
+class HnswIndex:
+    """Hierarchical navigable small world graph (hnswlib), inner product on unit vectors"""
+
+    def __init__(self, vectors, alive, ef=SEMANTIC_HNSW_EF):
+        import hnswlib
+        self.ef = ef
+        self._index = hnswlib.Index(space='ip', dim=vectors.shape[1])
+        self._index.init_index(max_elements=max(1024, 2 * len(vectors)), ef_construction=100, M=16, random_seed=0)
+        self._index.add_items(vectors, np.arange(len(vectors)))
+        for row in np.flatnonzero(~alive):
+            self._index.mark_deleted(int(row))
+
+    def add(self, row, vector):
+        if self._index.get_current_count() >= self._index.get_max_elements():
+            self._index.resize_index(2 * self._index.get_max_elements())
+        self._index.add_items(vector[None, :], [row])
+
+    def remove(self, row):
+        self._index.mark_deleted(row)
+
+    def search(self, vectors, alive, query, k, ef=None):
+        k = min(k, int(alive.sum()))
+        self._index.set_ef(max(ef or self.ef, k))
+        labels, distances = self._index.knn_query(query[None, :], k=k)
+        # hnswlib's 'ip' distance is 1 - inner product
+        return labels[0].astype(np.int64), 1 - distances[0]
+
+
+class VectorCollection:
+    """Vectors of one kind (resumes or jobs) with an ANN structure over them"""
+
+    def __init__(self, dimensions, ann=SEMANTIC_ANN):
+        self.ann = ann
+        self.ids, self.names, self.rows = [], [], {}
+        self._vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._index = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _kind_of_index(self):
+        if len(self) < SEMANTIC_ANN_MIN_SIZE or self.ann == 'exact':
+            return None
+        if self.ann == 'hnsw' or (self.ann == 'auto' and _hnswlib_available()):
+            return HnswIndex
+        return IvfIndex
+
+    def add(self, doc_id, name, vector, rebuild=True):
+        self.remove(doc_id)
+        row = len(self.ids)
+        if row == len(self._vectors):
+            grown = np.zeros((max(64, 2 * row), self._vectors.shape[1]), dtype=np.float32)
+            grown[:row] = self._vectors
+            self._vectors = grown
+            self._alive = np.concatenate([self._alive, np.zeros(len(grown) - row, dtype=bool)])
+        self._vectors[row] = vector
+        self._alive[row] = True
+        self.ids.append(doc_id)
+        self.names.append(name)
+        self.rows[doc_id] = row
+        if rebuild:
+            if self._index is not None:
+                self._index.add(row, self._vectors[row])
+            self._maybe_rebuild()
+
+    def remove(self, doc_id):
+        row = self.rows.pop(doc_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        if isinstance(self._index, HnswIndex):
+            self._index.remove(row)
+        return True
+
+    def _maybe_rebuild(self):
+        # (Re)train once the collection is large enough, then whenever it has doubled
+        kind = self._kind_of_index()
+        if kind is None:
+            self._index = None
+        elif not isinstance(self._index, kind) or (kind is IvfIndex and len(self) >= 2 * self._index.trained_size):
+            self.rebuild()
+
+    def rebuild(self):
+        kind = self._kind_of_index()
+        count = len(self.ids)
+        if kind is IvfIndex:
+            # Trained on live rows only, so removed documents don't skew the centroids
+            live = np.flatnonzero(self._alive[:count])
+            self._index = IvfIndex(self._vectors[live], rows=live)
+        elif kind is HnswIndex:
+            self._index = HnswIndex(self._vectors[:count], self._alive[:count])
+        else:
+            self._index = None
+
+    def vector(self, doc_id):
+        row = self.rows.get(doc_id)
+        return None if row is None else self._vectors[row]
+
+    def search(self, query, k=10, exact=False, effort=None):
+        """Top-k rows and cosine scores; exact=True forces brute force"""
+        count = len(self.ids)
+        if not self.rows or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        vectors, alive = self._vectors[:count], self._alive[:count]
+        if exact or self._index is None:
+            rows = np.flatnonzero(alive)
+            return top_k(rows, vectors[rows] @ query, k)
+        return self._index.search(vectors, alive, query, k, effort)
+
+
+def _hnswlib_available():
+    try:
+        import hnswlib  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class SemanticIndex:
+    """
+    Dense-vector index of resumes and job descriptions for semantic matching.
+
+    Both kinds are embedded into one vector space, so "resumes similar to
+    this job" and "jobs similar to this resume" are the same nearest
+    neighbour query against different collections. Texts and vectors live in
+    SQLite; each process keeps the vectors in memory under an ANN structure
+    (HNSW via hnswlib, or a NumPy IVF fallback) and reloads when another
+    process changed the database.
+    """
+
+    def __init__(self, db_path=SEMANTIC_INDEX_DB, ann=SEMANTIC_ANN):
+        self.db_path = db_path
+        self.ann = ann
+        self._reset()
+        # A forked worker must open its own SQLite connection
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._db = None
+        self._loaded_version = None
+        self._last_change = 0
+        self._encoder = None
+        self._collections = {}
+        self._fitting = False
+
+    def _connection(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.executescript(
+                'CREATE TABLE IF NOT EXISTS documents ('
+                '  kind TEXT NOT NULL, id TEXT NOT NULL, name TEXT, text BLOB NOT NULL,'
+                '  encoder TEXT, vector BLOB, indexed_at REAL NOT NULL, PRIMARY KEY (kind, id));'
+                'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB);'
+                'CREATE TABLE IF NOT EXISTS changes ('
+                '  seq INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, id TEXT NOT NULL);'
+            )
+        return self._db
+
+    def _components_path(self, encoder_name):
+        # Next to the database, one file per fitted encoder
+        return f"{self.db_path}.encoder-{zlib.crc32(encoder_name.encode('utf-8')):08x}.npy"
+
+    def _stored_encoder(self, db):
+        """The fitted encoder in meta; only unpickled and mapped when it differs from the loaded one"""
+        row = db.execute("SELECT value FROM meta WHERE key = 'encoder_name'").fetchone()
+        if row is None:
+            # Nothing fitted yet, or an encoder stored before components were kept
+            # outside the database; the next fit replaces it
+            return None
+        if isinstance(self._encoder, HashedTfidfEncoder) and self._encoder.name == row[0]:
+            return self._encoder
+        encoder = pickle.loads(db.execute("SELECT value FROM meta WHERE key = 'encoder'").fetchone()[0])
+        try:
+            encoder.load_components(self._components_path(encoder.name))
+        except OSError:
+            logger.exception(f"Components of {encoder.name} are missing; refit the semantic encoder")
+            return None
+        return encoder
+
+    def _sync(self):
+        """Bring the in-memory vectors up to date with changes committed by other processes"""
+        db = self._connection()
+        version = db.execute('PRAGMA data_version').fetchone()[0]
+        if version == self._loaded_version:
+            return
+        encoder = registry.get('semantic_model') or self._stored_encoder(db)
+        oldest = db.execute('SELECT MIN(seq) FROM changes').fetchone()[0]
+        if (self._loaded_version is not None and getattr(encoder, 'name', None) == getattr(self._encoder, 'name', None)
+                and (oldest is None or oldest <= self._last_change + 1)):
+            self._replay_changes(db)
+        else:
+            self._encoder = encoder
+            self._load(db)
+        self._loaded_version = db.execute('PRAGMA data_version').fetchone()[0]
+
+    def _replay_changes(self, db):
+        changed = db.execute('SELECT seq, kind, id FROM changes WHERE seq > ?', (self._last_change,)).fetchall()
+        for kind, doc_id in dict.fromkeys((kind, doc_id) for _, kind, doc_id in changed):
+            row = db.execute('SELECT name, vector FROM documents WHERE kind = ? AND id = ? AND encoder = ?',
+                             (kind, doc_id, getattr(self._encoder, 'name', None))).fetchone()
+            if row is not None:
+                vector = np.frombuffer(row[1], dtype=np.float32)
+                self._collection(kind, len(vector)).add(doc_id, row[0], vector)
+            elif kind in self._collections:
+                self._collections[kind].remove(doc_id)
+        if changed:
+            self._last_change = changed[-1][0]
+
+    def _load(self, db):
+        started = time.perf_counter()
+        if self._encoder is not None:
+            self._encode_stale(db)
+        self._last_change = db.execute('SELECT COALESCE(MAX(seq), 0) FROM changes').fetchone()[0]
+        self._collections = {}
+        rows = db.execute('SELECT kind, id, name, vector FROM documents WHERE encoder = ?',
+                          (getattr(self._encoder, 'name', None),))
+        for kind, doc_id, name, vector in rows:
+            vector = np.frombuffer(vector, dtype=np.float32)
+            self._collection(kind, len(vector)).add(doc_id, name, vector, rebuild=False)
+        for collection in self._collections.values():
+            collection.rebuild()
+        logger.info(f"Loaded {self._counts()} in {time.perf_counter() - started:.2f}s")
+
+    def _collection(self, kind, dimensions):
+        if kind not in self._collections:
+            self._collections[kind] = VectorCollection(dimensions, self.ann)
+        return self._collections[kind]
+
+    def _counts(self):
+        return {kind: len(collection) for kind, collection in self._collections.items()}
+
+    def _encode_stale(self, db, batch_size=256):
+        """Embed documents stored without a vector or with a different encoder's"""
+        name = self._encoder.name
+        while True:
+            stale = db.execute('SELECT kind, id, text FROM documents WHERE encoder IS NOT ? LIMIT ?',
+                               (name, batch_size)).fetchall()
+            if not stale:
+                return
+            vectors = self._encoder.encode(zlib.decompress(text).decode('utf-8') for _, _, text in stale)
+            with db:
+                db.executemany('UPDATE documents SET encoder = ?, vector = ? WHERE kind = ? AND id = ?',
+                               [(name, vector.tobytes(), kind, doc_id)
+                                for (kind, doc_id, _), vector in zip(stale, vectors)])
+
+    def fit(self, texts=None, dimensions=SEMANTIC_DIMENSIONS):
+        """
+        Fit the hashed TF-IDF + SVD encoder on texts (default: every indexed
+        document) and re-embed the whole index with it.
+        """
+        with self._lock:
+            db = self._connection()
+            if texts is None:
+                texts = [zlib.decompress(text).decode('utf-8') for (text,) in db.execute('SELECT text FROM documents')]
+            if not texts:
+                raise SemanticModelUnavailable("No documents to fit the semantic encoder on")
+            self._fit(db, texts, dimensions)
+            self._loaded_version = None
+            self._sync()
+            return self._encoder.name
+
+    def _fit(self, db, texts, dimensions=SEMANTIC_DIMENSIONS):
+        self._store_encoder(db, HashedTfidfEncoder(dimensions).fit(texts))
+
+    def _store_encoder(self, db, encoder):
+        encoder.save_components(self._components_path(encoder.name))
+        previous = db.execute("SELECT value FROM meta WHERE key = 'encoder_name'").fetchone()
+        with db:
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('encoder', ?)", (pickle.dumps(encoder),))
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('encoder_name', ?)", (encoder.name,))
+        if previous is not None and previous[0] != encoder.name:
+            # Processes still mapping the old file keep their view of it until they reload
+            try:
+                os.remove(self._components_path(previous[0]))
+            except OSError:
+                pass
+        logger.info(f"Fitted {encoder.name} on {encoder.fitted_on} documents")
+
+    def _fit_in_background(self):
+        """Start the automatic fit unless one is running; called with self._lock held"""
+        if self._fitting:
+            return
+        self._fitting = True
+        threading.Thread(target=self._background_fit, name='semantic-fit', daemon=True).start()
+
+    def _background_fit(self):
+        # The SVD runs without the lock, so adds and searches aren't held up by it
+        try:
+            # Own connection: the shared one is only used under self._lock
+            db = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                texts = [zlib.decompress(text).decode('utf-8') for (text,) in db.execute('SELECT text FROM documents')]
+            finally:
+                db.close()
+            encoder = HashedTfidfEncoder().fit(texts)
+            with self._lock:
+                db = self._connection()
+                # Keep an encoder fitted meanwhile by fit() or another process
+                if db.execute("SELECT 1 FROM meta WHERE key = 'encoder_name'").fetchone() is None:
+                    self._store_encoder(db, encoder)
+                    self._loaded_version = None
+                    self._sync()
+        except Exception:
+            logger.exception("Fitting the semantic encoder failed")
+        finally:
+            self._fitting = False
+
+    def add(self, kind, doc_id, text, name=None):
+        """Index (or re-index) one resume or job description"""
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}")
+        with self._lock:
+            self._sync()
+            db = self._connection()
+            vector = self._encoder.encode([text])[0] if self._encoder is not None else None
+            with db:
+                db.execute('INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)', (
+                    kind, doc_id, name, zlib.compress(text.encode('utf-8')),
+                    None if vector is None else self._encoder.name,
+                    None if vector is None else vector.tobytes(), time.time(),
+                ))
+                self._log_change(db, kind, doc_id)
+            if vector is None:
+                # Fit the hashed encoder once there is enough text to learn from; until the
+                # background fit finishes, documents are stored unembedded and embedded by it
+                documents = db.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+                if documents >= SEMANTIC_FIT_MIN_DOCUMENTS:
+                    self._fit_in_background()
+            else:
+                self._collection(kind, len(vector)).add(doc_id, name, vector)
+            self._loaded_version = db.execute('PRAGMA data_version').fetchone()[0]
+            return {"id": doc_id, "kind": kind, "name": name, "embedded": self._encoder is not None}
+
+    def remove(self, kind, doc_id):
+        with self._lock:
+            self._sync()
+            db = self._connection()
+            with db:
+                deleted = db.execute('DELETE FROM documents WHERE kind = ? AND id = ?', (kind, doc_id)).rowcount
+                self._log_change(db, kind, doc_id)
+            if kind in self._collections:
+                self._collections[kind].remove(doc_id)
+            self._loaded_version = db.execute('PRAGMA data_version').fetchone()[0]
+            return deleted > 0
+
+    def _log_change(self, db, kind, doc_id):
+        seq = db.execute('INSERT INTO changes (kind, id) VALUES (?, ?)', (kind, doc_id)).lastrowid
+        if seq % 1000 == 0:
+            db.execute('DELETE FROM changes WHERE seq <= ?', (seq - CHANGE_LOG_SIZE,))
+        # Our own change is applied in memory; don't replay it
+        if seq == self._last_change + 1:
+            self._last_change = seq
+
+    def search(self, kind, text=None, like=None, k=10, exact=False, effort=None):
+        """
+        Top-k documents of `kind` closest to `text`, or to an indexed
+        document given as like=(kind, id). Raises SemanticModelUnavailable
+        before an encoder exists and KeyError for an unknown like document.
+        """
+        with self._lock:
+            self._sync()
+            if self._encoder is None:
+                raise SemanticModelUnavailable(
+                    f"Semantic matching needs {SEMANTIC_FIT_MIN_DOCUMENTS} indexed documents, "
+                    f"a fitted encoder or SEMANTIC_MODEL"
+                )
+            if like is not None:
+                source = self._collections.get(like[0])
+                query = source.vector(like[1]) if source is not None else None
+                if query is None:
+                    raise KeyError(like[1])
+            else:
+                query = self._encoder.encode([text])[0]
+            collection = self._collections.get(kind)
+            if collection is None:
+                return []
+            # Don't return the query document itself
+            skip = like[1] if like is not None and like[0] == kind else None
+            rows, scores = collection.search(query, k + (skip is not None), exact, effort)
+            results = [
+                {"id": collection.ids[row], "name": collection.names[row], "score": round(float(score), 4)}
+                for row, score in zip(rows, scores)
+                if collection.ids[row] != skip
+            ]
+            return results[:k]
+
+    def stats(self):
+        with self._lock:
+            self._sync()
+            return {
+                "encoder": getattr(self._encoder, 'name', None),
+                # Refit (python -m AnalyzeResume.semantic_index fit) once the index has grown well past this
+                "encoderFittedOn": getattr(self._encoder, 'fitted_on', None),
+                "documents": self._counts(),
+                "ann": {kind: type(c._index).__name__ if c._index is not None else 'exact'
+                        for kind, c in self._collections.items()},
+                "database": self.db_path,
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_semantic_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SemanticIndex()
+    return _index
+
+
+def main(argv=None):
+    import argparse
+
+    from AnalyzeResume.pdf_extraction import PdfExtractionError, extract_pdf
+
+    parser = argparse.ArgumentParser(description='Manage the semantic resume/job index')
+    parser.add_argument('command', choices=['fit', 'add', 'stats'])
+    parser.add_argument('paths', nargs='*', help='PDF or text files (add), or a fitting corpus (fit)')
+    parser.add_argument('--kind', choices=KINDS, default='resume')
+    args = parser.parse_args(argv)
+
+    def read_text(path):
+        if path.lower().endswith('.pdf'):
+            return extract_pdf(path)["text"]
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    index = get_semantic_index()
+    if args.command == 'stats':
+        print(index.stats())
+    elif args.command == 'fit':
+        print(index.fit([read_text(p) for p in args.paths] or None))
+    else:
+        for path in args.paths:
+            try:
+                print(index.add(args.kind, os.path.basename(path), read_text(path), os.path.basename(path)))
+            except PdfExtractionError as e:
+                print(f"{path}: {e.message}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
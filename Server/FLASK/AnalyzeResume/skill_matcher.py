@@ -0,0 +1,98 @@
+from collections import deque
+
+
+def skill_variations(skill):
+    """Spellings accepted for a skill (e.g. "node.js" also matches "nodejs")"""
+    variations = [
+        skill,
+        skill.replace(" ", ""),
+        skill.replace(".", ""),
+        skill.replace("-", ""),
+        skill.replace(" ", "-"),
+        skill.replace("-", " ")
+    ]
+    return list(dict.fromkeys(v for v in variations if v))
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every skill and its spelling variations.
+
+    Built once, it finds all skills in a single left-to-right pass over the
+    text, independent of how many skills are registered. Matches must sit on
+    word boundaries, so "r" or "go" no longer match inside other words.
+    """
+
+    def __init__(self, skills):
+        # Trie nodes: transitions, failure link, and (length, skill) outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for skill in skills:
+            for variant in skill_variations(skill.lower()):
+                self._add(variant, skill)
+        self._build_failure_links()
+
+    def _add(self, pattern, skill):
+        node = 0
+        for ch in pattern:
+            child = self._goto[node].get(ch)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][ch] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = child
+        entry = (len(pattern), skill)
+        if entry not in self._out[node]:
+            self._out[node].append(entry)
+
+    def _build_failure_links(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0) if node else 0
+                # Inherit matches that end here via the failure link
+                out[child] = out[child] + out[fail[child]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, skill) for every word-bounded match; text must already be lowercase"""
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            if end < length and _is_word_char(text[end]):
+                continue
+            for pattern_length, skill in out[node]:
+                start = end - pattern_length
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    yield start, end, skill
+
+    def find_matches(self, text):
+        """All matches as dicts with offsets into text.lower()"""
+        lowered = text.lower()
+        return [
+            {"skill": skill, "start": start, "end": end, "matched": lowered[start:end]}
+            for start, end, skill in self.iter_matches(lowered)
+        ]
+
+    def find_skills(self, text):
+        """Distinct skills present in text, in order of first appearance"""
+        return list(dict.fromkeys(skill for _, _, skill in self.iter_matches(text.lower())))
@@ -0,0 +1,162 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class _PendingRequest:
+    __slots__ = ('tensor', 'enqueued_at', 'done', 'result', 'error')
+
+    def __init__(self, tensor):
+        self.tensor = tensor
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Coalesce single-sample predictions from concurrent requests into batches.
+
+    Callers block in submit() while a background thread collects queued
+    tensors and flushes them through predict_fn as one stacked batch once
+    max_batch_size items are waiting or the oldest one has waited max_wait_ms.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=5, latency_window=1024):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._batches = 0
+        self._items = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._max_wait_seen = 0.0
+        self._recent_waits = deque(maxlen=latency_window)
+
+        self._reset()
+        # Threads don't survive fork(): pre-forked workers get a fresh queue
+        # and start their own flush thread on first use
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                worker = threading.Thread(target=self._run, name='emotion-batcher', daemon=True)
+                worker.start()
+                self._worker = worker
+
+    def submit(self, tensor, timeout=None):
+        """Queue one sample (without batch dim) and block until its prediction is ready"""
+        self._ensure_worker()
+        pending = _PendingRequest(tensor)
+        self._queue.put(pending)
+
+        depth = self._queue.qsize()
+        with self._lock:
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+
+        if not pending.done.wait(timeout):
+            raise TimeoutError('Timed out waiting for batched prediction')
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def submit_many(self, tensors, timeout=None):
+        """Queue several samples at once (they may share batches with other callers); returns stacked results"""
+        self._ensure_worker()
+        batch = [_PendingRequest(tensor) for tensor in tensors]
+        for pending in batch:
+            self._queue.put(pending)
+
+        depth = self._queue.qsize()
+        with self._lock:
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for pending in batch:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not pending.done.wait(remaining):
+                raise TimeoutError('Timed out waiting for batched prediction')
+            if pending.error is not None:
+                raise pending.error
+        return np.stack([pending.result for pending in batch]) if batch else None
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = batch[0].enqueued_at + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # Deadline passed: still sweep up anything already queued
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            waits = [started - p.enqueued_at for p in batch]
+
+            try:
+                outputs = self.predict_fn(np.stack([p.tensor for p in batch]))
+                for pending, output in zip(batch, outputs):
+                    pending.result = output
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._total_wait += sum(waits)
+                self._max_wait_seen = max(self._max_wait_seen, max(waits))
+                self._recent_waits.extend(waits)
+
+    def stats(self):
+        with self._lock:
+            recent = sorted(self._recent_waits)
+            batches = self._batches
+            items = self._items
+
+            def percentile(p):
+                if not recent:
+                    return 0.0
+                return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 3)
+
+            return {
+                'maxBatchSize': self.max_batch_size,
+                'maxWaitMs': self.max_wait * 1000,
+                'batches': batches,
+                'items': items,
+                'avgBatchSize': round(items / batches, 3) if batches else 0.0,
+                'batchFillRatio': round(items / (batches * self.max_batch_size), 3) if batches else 0.0,
+                'queueDepth': self._queue.qsize(),
+                'maxQueueDepth': self._max_queue_depth,
+                'avgQueueWaitMs': round(self._total_wait / items * 1000, 3) if items else 0.0,
+                'p50QueueWaitMs': percentile(0.50),
+                'p99QueueWaitMs': percentile(0.99),
+                'maxQueueWaitMs': round(self._max_wait_seen * 1000, 3),
+            }
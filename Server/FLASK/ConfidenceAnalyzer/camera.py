@@ -1,59 +1,301 @@
+# Run from Server/FLASK: python -m ConfidenceAnalyzer.camera
+# Headless from a recording: python -m ConfidenceAnalyzer.camera --video interview.mp4 --headless
+import argparse
+import threading
+import time
+from collections import deque
+
 import cv2
 import numpy as np
-from tensorflow.keras.models import load_model
-from PIL import Image
 
-# Load the trained model
-model = load_model("best_model.h5")
+from ConfidenceAnalyzer.face_pipeline import FaceDetector, crop_faces
+from ConfidenceAnalyzer.inference import load_emotion_model
+from ConfidenceAnalyzer.tracking import TRACK_CLASSIFY_EVERY, TRACK_DETECT_EVERY, TRACK_SMOOTHING, FaceTracker
 
 # Emotion labels from FER2013 dataset
 emotion_labels = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
 
-# Load Haar cascade for face detection
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
 
-# Start webcam capture
-cap = cv2.VideoCapture(0)
+class FrameRing:
+    """
+    Bounded buffer of the newest frames. put() never blocks: when the buffer
+    is full the oldest frame is dropped, so a slow consumer always works on
+    recent frames instead of falling further behind.
+    """
+
+    def __init__(self, size=2):
+        self._items = deque(maxlen=size)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self):
+        """Oldest buffered frame; None once closed and drained"""
+        with self._cond:
+            while not self._items and not self._closed:
+                self._cond.wait()
+            return self._items.popleft() if self._items else None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StageStats:
+    """Throughput and latency of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.latencies = deque(maxlen=4096)
+        self._first = None
+        self._last = None
+        self._lock = threading.Lock()
+
+    def tick(self, latency=None):
+        now = time.perf_counter()
+        with self._lock:
+            self.count += 1
+            self._first = self._first or now
+            self._last = now
+            if latency is not None:
+                self.latencies.append(latency)
+
+    def summary(self):
+        with self._lock:
+            elapsed = (self._last - self._first) if self.count > 1 else 0.0
+            latencies = np.array(self.latencies) * 1000
+        result = {'frames': self.count, 'fps': round((self.count - 1) / elapsed, 1) if elapsed else 0.0}
+        if len(latencies):
+            result['p50LatencyMs'] = round(float(np.percentile(latencies, 50)), 1)
+            result['p99LatencyMs'] = round(float(np.percentile(latencies, 99)), 1)
+        return result
+
+
+class CameraPipeline:
+    """
+    Capture -> detect/classify -> display, each stage on its own thread(s).
+
+    The capture thread reads frames into a FrameRing; inference workers take
+    the newest frame, find faces on a downscaled copy and classify every
+    face in one predict() call; the display stage (the caller's thread, as
+    imshow requires) draws the most recent result. A slow stage lowers its
+    own rate without stalling capture. With a FaceTracker, faces are
+    followed between periodic detections instead (frames must stay in
+    order, so tracking uses a single worker).
+    """
+
+    def __init__(self, source, predict, labels, detector=None, workers=1, ring_size=2,
+                 pace=False, display=True, output=None, max_frames=None, tracker=None):
+        if tracker is not None and workers != 1:
+            raise ValueError("Tracking processes frames in order; use a single worker")
+        self.source = source
+        self.predict = predict
+        self.labels = labels
+        self.detector = detector or FaceDetector()
+        self.workers = workers
+        self.ring = FrameRing(ring_size)
+        self.pace = pace
+        self.display = display
+        self.output = output
+        self.max_frames = max_frames
+        self.tracker = tracker
+        self.stats = {name: StageStats(name) for name in ('capture', 'inference', 'display')}
+        self._stop = threading.Event()
+        self._result_cond = threading.Condition()
+        self._latest = None         # (seq, captured_at, frame, boxes, emotions)
+        self._shown_seq = -1
+        self._running_workers = 0
+        self._error = None          # first exception raised by an inference worker
+
+    def _capture(self):
+        capture = cv2.VideoCapture(self.source)
+        # Video files are read as fast as possible unless paced like a live camera
+        interval = 1.0 / (capture.get(cv2.CAP_PROP_FPS) or 30) if self.pace else 0
+        seq, next_at = 0, time.perf_counter()
+        try:
+            while not self._stop.is_set() and (self.max_frames is None or seq < self.max_frames):
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                if interval:
+                    next_at += interval
+                    time.sleep(max(0.0, next_at - time.perf_counter()))
+                self.ring.put((seq, time.perf_counter(), frame))
+                self.stats['capture'].tick()
+                seq += 1
+        finally:
+            capture.release()
+            self.ring.close()
+
+    def _infer(self):
+        try:
+            while True:
+                item = self.ring.get()
+                if item is None:
+                    return
+                seq, captured_at, frame = item
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+                boxes, emotions = self._analyze(gray)
+                self.stats['inference'].tick(time.perf_counter() - captured_at)
+                self._publish((seq, captured_at, frame, boxes, emotions))
+        except Exception as e:
+            # Stop the pipeline; run() re-raises this once the threads are joined
+            with self._result_cond:
+                self._error = self._error or e
+            self._stop.set()
+        finally:
+            with self._result_cond:
+                self._running_workers -= 1
+                self._result_cond.notify_all()
+
+    def _analyze(self, gray):
+        if self.tracker is not None:
+            tracks = self.tracker.update(gray)
+            return self.tracker.boxes(), [self.labels[int(np.argmax(t.probabilities))] for t in tracks]
+        boxes = self.detector.detect(gray)
+        if not len(boxes):
+            return boxes, []
+        probabilities = self.predict(crop_faces(gray, boxes))
+        return boxes, [self.labels[i] for i in np.argmax(probabilities, axis=-1)]
+
+    def _publish(self, result):
+        with self._result_cond:
+            # With several workers results can finish out of order; keep the newest
+            if self._latest is None or result[0] > self._latest[0]:
+                self._latest = result
+                self._result_cond.notify_all()
+
+    def _next_result(self, timeout):
+        """Newest result not shown yet; None on timeout or when everything has finished"""
+        with self._result_cond:
+            self._result_cond.wait_for(
+                lambda: (self._latest is not None and self._latest[0] > self._shown_seq) or not self._running_workers,
+                timeout)
+            if self._latest is None or self._latest[0] <= self._shown_seq:
+                return None
+            self._shown_seq = self._latest[0]
+            return self._latest
+
+    def _draw(self, frame, boxes, emotions):
+        frame = frame.copy()
+        for (x, y, w, h), emotion in zip(boxes, emotions):
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
+            cv2.putText(frame, emotion, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (36, 255, 12), 2)
+        fps = self.stats['inference'].summary()['fps']
+        cv2.putText(frame, f"{fps:.1f} fps", (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        return frame
 
-print("Starting camera... Press 'q' to quit.")
+    def run(self):
+        """
+        Run until the source ends or 'q' is pressed; returns per-stage stats.
+        An exception raised by detection or predict() is re-raised here.
+        """
+        self._running_workers = self.workers
+        threads = [threading.Thread(target=self._capture, name='capture', daemon=True)]
+        threads += [threading.Thread(target=self._infer, name=f'inference-{i}', daemon=True)
+                    for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
 
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        break
+        writer = None
+        try:
+            while True:
+                result = self._next_result(timeout=0.05)
+                if result is None:
+                    with self._result_cond:
+                        if not self._running_workers:
+                            break
+                else:
+                    seq, captured_at, frame, boxes, emotions = result
+                    if self.display or self.output:
+                        annotated = self._draw(frame, boxes, emotions)
+                        if self.output:
+                            if writer is None:
+                                height, width = annotated.shape[:2]
+                                writer = cv2.VideoWriter(self.output, cv2.VideoWriter_fourcc(*'mp4v'), 30,
+                                                         (width, height))
+                            writer.write(annotated)
+                        if self.display:
+                            cv2.imshow('Emotion Detector', annotated)
+                    self.stats['display'].tick(time.perf_counter() - captured_at)
+                # Break the loop when 'q' key is pressed
+                if self.display and cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join(timeout=5)
+            if writer is not None:
+                writer.release()
+            if self.display:
+                cv2.destroyAllWindows()
+        if self._error is not None:
+            raise self._error
+        return self.summary()
 
-    # Convert frame to grayscale for face detection
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    def summary(self):
+        stages = {name: stats.summary() for name, stats in self.stats.items()}
+        stages['capture']['dropped'] = self.ring.dropped
+        # Capture -> result on screen
+        stages['endToEnd'] = {k: v for k, v in stages['display'].items() if 'Latency' in k}
+        if self.tracker is not None:
+            stages['tracking'] = dict(self.tracker.counters)
+        return stages
 
-    # Detect faces
-    faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)
 
-    for (x, y, w, h) in faces:
-        # Draw rectangle around face
-        cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
+def print_summary(summary):
+    print(f"\n{'stage':<10} {'frames':>7} {'fps':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for stage in ('capture', 'inference', 'display'):
+        s = summary[stage]
+        print(f"{stage:<10} {s['frames']:>7} {s['fps']:>7} {s.get('p50LatencyMs', '-'):>8} {s.get('p99LatencyMs', '-'):>8}")
+    print(f"dropped stale frames: {summary['capture']['dropped']}")
+    if 'tracking' in summary:
+        print(f"tracking: {summary['tracking']}")
 
-        # Crop and preprocess the face
-        face = gray[y:y + h, x:x + w]
-        face = cv2.resize(face, (48, 48))
-        face = face / 255.0
-        face = np.expand_dims(face, axis=-1)  # Add channel dim
-        face = np.expand_dims(face, axis=0)   # Add batch dim
 
-        # Predict emotion
-        prediction = model.predict(face)
-        emotion = emotion_labels[np.argmax(prediction)]
+def main():
+    parser = argparse.ArgumentParser(description='Real-time emotion detection from a webcam or video file')
+    parser.add_argument('--video', help='Read frames from this file instead of the webcam')
+    parser.add_argument('--camera', type=int, default=0, help='Webcam index')
+    parser.add_argument('--headless', action='store_true', help='No window (for servers and CI)')
+    parser.add_argument('--output', help='Write the annotated frames to this video file')
+    parser.add_argument('--workers', type=int, default=1, help='Detection/classification threads')
+    parser.add_argument('--ring-size', type=int, default=2, help='Frames buffered before the oldest is dropped')
+    parser.add_argument('--pace', action='store_true', help='Read a video file at its own frame rate, like a camera')
+    parser.add_argument('--max-frames', type=int, help='Stop after this many captured frames')
+    parser.add_argument('--backend', help='Emotion runtime backend (default: EMOTION_BACKEND or keras)')
+    parser.add_argument('--track', action='store_true', help='Follow faces between detections (single worker)')
+    parser.add_argument('--detect-every', type=int, default=TRACK_DETECT_EVERY, help='Frames between detections')
+    parser.add_argument('--classify-every', type=int, default=TRACK_CLASSIFY_EVERY,
+                        help='Frames between emotion predictions per face')
+    parser.add_argument('--smoothing', type=float, default=TRACK_SMOOTHING,
+                        help='Weight of each new prediction in the moving average (1 = none)')
+    args = parser.parse_args()
 
-        # Show predicted emotion
-        cv2.putText(frame, emotion, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX,
-                    0.9, (36, 255, 12), 2)
+    # Load the trained model
+    model = load_emotion_model(args.backend, labels=emotion_labels)
+    detector = FaceDetector()
+    tracker = FaceTracker(detector, model.predict, args.detect_every, args.classify_every,
+                          smoothing=args.smoothing) if args.track else None
+    pipeline = CameraPipeline(
+        args.video if args.video else args.camera, model.predict, emotion_labels, detector=detector,
+        workers=1 if tracker else args.workers, ring_size=args.ring_size, pace=args.pace,
+        display=not args.headless, output=args.output, max_frames=args.max_frames, tracker=tracker,
+    )
 
-    # Display the resulting frame
-    cv2.imshow('Emotion Detector', frame)
+    print("Starting camera... Press 'q' to quit." if not args.headless else f"Processing {args.video or args.camera}...")
+    print_summary(pipeline.run())
+    return 0
 
-    # Break the loop when 'q' key is pressed
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
 
-# Release resources
-cap.release()
-cv2.destroyAllWindows()
+if __name__ == "__main__":
+    raise SystemExit(main())
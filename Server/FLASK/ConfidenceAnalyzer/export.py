@@ -0,0 +1,104 @@
+# Run from Server/FLASK: python -m ConfidenceAnalyzer.export --formats onnx tflite --int8 --calibration-dir faces/
+import argparse
+import glob
+import logging
+import os
+
+import numpy as np
+
+from ConfidenceAnalyzer.inference import BACKEND_MODEL_PATHS, INPUT_SHAPE, MODEL_PATH, preprocess_image
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('emotion_export')
+
+IMAGE_EXTENSIONS = ('*.jpg', '*.jpeg', '*.png', '*.bmp')
+
+
+def load_calibration_faces(calibration_dir, limit=200):
+    """Load sample face crops used to calibrate int8 activation ranges"""
+    paths = []
+    if calibration_dir:
+        for ext in IMAGE_EXTENSIONS:
+            paths.extend(glob.glob(os.path.join(calibration_dir, '**', ext), recursive=True))
+
+    if not paths:
+        logger.warning("No calibration images found; falling back to random faces. "
+                       "int8 accuracy will be poor - pass --calibration-dir with real face crops.")
+        return np.random.rand(limit, *INPUT_SHAPE).astype(np.float32)
+
+    return np.stack([preprocess_image(p) for p in sorted(paths)[:limit]])
+
+
+def export_tflite(keras_model, output_path, calibration_faces=None):
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    if calibration_faces is not None:
+        # Full integer quantization of weights and activations; the model keeps
+        # float32 input/output so callers don't need to know it's quantized
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([face[np.newaxis]] for face in calibration_faces)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    with open(output_path, 'wb') as f:
+        f.write(converter.convert())
+    logger.info(f"Wrote {output_path} ({os.path.getsize(output_path) / 1024:.0f} KiB)")
+
+
+def export_onnx(keras_model, output_path, opset=13):
+    import tensorflow as tf
+    import tf2onnx
+
+    signature = (tf.TensorSpec((None,) + INPUT_SHAPE, tf.float32, name='input'),)
+    tf2onnx.convert.from_keras(keras_model, input_signature=signature, opset=opset, output_path=output_path)
+    logger.info(f"Wrote {output_path} ({os.path.getsize(output_path) / 1024:.0f} KiB)")
+
+
+def quantize_onnx(float_path, output_path, calibration_faces):
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, quantize_static
+    import onnxruntime as ort
+
+    input_name = ort.InferenceSession(float_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+
+    class FaceReader(CalibrationDataReader):
+        def __init__(self):
+            self._faces = iter(calibration_faces)
+
+        def get_next(self):
+            face = next(self._faces, None)
+            return None if face is None else {input_name: face[np.newaxis]}
+
+    quantize_static(float_path, output_path, FaceReader(), quant_format=QuantFormat.QDQ)
+    logger.info(f"Wrote {output_path} ({os.path.getsize(output_path) / 1024:.0f} KiB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the emotion CNN to ONNX and/or TFLite')
+    parser.add_argument('--model', default=MODEL_PATH, help='Path to the Keras .h5 model')
+    parser.add_argument('--formats', nargs='+', choices=['onnx', 'tflite'], default=['onnx', 'tflite'],
+                        help='Formats to export')
+    parser.add_argument('--int8', action='store_true', help='Also export int8-quantized variants')
+    parser.add_argument('--calibration-dir', help='Directory of sample face images for int8 calibration')
+    parser.add_argument('--calibration-size', type=int, default=200, help='Max calibration images to use')
+    parser.add_argument('--opset', type=int, default=13, help='ONNX opset version')
+    args = parser.parse_args()
+
+    from tensorflow.keras.models import load_model
+    keras_model = load_model(args.model, compile=False)
+    calibration_faces = load_calibration_faces(args.calibration_dir, args.calibration_size) if args.int8 else None
+
+    if 'onnx' in args.formats:
+        export_onnx(keras_model, BACKEND_MODEL_PATHS['onnx'], args.opset)
+        if args.int8:
+            quantize_onnx(BACKEND_MODEL_PATHS['onnx'], BACKEND_MODEL_PATHS['onnx-int8'], calibration_faces)
+
+    if 'tflite' in args.formats:
+        export_tflite(keras_model, BACKEND_MODEL_PATHS['tflite'])
+        if args.int8:
+            export_tflite(keras_model, BACKEND_MODEL_PATHS['tflite-int8'], calibration_faces)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,118 @@
+import os
+import threading
+
+import numpy as np
+
+from ConfidenceAnalyzer.inference import INPUT_SHAPE
+
+# Frames are downscaled so their longest side is at most this before
+# detection; boxes are mapped back and crops taken from the full frame
+FACE_DETECT_MAX_SIDE = int(os.environ.get('FACE_DETECT_MAX_SIDE', 320))
+# Smallest face searched for, in pixels of the downscaled frame
+FACE_MIN_SIZE = int(os.environ.get('FACE_MIN_SIZE', 24))
+FACE_SCALE_FACTOR = float(os.environ.get('FACE_SCALE_FACTOR', 1.1))
+FACE_MIN_NEIGHBORS = int(os.environ.get('FACE_MIN_NEIGHBORS', 5))
+# Largest faces kept per frame
+FACE_MAX_FACES = int(os.environ.get('FACE_MAX_FACES', 8))
+FACE_CASCADE = os.environ.get('FACE_CASCADE', 'haarcascade_frontalface_default.xml')
+
+
+class FaceDetector:
+    """
+    Haar cascade face detector that runs on a downscaled copy of the frame.
+
+    Detection cost grows with the pixel count, so a 1080p frame is searched
+    at 320 px wide (~20x fewer pixels) and the boxes are scaled back up.
+    CascadeClassifier keeps per-call scratch state, so each thread gets its
+    own instance of the parsed cascade.
+    """
+
+    def __init__(self, cascade=FACE_CASCADE, max_side=FACE_DETECT_MAX_SIDE, min_size=FACE_MIN_SIZE,
+                 scale_factor=FACE_SCALE_FACTOR, min_neighbors=FACE_MIN_NEIGHBORS, max_faces=FACE_MAX_FACES):
+        import cv2
+        self._cv2 = cv2
+        self.cascade_path = cascade if os.path.isfile(cascade) else os.path.join(cv2.data.haarcascades, cascade)
+        self.max_side = max_side
+        self.min_size = min_size
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.max_faces = max_faces
+        self._local = threading.local()
+        # Parse once up front so a bad path fails at load time, not mid-request
+        self._classifier()
+
+    def _classifier(self):
+        classifier = getattr(self._local, 'classifier', None)
+        if classifier is None:
+            classifier = self._cv2.CascadeClassifier(self.cascade_path)
+            if classifier.empty():
+                raise OSError(f"Could not load face cascade {self.cascade_path}")
+            self._local.classifier = classifier
+        return classifier
+
+    def detect(self, gray):
+        """Face boxes (x, y, w, h) in full-frame pixels, largest first, as an (N, 4) int array"""
+        height, width = gray.shape[:2]
+        scale = min(1.0, self.max_side / max(height, width))
+        small = gray if scale == 1.0 else self._cv2.resize(
+            gray, (max(1, round(width * scale)), max(1, round(height * scale))),
+            interpolation=self._cv2.INTER_AREA)
+        boxes = self._classifier().detectMultiScale(
+            small, scaleFactor=self.scale_factor,
+            minNeighbors=self.min_neighbors, minSize=(self.min_size, self.min_size))
+        if len(boxes) == 0:
+            return np.zeros((0, 4), dtype=np.int32)
+        boxes = np.round(np.asarray(boxes, dtype=np.float32) / scale).astype(np.int32)
+        boxes[:, 2] = np.minimum(boxes[:, 2], width - boxes[:, 0])
+        boxes[:, 3] = np.minimum(boxes[:, 3], height - boxes[:, 1])
+        order = np.argsort(-(boxes[:, 2] * boxes[:, 3]), kind='stable')
+        return boxes[order[:self.max_faces]]
+
+
+def decode_gray(data):
+    """Decode encoded image bytes (JPEG/PNG/...) straight to a grayscale uint8 array"""
+    import cv2
+    gray = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError("Could not decode image")
+    return gray
+
+
+def crop_faces(gray, boxes):
+    """Crops resized to the model input and normalized together: (N, 48, 48, 1) float32"""
+    import cv2
+    size = INPUT_SHAPE[:2]
+    crops = np.empty((len(boxes),) + size, dtype=np.uint8)
+    for i, (x, y, w, h) in enumerate(boxes):
+        crops[i] = cv2.resize(gray[y:y + h, x:x + w], size[::-1], interpolation=cv2.INTER_AREA)
+    return (crops.astype(np.float32) * (1 / 255.0))[..., np.newaxis]
+
+
+def box_dict(box):
+    x, y, w, h = (int(v) for v in box)
+    return {'x': x, 'y': y, 'width': w, 'height': h}
+
+
+def analyze_frames(frames, detector, predict, labels):
+    """
+    Detect faces in every grayscale frame, classify all of them in one
+    predict() call and return, per frame, its faces with box and emotion.
+    """
+    boxes = [detector.detect(gray) for gray in frames]
+    crops = [crop_faces(gray, frame_boxes) for gray, frame_boxes in zip(frames, boxes) if len(frame_boxes)]
+    probabilities = predict(np.concatenate(crops)) if crops else np.zeros((0, len(labels)))
+
+    results, offset = [], 0
+    for gray, frame_boxes in zip(frames, boxes):
+        faces = []
+        for box, probs in zip(frame_boxes, probabilities[offset:offset + len(frame_boxes)]):
+            best = int(np.argmax(probs))
+            faces.append({
+                'box': box_dict(box),
+                'emotion': labels[best],
+                'confidence': round(float(probs[best]), 4),
+                'probabilities': {label: round(float(p), 4) for label, p in zip(labels, probs)},
+            })
+        offset += len(frame_boxes)
+        results.append({'width': int(gray.shape[1]), 'height': int(gray.shape[0]), 'faces': faces})
+    return results
@@ -0,0 +1,168 @@
+import abc
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+MODEL_PATH = os.environ.get('EMOTION_MODEL_PATH', 'models/best_model.h5')
+INPUT_SHAPE = (48, 48, 1)
+EMOTION_LABELS = ['anger', 'neutral', 'fear', 'sad', 'disgust', 'happy', 'surprise']
+
+# Default artifact per runtime backend (see ConfidenceAnalyzer.export)
+BACKEND_MODEL_PATHS = {
+    'keras': MODEL_PATH,
+    'onnx': 'models/best_model.onnx',
+    'onnx-int8': 'models/best_model_int8.onnx',
+    'tflite': 'models/best_model.tflite',
+    'tflite-int8': 'models/best_model_int8.tflite',
+}
+
+
+def preprocess_image(file):
+    """Load an image path/stream as a normalized (48, 48, 1) float32 array"""
+    image = Image.open(file).convert('L')
+    image = image.resize(INPUT_SHAPE[:2])
+    img_array = np.asarray(image, dtype=np.float32) / 255.0
+    return np.expand_dims(img_array, axis=-1)
+
+
+def preprocess_face(gray_face):
+    """Normalize an already-resized (48, 48) grayscale crop to (48, 48, 1)"""
+    return np.expand_dims(np.asarray(gray_face, dtype=np.float32) / 255.0, axis=-1)
+
+
+def _as_batch(batch):
+    batch = np.asarray(batch, dtype=np.float32)
+    if batch.ndim == 3:
+        batch = batch[np.newaxis]
+    return batch
+
+
+class _EmotionModelBase(abc.ABC):
+    labels = EMOTION_LABELS
+
+    @abc.abstractmethod
+    def predict(self, batch):
+        """Class probabilities for a (48, 48, 1) sample or (N, 48, 48, 1) batch"""
+
+    def predict_labels(self, batch):
+        return [self.labels[i] for i in np.argmax(self.predict(batch), axis=-1)]
+
+
+class EmotionModel(_EmotionModelBase):
+    """
+    Low-overhead wrapper around the Keras emotion CNN.
+
+    model.predict() builds a data adapter and callback list on every call,
+    which dominates latency for a single face. Here the forward pass is traced
+    once into a tf.function with a fixed (None, 48, 48, 1) signature, so each
+    call is a direct graph execution for any batch size.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, labels=EMOTION_LABELS):
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+
+        self.labels = labels
+        self.model = load_model(model_path, compile=False)
+        self._forward = tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec((None,) + INPUT_SHAPE, tf.float32)],
+        )
+        # Trace up front so the first request doesn't pay for it
+        self._forward(tf.zeros((1,) + INPUT_SHAPE, tf.float32))
+
+    def predict(self, batch):
+        """Return class probabilities for a (48, 48, 1) sample or (N, 48, 48, 1) batch"""
+        return self._forward(_as_batch(batch)).numpy()
+
+
+class OnnxEmotionModel(_EmotionModelBase):
+    """Run an exported .onnx model on onnxruntime's CPU execution provider"""
+
+    def __init__(self, model_path=BACKEND_MODEL_PATHS['onnx'], labels=EMOTION_LABELS, intra_op_threads=0):
+        import onnxruntime as ort
+
+        self.labels = labels
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self._input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch):
+        return self.session.run(None, {self._input_name: _as_batch(batch)})[0]
+
+
+class TFLiteEmotionModel(_EmotionModelBase):
+    """
+    Run an exported .tflite model, preferring the standalone tflite_runtime
+    package so TensorFlow itself never has to be imported.
+    """
+
+    def __init__(self, model_path=BACKEND_MODEL_PATHS['tflite'], labels=EMOTION_LABELS, num_threads=None,
+                 shared_weights=None):
+        try:
+            from tflite_runtime.interpreter import Interpreter, OpResolverType
+        except ImportError:
+            from tensorflow.lite import Interpreter
+            from tensorflow.lite.experimental import OpResolverType
+
+        if shared_weights is None:
+            shared_weights = os.environ.get('EMOTION_TFLITE_SHARED_WEIGHTS') == '1'
+
+        self.labels = labels
+        # The interpreter mmaps model_path, so weights live in the page cache
+        # and are shared by every process serving the same file. The default
+        # XNNPACK delegate repacks them into private memory per process;
+        # shared_weights skips it to keep them shared across workers.
+        resolver = (OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES if shared_weights
+                    else OpResolverType.AUTO)
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads,
+                                       experimental_op_resolver_type=resolver)
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = None
+        # The interpreter holds mutable tensor state, so calls are serialized
+        self._lock = threading.Lock()
+
+    def _quantize(self, batch):
+        if self._input['dtype'] == np.float32:
+            return batch
+        scale, zero_point = self._input['quantization']
+        return np.round(batch / scale + zero_point).astype(self._input['dtype'])
+
+    def _dequantize(self, output):
+        if self._output['dtype'] == np.float32:
+            return output
+        scale, zero_point = self._output['quantization']
+        return (output.astype(np.float32) - zero_point) * scale
+
+    def predict(self, batch):
+        batch = _as_batch(batch)
+        with self._lock:
+            if batch.shape[0] != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input['index'], batch.shape)
+                self.interpreter.allocate_tensors()
+                self._batch_size = batch.shape[0]
+            self.interpreter.set_tensor(self._input['index'], self._quantize(batch))
+            self.interpreter.invoke()
+            return self._dequantize(self.interpreter.get_tensor(self._output['index']))
+
+
+def load_emotion_model(backend=None, model_path=None, labels=EMOTION_LABELS):
+    """
+    Build the emotion model for a runtime backend: keras, onnx, onnx-int8,
+    tflite or tflite-int8. Defaults to EMOTION_BACKEND, then keras.
+    """
+    backend = (backend or os.environ.get('EMOTION_BACKEND', 'keras')).lower()
+    if backend not in BACKEND_MODEL_PATHS:
+        raise ValueError(f"Unknown emotion backend: {backend}. Choose from {', '.join(BACKEND_MODEL_PATHS)}")
+
+    model_path = model_path or BACKEND_MODEL_PATHS[backend]
+    if backend == 'keras':
+        return EmotionModel(model_path, labels)
+    if backend.startswith('onnx'):
+        return OnnxEmotionModel(model_path, labels)
+    return TFLiteEmotionModel(model_path, labels)
@@ -1,34 +1,170 @@
-l = []
+import os
 
-d = {}
+import numpy as np
 
-# d['angry'] = 0
-# d['disgust'] = 0
-# d['fear'] = 0
-# d['happy'] = 0
-# d['neutral'] = 0
-# d['sad'] = 0
-# d['surprise'] = 0
+# Confidence (1-5) for the most common emotion; anything else scores 1.
+# The model labels anger as 'anger', older clients send 'angry'.
+CONFIDENCE_BY_EMOTION = {
+    'happy': 5,
+    'neutral': 4,
+    'surprise': 3,
+    'angry': 2,
+    'anger': 2,
+    'disgust': 2,
+}
 
-for x in l:
-    if x not in d.keys:
-        d[x]=1
+# Frame rate assumed when a timeline comes without timestamps
+EMOTION_TIMELINE_FPS = float(os.environ.get('EMOTION_TIMELINE_FPS', 30))
+# Rolling windows: length and distance between window starts (0 disables them)
+EMOTION_WINDOW_SECONDS = float(os.environ.get('EMOTION_WINDOW_SECONDS', 30))
+EMOTION_WINDOW_STEP_SECONDS = float(os.environ.get('EMOTION_WINDOW_STEP_SECONDS', 10))
+# Most rolling windows one timeline may produce (timeline span / step)
+EMOTION_MAX_WINDOWS = int(os.environ.get('EMOTION_MAX_WINDOWS', 10000))
+
+
+def confidence_scores(labels):
+    """1-5 confidence for each label, as an array aligned with the model output"""
+    return np.array([CONFIDENCE_BY_EMOTION.get(label.lower(), 1) for label in labels], dtype=np.float64)
+
+
+def _rounded(values, digits=3):
+    """Array -> JSON list, NaN as None"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(values), None, np.round(values, digits)).tolist()
+
+
+def _percent(part, whole):
+    return round(float(part) / float(whole) * 100, 2) if whole else 0.0
+
+
+def score_probabilities(probabilities, labels, timestamps=None, fps=EMOTION_TIMELINE_FPS,
+                        window_seconds=EMOTION_WINDOW_SECONDS, step_seconds=EMOTION_WINDOW_STEP_SECONDS):
+    """
+    Confidence score for a timeline of per-frame class probabilities.
+
+    probabilities is (n_frames, n_labels); rows of NaN mark frames without
+    a face. Each frame counts for the time until the next one, so gaps in
+    an irregular timeline are weighted correctly. Everything is computed
+    with whole-array operations (rolling windows from cumulative sums), so
+    an hour at 30 fps takes milliseconds.
+
+    Returns the most common emotion and its 1-5 confidence (as the client
+    always has), the label histogram, time-weighted average probabilities,
+    the probability-weighted expected confidence, and per-window columns.
+    Raises ValueError for non-finite timestamps, a negative window or step,
+    or one that would give more than EMOTION_MAX_WINDOWS windows.
+    """
+    if not (window_seconds >= 0 and step_seconds >= 0):
+        raise ValueError('window_seconds and step_seconds must not be negative')
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    n = len(probabilities)
+    empty = {'mostCommonEmotion': None, 'confidence': None, 'emotionBreakdown': {}, 'percentages': {},
+             'samples': n, 'samplesWithFace': 0}
+    if not n:
+        return empty
+    k = probabilities.shape[1]
+
+    if timestamps is None:
+        timestamps = np.arange(n) / fps
     else:
-        d[x]+=1
-    
-res = max(d, key=d.get)
-# emotion_list = sorted(d, key=d.get, reverse=True)
-
-if res=='happy':
-    c = 5
-elif res=='neutral':
-    c = 4
-elif res=='surprise':
-    c = 3
-elif res=='angry' or res=='disgust':
-    c = 2
-else:
-    c = 1
-    
-for x in d.keys:
-    print(x , d[x]/len(l)*100)
\ No newline at end of file
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not np.isfinite(timestamps).all():
+            raise ValueError('timestamps must be finite numbers')
+        if np.any(np.diff(timestamps) < 0):
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, probabilities = timestamps[order], probabilities[order]
+
+    valid = ~np.isnan(probabilities).any(axis=1)
+    if not valid.any():
+        return empty
+    probabilities = np.where(valid[:, None], probabilities, 0.0)
+    best = probabilities.argmax(axis=1)
+
+    # How long each frame is in effect: until the next frame; the last one
+    # for the typical frame interval
+    gaps = np.diff(timestamps)
+    last = np.median(gaps) if len(gaps) else 1.0 / fps
+    durations = np.append(gaps, last) * valid
+
+    counts = np.bincount(best[valid], minlength=k)
+    face_seconds = durations.sum()
+    seconds_by_label = np.bincount(best, weights=durations, minlength=k)
+    average = durations @ probabilities / face_seconds if face_seconds else probabilities[valid].mean(axis=0)
+    scores = confidence_scores(labels)
+    most_common = int(counts.argmax())      # ties go to the first label
+    present = np.flatnonzero(counts)
+
+    result = {
+        'mostCommonEmotion': labels[most_common],
+        'confidence': int(scores[most_common]),
+        'emotionBreakdown': {labels[i]: int(counts[i]) for i in present},
+        'percentages': {labels[i]: _percent(counts[i], valid.sum()) for i in present},
+        'samples': n,
+        'samplesWithFace': int(valid.sum()),
+        'durationSeconds': round(float(timestamps[-1] - timestamps[0] + last), 2),
+        'faceSeconds': round(float(face_seconds), 2),
+        'timeShare': {labels[i]: _percent(seconds_by_label[i], face_seconds) for i in present},
+        'averageProbabilities': dict(zip(labels, _rounded(average, 4))),
+        'expectedConfidence': round(float(average @ scores), 3),
+    }
+    if window_seconds and step_seconds:
+        result['windows'] = _rolling_windows(timestamps, probabilities, best, valid, durations, last, labels,
+                                             scores, window_seconds, step_seconds)
+    return result
+
+
+def _rolling_windows(timestamps, probabilities, best, valid, durations, last, labels, scores, window_seconds,
+                     step_seconds):
+    """Per-window dominant emotion and confidence, as columns (one entry per window)"""
+    k = len(labels)
+    # Prefix sums; any window's totals are then a difference of two rows
+    zero = np.zeros((1, k))
+    label_counts = np.concatenate([zero, np.cumsum(np.eye(k)[best] * valid[:, None], axis=0)])
+    weighted = np.concatenate([zero, np.cumsum(probabilities * durations[:, None], axis=0)])
+    seconds = np.concatenate([[0.0], np.cumsum(durations)])
+
+    stop = max(timestamps[-1] - window_seconds, 0) + step_seconds
+    if (stop - timestamps[0]) / step_seconds > EMOTION_MAX_WINDOWS:
+        raise ValueError(f'More than {EMOTION_MAX_WINDOWS} windows; use a larger step')
+    starts = np.arange(timestamps[0], stop, step_seconds)
+    starts = starts[starts <= timestamps[-1]]
+    ends = np.minimum(starts + window_seconds, timestamps[-1] + last)   # the last window may be shorter
+    first = np.searchsorted(timestamps, starts, side='left')
+    end = np.searchsorted(timestamps, ends, side='left')
+
+    counts = label_counts[end] - label_counts[first]
+    face_seconds = seconds[end] - seconds[first]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        average = (weighted[end] - weighted[first]) / face_seconds[:, None]
+        # Zero-length windows (e.g. every timestamp equal) have no face share
+        face_share = np.where(ends > starts, face_seconds / (ends - starts), np.nan)
+    has_face = counts.sum(axis=1) > 0
+    dominant = counts.argmax(axis=1)
+    return {
+        'start': _rounded(starts, 2),
+        'end': _rounded(ends, 2),
+        'emotion': np.where(has_face, np.array(labels, dtype=object)[dominant], None).tolist(),
+        'confidence': np.where(has_face, scores[dominant].astype(int), None).tolist(),
+        'expectedConfidence': _rounded(np.where(face_seconds > 0, average @ scores, np.nan)),
+        'faceShare': _rounded(face_share, 3),
+    }
+
+
+def score_emotions(emotions):
+    """
+    Most common emotion, its 1-5 confidence score and the share (%) of
+    each emotion in a list of per-frame labels.
+    """
+    if not len(emotions):
+        return score_probabilities([], [])
+    labels, index = np.unique(np.char.lower(np.asarray(emotions, dtype=str)), return_inverse=True)
+    one_hot = np.eye(len(labels))[index]
+    return score_probabilities(one_hot, labels.tolist(), window_seconds=0)
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    # e.g. python -m ConfidenceAnalyzer.result happy neutral happy sad
+    print(json.dumps(score_emotions(sys.argv[1:]), indent=2))
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from ConfidenceAnalyzer.face_pipeline import analyze_frames, crop_faces, decode_gray
+from ConfidenceAnalyzer.result import score_probabilities
+
+logger = logging.getLogger('emotion_stream')
+
+# Frames buffered per connection; when inference falls behind, the oldest are
+# dropped. 1 keeps only the newest frame, which gives the lowest latency.
+STREAM_MAX_PENDING = int(os.environ.get('STREAM_MAX_PENDING', 1))
+# Frames of one connection analyzed together. Detection is per frame, so this
+# mostly adds queueing; faces from all connections are coalesced into shared
+# forward passes by the micro-batcher regardless.
+STREAM_MAX_BATCH = int(os.environ.get('STREAM_MAX_BATCH', 1))
+# Largest accepted frame message
+STREAM_MAX_FRAME_BYTES = int(os.environ.get('STREAM_MAX_FRAME_BYTES', 4 * 1024 * 1024))
+
+# jpeg: any encoded image cv2 can decode; gray: raw width x height uint8 pixels
+FORMATS = ('jpeg', 'gray')
+# faces: full frames, faces found server-side; face: each frame is already a face crop
+MODES = ('faces', 'face')
+
+
+def decode_frame(data, fmt='jpeg', width=None, height=None):
+    """Frame message -> grayscale uint8 array, decoded in memory"""
+    if len(data) > STREAM_MAX_FRAME_BYTES:
+        raise ValueError(f"Frame larger than {STREAM_MAX_FRAME_BYTES} bytes")
+    if fmt == 'gray':
+        if len(data) != width * height:
+            raise ValueError(f"Raw frame has {len(data)} bytes, expected {width}x{height}")
+        return np.frombuffer(data, dtype=np.uint8).reshape(height, width)
+    return decode_gray(data)
+
+
+class EmotionStream:
+    """
+    One client's stream of frames -> emotion events.
+
+    The receiving side calls push() for every frame as it arrives and never
+    blocks, so the socket is always drained. Frames wait in a small buffer;
+    when the client sends faster than frames are analyzed the oldest are
+    dropped, keeping results current instead of falling further behind.
+    The sending side takes batches with next_batch() and runs analyze() on
+    a worker thread. A frame that fails gets an 'error' event and the
+    stream carries on. The counters and timeline are shared by both sides,
+    so they are only touched under a lock.
+    """
+
+    def __init__(self, detector, predict, labels, max_pending=STREAM_MAX_PENDING, max_batch=STREAM_MAX_BATCH):
+        self.detector = detector
+        self.predict = predict
+        self.labels = labels
+        self.max_batch = max_batch
+        self.config = {'format': 'jpeg', 'mode': 'faces', 'width': None, 'height': None}
+        self._pending = deque(maxlen=max_pending)
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.received = 0
+        self.analyzed = 0
+        self.dropped = 0
+        # Largest face's probabilities per analyzed frame (NaN: no face), for the summary score
+        self._timeline = []
+        self._timestamps = []
+
+    def configure(self, options):
+        """Apply format/mode/width/height options; raises ValueError and keeps the old config"""
+        config = dict(self.config)
+        for key in ('format', 'mode'):
+            if options.get(key) is not None:
+                config[key] = str(options[key]).lower()
+        for key in ('width', 'height'):
+            if options.get(key) is not None:
+                config[key] = int(options[key])
+        if config['format'] not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        if config['mode'] not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        if config['format'] == 'gray' and not (config['width'] and config['height']
+                                               and config['width'] > 0 and config['height'] > 0):
+            raise ValueError("Raw grayscale frames need positive width and height")
+        self.config = config
+        return config
+
+    def push(self, data):
+        """Buffer a frame message; returns its sequence number"""
+        with self._lock:
+            seq = self.received
+            self.received += 1
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+        # Each frame keeps the config it was sent under
+        self._pending.append((seq, time.perf_counter(), data, self.config))
+        self._ready.set()
+        return seq
+
+    def drop(self, batch):
+        """Count frames that could not be analyzed (e.g. the inference pool is saturated)"""
+        with self._lock:
+            self.dropped += len(batch)
+
+    def fail(self, batch, error):
+        """Error events for a batch whose analysis failed outright"""
+        return [{'type': 'error', 'seq': seq, 'error': str(error)} for seq, _, _, _ in batch]
+
+    def close(self, discard=False):
+        """No more frames; with discard, buffered ones are abandoned too"""
+        self._closed = True
+        if discard:
+            self._pending.clear()
+        self._ready.set()
+
+    async def next_batch(self):
+        """Up to max_batch buffered frames, oldest first; None once closed and drained"""
+        while not self._pending:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+
+    def analyze(self, batch):
+        """Decode and classify a batch (runs off the event loop); returns one event per frame"""
+        events, frames, decoded = [], [], []
+        for seq, received_at, data, config in batch:
+            try:
+                frames.append(decode_frame(data, config['format'], config['width'], config['height']))
+                decoded.append((seq, received_at, config))
+            except Exception as e:
+                events.append({'type': 'error', 'seq': seq, 'error': str(e)})
+
+        try:
+            results = self._classify(frames, decoded)
+        except Exception as e:
+            # Detection/inference failed for these frames only; the stream goes on
+            logger.exception("Failed to analyze %d stream frames", len(decoded))
+            events.extend({'type': 'error', 'seq': seq, 'error': str(e)} for seq, _, _ in decoded)
+            decoded, results = [], []
+
+        now = time.perf_counter()
+        with self._lock:
+            for (seq, received_at, _), result in zip(decoded, results):
+                faces = result['faces']
+                self._timestamps.append(received_at - self._started)
+                self._timeline.append([faces[0]['probabilities'][label] for label in self.labels] if faces
+                                      else [np.nan] * len(self.labels))
+                events.append({
+                    'type': 'emotion',
+                    'seq': seq,
+                    'emotion': faces[0]['emotion'] if faces else None,
+                    **result,
+                    'latencyMs': round((now - received_at) * 1000, 1),
+                    'dropped': self.dropped,
+                })
+            self.analyzed += len(decoded)
+        events.sort(key=lambda event: event['seq'])
+        return events
+
+    def _classify(self, frames, decoded):
+        """Detection and emotion results for the decoded frames, grouped by mode"""
+        by_mode = {mode: [i for i, (_, _, config) in enumerate(decoded) if config['mode'] == mode] for mode in MODES}
+        results = [None] * len(frames)
+        if by_mode['faces']:
+            detected = analyze_frames([frames[i] for i in by_mode['faces']], self.detector, self.predict, self.labels)
+            for i, result in zip(by_mode['faces'], detected):
+                results[i] = result
+        if by_mode['face']:
+            crops = np.concatenate([crop_faces(frames[i], [(0, 0, frames[i].shape[1], frames[i].shape[0])])
+                                    for i in by_mode['face']])
+            for i, probs in zip(by_mode['face'], self.predict(crops)):
+                best = int(np.argmax(probs))
+                results[i] = {'faces': [{
+                    'emotion': self.labels[best],
+                    'confidence': round(float(probs[best]), 4),
+                    'probabilities': {label: round(float(p), 4) for label, p in zip(self.labels, probs)},
+                }]}
+        return results
+
+    def summary(self):
+        with self._lock:
+            counts = {'received': self.received, 'analyzed': self.analyzed, 'dropped': self.dropped}
+            timeline, timestamps = list(self._timeline), list(self._timestamps)
+        return {
+            **counts,
+            **score_probabilities(np.array(timeline).reshape(-1, len(self.labels)), self.labels,
+                                  timestamps=timestamps),
+        }
@@ -0,0 +1,154 @@
+import itertools
+import os
+
+import cv2
+import numpy as np
+
+from ConfidenceAnalyzer.face_pipeline import crop_faces
+
+# Run the face detector every N frames (and whenever a track is lost)
+TRACK_DETECT_EVERY = int(os.environ.get('TRACK_DETECT_EVERY', 10))
+# Classify each tracked face every N frames
+TRACK_CLASSIFY_EVERY = int(os.environ.get('TRACK_CLASSIFY_EVERY', 5))
+# Template match score below which a track counts as lost
+TRACK_MIN_SCORE = float(os.environ.get('TRACK_MIN_SCORE', 0.5))
+# Weight of a new prediction in the per-face moving average (1 = no smoothing)
+TRACK_SMOOTHING = float(os.environ.get('TRACK_SMOOTHING', 0.4))
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = min(ax + aw, bx + bw) - max(ax, bx)
+    h = min(ay + ah, by + bh) - max(ay, by)
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / (aw * ah + bw * bh - inter)
+
+
+class FaceTrack:
+    _ids = itertools.count(1)
+
+    def __init__(self, box):
+        self.id = next(self._ids)
+        self.box = box              # (x, y, w, h) in full-frame pixels
+        self.template = None        # face patch at tracking scale
+        self.score = 1.0
+        self.probabilities = None   # smoothed class probabilities
+        self.classified_at = None   # frame index of the last prediction
+
+
+class FaceTracker:
+    """
+    Follow faces between detections instead of detecting on every frame.
+
+    The Haar detector runs every detect_every frames; in between, each face
+    is located by template matching its last detected patch inside a small
+    window around its previous position, on a downscaled frame. A weak
+    match triggers a detection on the same frame. Faces are classified
+    every classify_every frames and their probabilities smoothed with an
+    exponential moving average, which also steadies flickering labels.
+    """
+
+    def __init__(self, detector, predict, detect_every=TRACK_DETECT_EVERY, classify_every=TRACK_CLASSIFY_EVERY,
+                 min_score=TRACK_MIN_SCORE, smoothing=TRACK_SMOOTHING):
+        self.detector = detector
+        self.predict = predict
+        self.detect_every = max(1, detect_every)
+        self.classify_every = max(1, classify_every)
+        self.min_score = min_score
+        self.smoothing = smoothing
+        self.tracks = []
+        self.frame_index = -1
+        self._last_detection = None
+        self.counters = {'frames': 0, 'detections': 0, 'lostTracks': 0, 'classifiedFaces': 0}
+
+    def _scale(self, gray):
+        return min(1.0, self.detector.max_side / max(gray.shape[:2]))
+
+    def _small(self, gray, scale):
+        if scale == 1.0:
+            return gray
+        height, width = gray.shape[:2]
+        return cv2.resize(gray, (max(1, round(width * scale)), max(1, round(height * scale))),
+                          interpolation=cv2.INTER_AREA)
+
+    def _set_template(self, track, small, scale):
+        x, y, w, h = (int(round(v * scale)) for v in track.box)
+        track.template = small[y:y + h, x:x + w].copy()
+
+    def _follow(self, track, small, scale):
+        """Move the track to the best template match near its last position; returns the match score"""
+        template = track.template
+        th, tw = template.shape[:2]
+        if th < 4 or tw < 4:
+            return 0.0
+        x, y, w, h = (v * scale for v in track.box)
+        pad_x, pad_y = int(w * 0.5) + 2, int(h * 0.5) + 2
+        left, top = max(0, int(x) - pad_x), max(0, int(y) - pad_y)
+        right = min(small.shape[1], int(x + w) + pad_x)
+        bottom = min(small.shape[0], int(y + h) + pad_y)
+        window = small[top:bottom, left:right]
+        if window.shape[0] < th or window.shape[1] < tw:
+            return 0.0
+        scores = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (mx, my) = cv2.minMaxLoc(scores)
+        track.box = ((left + mx) / scale, (top + my) / scale, track.box[2], track.box[3])
+        return score
+
+    def _detect(self, gray, small, scale):
+        self.counters['detections'] += 1
+        self._last_detection = self.frame_index
+        boxes = [tuple(float(v) for v in box) for box in self.detector.detect(gray)]
+        # Greedy IoU association keeps each face's id and smoothed emotion
+        matched, tracks = set(), []
+        for box in boxes:
+            best, best_iou = None, 0.3
+            for track in self.tracks:
+                overlap = iou(box, track.box)
+                if track.id not in matched and overlap > best_iou:
+                    best, best_iou = track, overlap
+            track = best or FaceTrack(box)
+            track.box, track.score = box, 1.0
+            matched.add(track.id)
+            self._set_template(track, small, scale)
+            tracks.append(track)
+        self.tracks = tracks
+
+    def _classify(self, gray):
+        due = [t for t in self.tracks
+               if t.classified_at is None or self.frame_index - t.classified_at >= self.classify_every]
+        if not due:
+            return
+        boxes = np.array([[int(round(v)) for v in t.box] for t in due], dtype=np.int32)
+        probabilities = np.asarray(self.predict(crop_faces(gray, boxes)), dtype=np.float32)
+        for track, probs in zip(due, probabilities):
+            if track.probabilities is None:
+                track.probabilities = probs
+            else:
+                track.probabilities = self.smoothing * probs + (1 - self.smoothing) * track.probabilities
+            track.classified_at = self.frame_index
+        self.counters['classifiedFaces'] += len(due)
+
+    def update(self, gray):
+        """Process the next grayscale frame; returns the current tracks"""
+        self.frame_index += 1
+        self.counters['frames'] += 1
+        scale = self._scale(gray)
+        small = self._small(gray, scale)
+
+        due = self._last_detection is None or self.frame_index - self._last_detection >= self.detect_every
+        if not due:
+            for track in self.tracks:
+                track.score = self._follow(track, small, scale)
+            lost = sum(track.score < self.min_score for track in self.tracks)
+            self.counters['lostTracks'] += lost
+            due = lost > 0
+        if due:
+            self._detect(gray, small, scale)
+        self._classify(gray)
+        return self.tracks
+
+    def boxes(self):
+        return np.array([[int(round(v)) for v in t.box] for t in self.tracks], dtype=np.int32).reshape(-1, 4)
@@ -0,0 +1,231 @@
+# Run from Server/FLASK: python -m ConfidenceAnalyzer.video_scoring interview.mp4 --sample-fps 2
+import logging
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from ConfidenceAnalyzer.face_pipeline import FaceDetector, crop_faces
+from ConfidenceAnalyzer.result import score_probabilities
+
+logger = logging.getLogger('video_scoring')
+
+# Frames analyzed per second of video
+VIDEO_SAMPLE_FPS = float(os.environ.get('VIDEO_SAMPLE_FPS', 2))
+# Faces per forward pass
+VIDEO_BATCH_SIZE = int(os.environ.get('VIDEO_BATCH_SIZE', 64))
+# Decoding threads, each with its own capture over one segment of the video
+VIDEO_DECODE_WORKERS = int(os.environ.get('VIDEO_DECODE_WORKERS', min(4, os.cpu_count() or 1)))
+# Samples further apart than this many frames are reached by seeking; closer
+# ones by grabbing (decoding without converting) the frames in between
+VIDEO_SEEK_MIN_GAP = int(os.environ.get('VIDEO_SEEK_MIN_GAP', 48))
+# Crops waiting for the model; decoding pauses when the model falls behind
+VIDEO_QUEUE_SIZE = int(os.environ.get('VIDEO_QUEUE_SIZE', 256))
+
+
+class VideoError(Exception):
+    pass
+
+
+def video_info(path):
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise VideoError("Could not open video")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+    if frames <= 0:
+        raise VideoError("Video has no frames")
+    return fps, frames
+
+
+def sample_frames(fps, frame_count, sample_fps=VIDEO_SAMPLE_FPS):
+    """Frame indices to analyze, sample_fps per second of video"""
+    if not (math.isfinite(sample_fps) and sample_fps > 0):
+        raise VideoError("sample_fps must be a positive number")
+    step = max(1.0, fps / sample_fps)
+    return np.unique(np.arange(0, frame_count, step).astype(np.int64))
+
+
+def _put(out, item, stop):
+    """Queue item unless the consumer has stopped (a full queue must not block shutdown)"""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def _decode_segment(path, frame_indices, positions, detector, out, stop):
+    """
+    Producer: decode the given frames, crop the largest face and queue
+    (position, crop). Always ends with a (None, error) sentinel, error being
+    None on success or the exception that stopped this producer.
+    """
+    capture = None
+    error = None
+    current = 0     # index of the next frame read() would return
+    try:
+        capture = cv2.VideoCapture(path)
+        for frame_index, position in zip(frame_indices, positions):
+            if stop.is_set():
+                return
+            crop = None
+            try:
+                gap = frame_index - current
+                if gap < 0 or gap > VIDEO_SEEK_MIN_GAP:
+                    capture.set(cv2.CAP_PROP_POS_FRAMES, int(frame_index))
+                else:
+                    for _ in range(gap):
+                        capture.grab()
+                ok, frame = capture.read()
+                current = frame_index + 1
+                if ok:
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    boxes = detector.detect(gray)[:1]
+                    crop = crop_faces(gray, boxes)[0] if len(boxes) else None
+            except cv2.error:
+                # Every sample must be answered or the consumer would wait forever
+                logger.exception("Failed to decode frame %d", frame_index)
+            _put(out, (position, crop), stop)
+    except Exception as e:
+        error = e
+    finally:
+        if capture is not None:
+            capture.release()
+        # Without this the consumer would wait forever for the remaining samples
+        _put(out, (None, error), stop)
+
+
+def score_video(path, predict, labels, sample_fps=VIDEO_SAMPLE_FPS, batch_size=VIDEO_BATCH_SIZE,
+                decode_workers=VIDEO_DECODE_WORKERS, detector=None):
+    """
+    Emotion timeline and confidence score for a recorded interview.
+
+    Sampled frames are decoded by several threads (each seeking through its
+    own segment of the video) that detect and crop the candidate's face,
+    while this thread batches the crops through predict(). Decoding and
+    inference overlap; the bounded queue between them keeps memory flat.
+    """
+    started = time.perf_counter()
+    fps, frame_count = video_info(path)
+    frame_indices = sample_frames(fps, frame_count, sample_fps)
+    detector = detector or FaceDetector()
+
+    crops = queue.Queue(maxsize=VIDEO_QUEUE_SIZE)
+    stop = threading.Event()
+    segments = np.array_split(np.arange(len(frame_indices)), max(1, decode_workers))
+    producers = [
+        threading.Thread(target=_decode_segment, name=f'video-decode-{i}', daemon=True,
+                         args=(path, frame_indices[segment], segment, detector, crops, stop))
+        for i, segment in enumerate(segments) if len(segment)
+    ]
+    for producer in producers:
+        producer.start()
+
+    probabilities = np.full((len(frame_indices), len(labels)), np.nan, dtype=np.float32)
+    pending_positions, pending_crops = [], []
+    inference_seconds = 0.0
+
+    def flush():
+        nonlocal inference_seconds
+        began = time.perf_counter()
+        probabilities[pending_positions] = predict(np.stack(pending_crops))
+        inference_seconds += time.perf_counter() - began
+        pending_positions.clear()
+        pending_crops.clear()
+
+    try:
+        finished = 0
+        while finished < len(producers):
+            position, crop = crops.get()
+            if position is None:
+                finished += 1
+                if crop is not None:
+                    # A producer failed: stop the others and re-raise its error here
+                    raise crop
+                continue
+            if crop is not None:
+                pending_positions.append(position)
+                pending_crops.append(crop)
+            # Run a batch when full, or early if decoding has nothing else ready
+            if len(pending_crops) >= batch_size or (pending_crops and crops.empty()):
+                flush()
+        if pending_crops:
+            flush()
+    finally:
+        stop.set()
+        for producer in producers:
+            producer.join()
+
+    has_face = ~np.isnan(probabilities[:, 0])
+    best = np.argmax(np.nan_to_num(probabilities, nan=-1.0), axis=1)
+    timeline = [
+        {
+            'time': round(float(frame_index / fps), 3),
+            'emotion': labels[int(b)] if face else None,
+            'probabilities': [round(float(p), 4) for p in probs] if face else None,
+        }
+        for frame_index, face, b, probs in zip(frame_indices, has_face, best, probabilities)
+    ]
+    score = score_probabilities(probabilities, list(labels), timestamps=frame_indices / fps)
+    elapsed = time.perf_counter() - started
+    duration = frame_count / fps
+    return {
+        'labels': list(labels),
+        **score,
+        'durationSeconds': round(duration, 2),
+        'sampleFps': sample_fps,
+        'timeline': timeline,
+        'processing': {
+            'seconds': round(elapsed, 2),
+            'realtimeFactor': round(duration / elapsed, 1) if elapsed else None,
+            'inferenceSeconds': round(inference_seconds, 2),
+            'decodeWorkers': len(producers),
+        },
+    }
+
+
+def main():
+    import argparse
+    import json
+
+    from ConfidenceAnalyzer.inference import EMOTION_LABELS, load_emotion_model
+
+    parser = argparse.ArgumentParser(description='Score a recorded interview video')
+    parser.add_argument('video')
+    parser.add_argument('--sample-fps', type=float, default=VIDEO_SAMPLE_FPS)
+    parser.add_argument('--batch-size', type=int, default=VIDEO_BATCH_SIZE)
+    parser.add_argument('--decode-workers', type=int, default=VIDEO_DECODE_WORKERS)
+    parser.add_argument('--backend', help='Emotion runtime backend (default: EMOTION_BACKEND or keras)')
+    parser.add_argument('--output', help='Write the JSON result here instead of printing a summary')
+    args = parser.parse_args()
+    if not (math.isfinite(args.sample_fps) and args.sample_fps > 0):
+        parser.error('--sample-fps must be a positive number')
+
+    model = load_emotion_model(args.backend)
+    try:
+        result = score_video(args.video, model.predict, EMOTION_LABELS, args.sample_fps, args.batch_size,
+                             args.decode_workers)
+    except VideoError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results saved to {args.output}")
+    else:
+        summary = {k: v for k, v in result.items() if k != 'timeline'}
+        print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,61 +1,425 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, request, jsonify
 from flask_cors import CORS
+import hashlib
+import io
+import itertools
+import json
+import math
 import os
-from PIL import Image
+import tempfile
 import numpy as np
-from keras.models import load_model
-from resume_analyzer.analyzer import analyze_resume
-from AnalyzeResume.resume_analyzer import analyze_resume1
+from resume_analyzer import analyzer as role_analyzer
+from AnalyzeResume import resume_analyzer as report_analyzer
+from AnalyzeResume.resume_analyzer import analyze_resume_stream
+from AnalyzeResume.batch_scoring import analyze_resumes_batch
+from AnalyzeResume.candidate_index import get_candidate_index
+from AnalyzeResume.semantic_index import SemanticModelUnavailable, get_semantic_index
+from AnalyzeResume.pdf_extraction import PdfExtractionError, read_source
+from ConfidenceAnalyzer.batcher import MicroBatcher
+from ConfidenceAnalyzer.face_pipeline import analyze_frames, decode_gray
+from ConfidenceAnalyzer.inference import EMOTION_LABELS, preprocess_image
+from ConfidenceAnalyzer.result import EMOTION_WINDOW_SECONDS, EMOTION_WINDOW_STEP_SECONDS, score_probabilities
+from ConfidenceAnalyzer.video_scoring import VIDEO_SAMPLE_FPS, VideoError, score_video
+from model_registry import registry
+from result_cache import cached_analysis, cached_text, get_cache
+
+# Uploads are kept in memory up to this size and spill to an anonymous,
+# already-unlinked temp file above it; nothing is written under uploads/
+UPLOAD_SPOOL_MAX_BYTES = int(os.environ.get('UPLOAD_SPOOL_MAX_BYTES', 4 * 1024 * 1024))
+# Largest k accepted by the candidate and semantic search endpoints
+SEARCH_MAX_K = int(os.environ.get('SEARCH_MAX_K', 100))
+
+class SpooledUploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_BYTES, mode='rb+')
 
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 CORS(app)
 
-UPLOAD_FOLDER = 'uploads'
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+def analysis_response(result):
+    # Every PDF worker busy is the server's problem, not the document's:
+    # answer 503 so clients retry instead of showing the error
+    if result.get('errorCode') == 'busy':
+        return jsonify(result), 503, {'Retry-After': '1'}
+    return jsonify(result)
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
     if 'file' not in request.files:
         return jsonify({'error': 'No file uploaded'}), 400
 
+    # Analyzed straight from the upload buffer; identical uploads reuse the
+    # cached result (see result_cache)
     file = request.files['file']
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-    file.save(filepath)
-
-    result = analyze_resume(filepath)
-    return jsonify(result)
+    result = cached_analysis(file.stream, 'analyze', role_analyzer.ANALYZER_VERSION,
+                             role_analyzer.extract_text_from_pdf, role_analyzer.analyze_resume_text)
+    return analysis_response(result)
 
 @app.route('/analyze-resume', methods=['POST'])
 def analyze_resume_route():
-    if 'resume' not in request.files:
+    file = request.files.get('resume') or request.files.get('file')
+    if file is None:
         return jsonify({"error": "No file uploaded"}), 400
 
-    file = request.files['file']
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-    file.save(filepath)
-    result = analyze_resume1(filepath)
+    # Cached per upload and job; a new job title reuses the cached text
+    job_title = request.form.get('job_title')
+    job_description = request.form.get('job_description')
+    result = cached_analysis(
+        file.stream, 'analyze-resume', report_analyzer.ANALYZER_VERSION,
+        report_analyzer.extract_text_from_pdf,
+        lambda text: report_analyzer.analyze_resume_text(text, None, job_title, job_description),
+        params={'jobTitle': job_title, 'jobDescription': job_description}
+    )
+    return analysis_response(result)
+
+@app.route('/analyze/stats', methods=['GET'])
+def analyze_stats():
+    return jsonify(get_cache().stats())
+
+@app.route('/analyze-resume/stream', methods=['POST'])
+def analyze_resume_stream_route():
+    file = request.files.get('resume') or request.files.get('file')
+    if file is None:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    # Read the upload now; the response body is generated after this returns
+    events = analyze_resume_stream(
+        io.BytesIO(file.read()),
+        request.form.get('job_title'),
+        request.form.get('job_description')
+    )
+    # Wait for the first event so "all PDF workers busy" can still be a 503
+    first = next(events)
+    if first.get('errorCode') == 'busy':
+        return analysis_response(first)
+    events = itertools.chain([first], events)
+
+    # Newline-delimited JSON by default, Server-Sent Events with ?format=sse
+    if request.args.get('format') == 'sse':
+        body = (f"event: {e['event']}\ndata: {json.dumps(e)}\n\n" for e in events)
+        return Response(body, mimetype='text/event-stream')
+    return Response((json.dumps(e) + "\n" for e in events), mimetype='application/x-ndjson')
+
+@app.route('/analyze-resume/batch', methods=['POST'])
+def analyze_resume_batch_route():
+    # Bulk upload: many 'resumes' files ranked against one job
+    files = request.files.getlist('resumes')
+    if not files:
+        return jsonify({"error": "No files uploaded"}), 400
+
+    result = analyze_resumes_batch(files, request.form.get('job_title'), request.form.get('job_description'))
     return jsonify(result)
 
+@app.route('/candidates', methods=['POST'])
+def add_candidates():
+    # Index one or more resumes for job search; the id defaults to the PDF's SHA-256
+    files = request.files.getlist('resumes') or request.files.getlist('resume')
+    if not files:
+        return jsonify({"error": "No files uploaded"}), 400
+
+    index = get_candidate_index()
+    indexed = []
+    for file in files:
+        data = read_source(file.stream)
+        candidate_id = (request.form.get('candidate_id') if len(files) == 1 else None) or hashlib.sha256(data).hexdigest()
+        try:
+            text = cached_text(data, report_analyzer.extract_text_from_pdf)
+        except PdfExtractionError as e:
+            indexed.append({"candidateId": candidate_id, "name": file.filename, **e.to_dict()})
+            continue
+        indexed.append(index.add(candidate_id, text, request.form.get('name') or file.filename))
+    return jsonify({"indexed": indexed, "total": len(index)})
+
+def search_limit(params):
+    # k from the request, or None unless it is an integer from 1 to SEARCH_MAX_K
+    try:
+        k = int(params.get('k', 10))
+    except (TypeError, ValueError):
+        return None
+    return k if 1 <= k <= SEARCH_MAX_K else None
+
+def invalid_limit():
+    return jsonify({"error": f"k must be an integer from 1 to {SEARCH_MAX_K}"}), 400
+
+@app.route('/candidates/search', methods=['GET', 'POST'])
+def search_candidates():
+    # Job title/description from the query string, form or JSON body
+    params = request.get_json(silent=True) or request.values
+    job_text = " ".join(filter(None, [params.get('job_title'), params.get('job_description')]))
+    if not job_text:
+        return jsonify({"error": "job_title or job_description is required"}), 400
+    k = search_limit(params)
+    if k is None:
+        return invalid_limit()
+
+    results = get_candidate_index().search(job_text, k=k)
+    return jsonify({"candidates": results, "count": len(results)})
+
+@app.route('/candidates/<candidate_id>', methods=['DELETE'])
+def remove_candidate(candidate_id):
+    if not get_candidate_index().remove(candidate_id):
+        return jsonify({"error": "Unknown candidate"}), 404
+    return jsonify({"removed": candidate_id})
+
+@app.route('/candidates/stats', methods=['GET'])
+def candidate_stats():
+    return jsonify(get_candidate_index().stats())
+
+@app.route('/semantic/resumes', methods=['POST'])
+def add_semantic_resumes():
+    # Embed one or more resumes for semantic matching; the id defaults to the PDF's SHA-256
+    files = request.files.getlist('resumes') or request.files.getlist('resume')
+    if not files:
+        return jsonify({"error": "No files uploaded"}), 400
+
+    index = get_semantic_index()
+    indexed = []
+    for file in files:
+        data = read_source(file.stream)
+        resume_id = (request.form.get('resume_id') if len(files) == 1 else None) or hashlib.sha256(data).hexdigest()
+        try:
+            text = cached_text(data, report_analyzer.extract_text_from_pdf)
+        except PdfExtractionError as e:
+            indexed.append({"id": resume_id, "name": file.filename, **e.to_dict()})
+            continue
+        indexed.append(index.add('resume', resume_id, text, request.form.get('name') or file.filename))
+    return jsonify({"indexed": indexed})
+
+@app.route('/semantic/jobs', methods=['POST'])
+def add_semantic_job():
+    params = request.get_json(silent=True) or request.values
+    job_text = "\n".join(filter(None, [params.get('job_title'), params.get('job_description')]))
+    if not job_text:
+        return jsonify({"error": "job_title or job_description is required"}), 400
+
+    job_id = params.get('job_id') or hashlib.sha256(job_text.encode('utf-8')).hexdigest()
+    return jsonify(get_semantic_index().add('job', job_id, job_text, params.get('job_title')))
 
-model = load_model("models/best_model.h5")
-emotion_labels = ['anger', 'neutral', 'fear', 'sad', 'disgust', 'happy', 'surprise']
+def semantic_search(kind, text=None, like=None, k=10):
+    try:
+        results = get_semantic_index().search(kind, text=text, like=like, k=k)
+    except SemanticModelUnavailable as e:
+        return jsonify({"error": str(e)}), 503
+    except KeyError:
+        return jsonify({"error": f"Unknown {like[0]}"}), 404
+    return jsonify({"results": results, "count": len(results)})
+
+@app.route('/semantic/resumes/search', methods=['GET', 'POST'])
+def semantic_resumes_for_job():
+    # Resumes closest to a job given as text or as an indexed job_id
+    params = request.get_json(silent=True) or request.values
+    k = search_limit(params)
+    if k is None:
+        return invalid_limit()
+    if params.get('job_id'):
+        return semantic_search('resume', like=('job', params['job_id']), k=k)
+    job_text = "\n".join(filter(None, [params.get('job_title'), params.get('job_description')]))
+    if not job_text:
+        return jsonify({"error": "job_id, job_title or job_description is required"}), 400
+    return semantic_search('resume', text=job_text, k=k)
+
+@app.route('/semantic/jobs/search', methods=['GET', 'POST'])
+def semantic_jobs_for_resume():
+    # Jobs closest to an uploaded resume or an indexed resume_id
+    params = request.get_json(silent=True) or request.values
+    k = search_limit(params)
+    if k is None:
+        return invalid_limit()
+    file = request.files.get('resume') or request.files.get('file')
+    if file is None:
+        if not params.get('resume_id'):
+            return jsonify({"error": "Upload a resume or pass resume_id"}), 400
+        return semantic_search('job', like=('resume', params['resume_id']), k=k)
+    try:
+        text = cached_text(read_source(file.stream), report_analyzer.extract_text_from_pdf)
+    except PdfExtractionError as e:
+        return analysis_response(e.to_dict())
+    return semantic_search('job', text=text, k=k)
+
+@app.route('/semantic/<kind>s/<doc_id>', methods=['DELETE'])
+def remove_semantic_document(kind, doc_id):
+    if kind not in ('resume', 'job') or not get_semantic_index().remove(kind, doc_id):
+        return jsonify({"error": f"Unknown {kind}"}), 404
+    return jsonify({"removed": doc_id})
+
+@app.route('/semantic/stats', methods=['GET'])
+def semantic_stats():
+    return jsonify(get_semantic_index().stats())
+
+
+# Models load on first use; PRELOAD_MODELS=emotion,role_classifier (or "all")
+# lets a worker pay for the ones it serves at boot instead.
+# EMOTION_BACKEND selects keras (default), onnx, onnx-int8, tflite or tflite-int8
+registry.warm_up(os.environ.get('PRELOAD_MODELS'))
+emotion_labels = EMOTION_LABELS
+
+# Concurrent /predict calls are coalesced into shared forward passes
+batcher = MicroBatcher(
+    lambda batch: registry.get('emotion').predict(batch),
+    max_batch_size=int(os.environ.get('EMOTION_MAX_BATCH_SIZE', 32)),
+    max_wait_ms=float(os.environ.get('EMOTION_MAX_WAIT_MS', 5)),
+)
 
 @app.route('/predict', methods=['POST'])
 def predict():
     if 'image' not in request.files:
         return jsonify({'error': 'No image uploaded'}), 400
 
-    image = Image.open(request.files['image']).convert('L')
-    image = image.resize((48, 48))
-    img_array = np.array(image) / 255.0
-    img_array = np.expand_dims(img_array, axis=-1)
-    img_array = np.expand_dims(img_array, axis=0)
+    try:
+        img_array = preprocess_image(request.files['image'])
+    except OSError:
+        return jsonify({'error': 'Could not decode image'}), 400
 
-    prediction = model.predict(img_array)
+    prediction = batcher.submit(img_array)
     emotion_idx = np.argmax(prediction)
     emotion = emotion_labels[emotion_idx]
 
     return jsonify({'emotion': emotion})
 
+@app.route('/predict-batch', methods=['POST'])
+def predict_batch():
+    files = request.files.getlist('images')
+    if not files:
+        return jsonify({'error': 'No images uploaded'}), 400
+
+    # Stack every upload into one (N, 48, 48, 1) tensor so the whole
+    # request costs a single forward pass
+    images = []
+    for f in files:
+        try:
+            images.append(preprocess_image(f))
+        except OSError:
+            # PIL's UnidentifiedImageError is an OSError
+            return jsonify({'error': f'Could not decode image {f.filename}'}), 400
+    batch = np.stack(images)
+    probabilities = registry.get('emotion').predict(batch)
+
+    predictions = []
+    emotion_count = {}
+    for f, probs in zip(files, probabilities):
+        emotion = emotion_labels[int(np.argmax(probs))]
+        emotion_count[emotion] = emotion_count.get(emotion, 0) + 1
+        predictions.append({
+            'filename': f.filename,
+            'emotion': emotion,
+            'probabilities': {label: float(p) for label, p in zip(emotion_labels, probs)}
+        })
+
+    # mostCommonEmotion/confidence come from the shared scorer, so clients
+    # no longer repeat the 1-5 mapping
+    score = score_probabilities(probabilities, emotion_labels, window_seconds=0)
+    return jsonify({
+        'predictions': predictions,
+        'emotionBreakdown': emotion_count,
+        'mostCommonEmotion': score['mostCommonEmotion'],
+        'confidence': score['confidence'],
+        'count': len(predictions)
+    })
+
+@app.route('/predict-faces', methods=['POST'])
+def predict_faces():
+    # Full webcam frames: faces are found server-side and every face in
+    # every uploaded frame is classified in one forward pass
+    files = request.files.getlist('images') or request.files.getlist('image')
+    if not files:
+        return jsonify({'error': 'No image uploaded'}), 400
+
+    try:
+        frames = [decode_gray(f.read()) for f in files]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    model = registry.get('emotion')
+    results = analyze_frames(frames, registry.get('face_detector'), model.predict, emotion_labels)
+    for f, result in zip(files, results):
+        result['filename'] = f.filename
+    return jsonify({'frames': results, 'faceCount': sum(len(r['faces']) for r in results)})
+
+@app.route('/score-emotions', methods=['POST'])
+def score_emotions_route():
+    # An emotion timeline -> confidence score. JSON body:
+    #   {"probabilities": [[...], null, ...], "timestamps": [...], "labels": [...],
+    #    "windowSeconds": 30, "stepSeconds": 10}
+    # null rows are frames without a face; timestamps default to EMOTION_TIMELINE_FPS.
+    # Long timelines can be uploaded as an .npy file 'probabilities' (NaN rows for no face).
+    if 'probabilities' in request.files:
+        options = request.form
+        try:
+            probabilities = np.load(io.BytesIO(request.files['probabilities'].read()), allow_pickle=False)
+            timestamps = request.files['timestamps'] if 'timestamps' in request.files else None
+            if timestamps is not None:
+                timestamps = np.load(io.BytesIO(timestamps.read()), allow_pickle=False)
+        except (OSError, ValueError) as e:
+            return jsonify({'error': f'Invalid .npy file: {e}'}), 400
+    else:
+        options = request.get_json(silent=True) or {}
+        if 'probabilities' not in options:
+            return jsonify({'error': 'No probabilities provided'}), 400
+        probabilities = options['probabilities']
+        timestamps = options.get('timestamps')
+
+    labels = options.get('labels') or emotion_labels
+    if isinstance(labels, str):
+        labels = labels.split(',')
+    if not isinstance(labels, (list, tuple)) or not all(isinstance(label, str) for label in labels):
+        return jsonify({'error': 'labels must be a list of strings'}), 400
+    try:
+        # null rows (no face) -> NaN
+        probabilities = np.array([[np.nan] * len(labels) if row is None else row for row in probabilities]
+                                 if isinstance(probabilities, list) else probabilities, dtype=np.float64)
+        if probabilities.size and (probabilities.ndim != 2 or probabilities.shape[1] != len(labels)):
+            raise ValueError(f'probabilities must have one column per label ({len(labels)})')
+        if timestamps is not None and len(timestamps) != len(probabilities):
+            raise ValueError('timestamps must have one entry per row of probabilities')
+        window_seconds = float(options.get('windowSeconds', EMOTION_WINDOW_SECONDS))
+        step_seconds = float(options.get('stepSeconds', EMOTION_WINDOW_STEP_SECONDS))
+        for key in ('windowSeconds', 'stepSeconds'):
+            if key in options and not 0 < float(options[key]) < float('inf'):
+                raise ValueError(f'{key} must be a positive number of seconds')
+        # Also rejects timelines that would produce too many windows
+        result = score_probabilities(probabilities, list(labels), timestamps=timestamps,
+                                     window_seconds=window_seconds, step_seconds=step_seconds)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(result)
+
+@app.route('/analyze-video', methods=['POST'])
+def analyze_video():
+    # A recorded interview: sampled frames are decoded, face-cropped and
+    # classified in batches; returns the emotion timeline and confidence score
+    if 'video' not in request.files:
+        return jsonify({'error': 'No video uploaded'}), 400
+    try:
+        sample_fps = float(request.form.get('sample_fps', VIDEO_SAMPLE_FPS))
+    except ValueError:
+        return jsonify({'error': 'sample_fps must be a number'}), 400
+    if not (math.isfinite(sample_fps) and sample_fps > 0):
+        return jsonify({'error': 'sample_fps must be a positive number'}), 400
+
+    upload = request.files['video']
+    # OpenCV reads videos from a path, not a stream
+    suffix = os.path.splitext(upload.filename or '')[1] or '.mp4'
+    with tempfile.NamedTemporaryFile(suffix=suffix) as f:
+        upload.save(f)
+        f.flush()
+        try:
+            result = score_video(f.name, registry.get('emotion').predict, emotion_labels,
+                                 sample_fps=sample_fps, detector=registry.get('face_detector'))
+        except VideoError as e:
+            return jsonify({'error': str(e)}), 400
+    result['fileName'] = upload.filename
+    return jsonify(result)
+
+@app.route('/predict/stats', methods=['GET'])
+def predict_stats():
+    return jsonify(batcher.stats())
+
 if __name__ == '__main__':
+    import sys
+    if '--profile-startup' in sys.argv:
+        import subprocess
+        # Profile in a fresh interpreter so nothing is imported yet
+        sys.exit(subprocess.call([sys.executable, 'model_registry.py', '--profile-startup']))
     app.run(debug=True, port=5000)
@@ -0,0 +1,208 @@
+# ASGI serving mode. Run from Server/FLASK:
+#   pip install starlette uvicorn python-multipart websockets
+#   uvicorn asgi:app --port 5000
+#
+# Exposes the same /analyze, /analyze-resume and /predict endpoints as app.py
+# (plus the /ws/emotions WebSocket for live interview frames), but the event
+# loop only parses requests: resume analysis and emotion
+# inference run in bounded thread pools (pdfplumber itself already runs in
+# AnalyzeResume.pdf_extraction's worker processes). When a pool's queue is
+# full the request is rejected with 429 and Retry-After.
+import asyncio
+import contextlib
+import io
+import json
+import os
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocketDisconnect
+
+from AnalyzeResume import resume_analyzer as report_analyzer
+from ConfidenceAnalyzer.inference import preprocess_image
+from ConfidenceAnalyzer.streaming import EmotionStream
+from app import batcher, emotion_labels
+from concurrency import BoundedExecutor, Overloaded
+from model_registry import registry
+from resume_analyzer import analyzer as role_analyzer
+from result_cache import cached_analysis, get_cache
+
+# Text extraction happens in pdf_extraction's processes, so threads only
+# wait on it and run the (comparatively cheap) scoring
+pdf_pool = BoundedExecutor(
+    'pdf',
+    max_workers=int(os.environ.get('ASGI_PDF_WORKERS', os.cpu_count() or 2)),
+    max_queue=int(os.environ.get('ASGI_PDF_QUEUE', 16)),
+    retry_after=int(os.environ.get('ASGI_PDF_RETRY_AFTER', 5)),
+)
+# Inference releases the GIL and is coalesced by the micro-batcher, so threads suffice
+inference_pool = BoundedExecutor(
+    'inference',
+    max_workers=int(os.environ.get('ASGI_INFERENCE_WORKERS', 32)),
+    max_queue=int(os.environ.get('ASGI_INFERENCE_QUEUE', 256)),
+    retry_after=int(os.environ.get('ASGI_INFERENCE_RETRY_AFTER', 1)),
+)
+
+
+def _analyze_bytes(data):
+    return cached_analysis(data, 'analyze', role_analyzer.ANALYZER_VERSION,
+                           role_analyzer.extract_text_from_pdf, role_analyzer.analyze_resume_text)
+
+
+def _analyze_resume_bytes(data, job_title=None, job_description=None):
+    return cached_analysis(
+        data, 'analyze-resume', report_analyzer.ANALYZER_VERSION,
+        report_analyzer.extract_text_from_pdf,
+        lambda text: report_analyzer.analyze_resume_text(text, None, job_title, job_description),
+        params={'jobTitle': job_title, 'jobDescription': job_description}
+    )
+
+
+def _predict_bytes(data):
+    prediction = batcher.submit(preprocess_image(io.BytesIO(data)))
+    return emotion_labels[int(np.argmax(prediction))]
+
+
+def analysis_response(result):
+    # No free PDF worker: retryable 503, as app.analysis_response
+    if result.get('errorCode') == 'busy':
+        return JSONResponse(result, status_code=503, headers={'Retry-After': '1'})
+    return JSONResponse(result)
+
+
+async def offload(pool, fn, *args):
+    return await asyncio.wrap_future(pool.submit(fn, *args))
+
+
+async def read_upload(request, *fields):
+    form = await request.form()
+    for field in fields:
+        upload = form.get(field)
+        if upload is not None and hasattr(upload, 'read'):
+            return await upload.read()
+    return None
+
+
+async def analyze(request):
+    data = await read_upload(request, 'file')
+    if data is None:
+        return JSONResponse({'error': 'No file uploaded'}, status_code=400)
+    return analysis_response(await offload(pdf_pool, _analyze_bytes, data))
+
+
+async def analyze_resume_route(request):
+    data = await read_upload(request, 'resume', 'file')
+    if data is None:
+        return JSONResponse({"error": "No file uploaded"}, status_code=400)
+    form = await request.form()
+    return analysis_response(await offload(pdf_pool, _analyze_resume_bytes, data,
+                                           form.get('job_title'), form.get('job_description')))
+
+
+async def predict(request):
+    data = await read_upload(request, 'image')
+    if data is None:
+        return JSONResponse({'error': 'No image uploaded'}, status_code=400)
+    try:
+        emotion = await offload(inference_pool, _predict_bytes, data)
+    except OSError:
+        return JSONResponse({'error': 'Could not decode image'}, status_code=400)
+    return JSONResponse({'emotion': emotion})
+
+
+async def _receive_frames(websocket, stream):
+    # Always drain the socket; the stream drops stale frames itself.
+    # Returns True when the client asked to end, False if it disconnected.
+    try:
+        while True:
+            message = await websocket.receive()
+            if message['type'] == 'websocket.disconnect':
+                stream.close(discard=True)
+                return False
+            if message.get('bytes') is not None:
+                stream.push(message['bytes'])
+                continue
+            try:
+                options = json.loads(message.get('text') or '{}')
+                if options.get('type') == 'end':
+                    return True
+                await websocket.send_json({'type': 'config', **stream.configure(options)})
+            except (AttributeError, TypeError, ValueError) as e:
+                await websocket.send_json({'type': 'error', 'error': str(e)})
+    finally:
+        stream.close()
+
+
+async def emotion_stream(websocket):
+    # ws://host:5000/ws/emotions?format=jpeg|gray&mode=faces|face&width=..&height=..
+    # Binary messages are frames; each gets an 'emotion' event (or an 'error'
+    # event) with its sequence number. Text messages are JSON: new options,
+    # or {"type": "end"} to finish the buffered frames and get a 'summary'.
+    await websocket.accept()
+    stream = EmotionStream(registry.get('face_detector'), batcher.submit_many, emotion_labels)
+    try:
+        config = stream.configure(dict(websocket.query_params))
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    await websocket.send_json({'type': 'ready', **config})
+
+    receiver = asyncio.create_task(_receive_frames(websocket, stream))
+    try:
+        while (batch := await stream.next_batch()) is not None:
+            try:
+                events = await offload(inference_pool, stream.analyze, batch)
+            except Overloaded:
+                stream.drop(batch)
+                continue
+            except Exception as e:
+                # e.g. the pool shut down under us; report these frames and keep going
+                events = stream.fail(batch, e)
+            for event in events:
+                await websocket.send_json(event)
+        if await receiver:
+            await websocket.send_json({'type': 'summary', **stream.summary()})
+            await websocket.close()
+    except WebSocketDisconnect:
+        # The client went away mid-send
+        pass
+    finally:
+        receiver.cancel()
+
+
+async def stats(request):
+    return JSONResponse({
+        'pdfPool': pdf_pool.stats(),
+        'inferencePool': inference_pool.stats(),
+        'batcher': batcher.stats(),
+        'resultCache': get_cache().stats(),
+    })
+
+
+async def overloaded(request, exc):
+    return JSONResponse({'error': str(exc)}, status_code=429, headers={'Retry-After': str(exc.retry_after)})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    pdf_pool.shutdown(wait=False)
+    inference_pool.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=[
+        Route('/analyze', analyze, methods=['POST']),
+        Route('/analyze-resume', analyze_resume_route, methods=['POST']),
+        Route('/predict', predict, methods=['POST']),
+        Route('/stats', stats, methods=['GET']),
+        WebSocketRoute('/ws/emotions', emotion_stream),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    exception_handlers={Overloaded: overloaded},
+    lifespan=lifespan,
+)
@@ -0,0 +1,83 @@
+# Run from Server/FLASK: python -m benchmarks.backend_benchmark
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from ConfidenceAnalyzer.inference import BACKEND_MODEL_PATHS
+from model_registry import current_rss_mb
+
+
+def run_child(backend, iterations, batch_size):
+    """Measure one backend inside a fresh interpreter so imports count toward cold start"""
+    started = time.perf_counter()
+    import numpy as np
+    from ConfidenceAnalyzer.inference import INPUT_SHAPE, load_emotion_model
+
+    model = load_emotion_model(backend)
+    model.predict(np.zeros(INPUT_SHAPE, dtype=np.float32))
+    cold_start = time.perf_counter() - started
+
+    single = np.random.rand(1, *INPUT_SHAPE).astype(np.float32)
+    latencies = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        model.predict(single)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+
+    batch = np.random.rand(batch_size, *INPUT_SHAPE).astype(np.float32)
+    t0 = time.perf_counter()
+    rounds = max(1, iterations // 10)
+    for _ in range(rounds):
+        model.predict(batch)
+    throughput = rounds * batch_size / (time.perf_counter() - t0)
+
+    print(json.dumps({
+        'backend': backend,
+        'coldStartS': round(cold_start, 3),
+        'rssMb': round(current_rss_mb(), 1),
+        'p50Ms': round(latencies[len(latencies) // 2], 3),
+        'p99Ms': round(latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))], 3),
+        'facesPerSec': round(throughput, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare latency, throughput, RSS and cold start per backend')
+    parser.add_argument('--backends', nargs='+', default=list(BACKEND_MODEL_PATHS), help='Backends to benchmark')
+    parser.add_argument('--iterations', '-n', type=int, default=300, help='Timed single-face calls per backend')
+    parser.add_argument('--batch-size', type=int, default=32, help='Batch size for the throughput test')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.iterations, args.batch_size)
+        return 0
+
+    print(f"{'backend':<12} {'cold start':>11} {'RSS':>9} {'p50':>9} {'p99':>9} {'faces/s':>10}")
+    for backend in args.backends:
+        if not os.path.exists(BACKEND_MODEL_PATHS[backend]):
+            print(f"{backend:<12} missing {BACKEND_MODEL_PATHS[backend]} (run ConfidenceAnalyzer.export)")
+            continue
+
+        proc = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.backend_benchmark', '--child', backend,
+             '--iterations', str(args.iterations), '--batch-size', str(args.batch_size)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{backend:<12} failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr else proc.returncode}")
+            continue
+
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{backend:<12} {r['coldStartS']:>9.2f} s {r['rssMb']:>6.0f} MB {r['p50Ms']:>6.2f} ms "
+              f"{r['p99Ms']:>6.2f} ms {r['facesPerSec']:>10.0f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
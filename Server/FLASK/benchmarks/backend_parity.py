@@ -0,0 +1,53 @@
+# Run from Server/FLASK: python -m benchmarks.backend_parity --faces-dir faces/
+import argparse
+import sys
+
+import numpy as np
+
+from ConfidenceAnalyzer.export import load_calibration_faces
+from ConfidenceAnalyzer.inference import BACKEND_MODEL_PATHS, load_emotion_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check exported backends agree with the Keras .h5 model')
+    parser.add_argument('--faces-dir', help='Directory of face images to compare on (random faces if omitted)')
+    parser.add_argument('--limit', type=int, default=500, help='Max faces to compare')
+    parser.add_argument('--backends', nargs='+', default=[b for b in BACKEND_MODEL_PATHS if b != 'keras'],
+                        help='Backends to compare against keras')
+    parser.add_argument('--min-agreement', type=float, default=0.98,
+                        help='Minimum label agreement for float backends')
+    parser.add_argument('--min-agreement-int8', type=float, default=0.90,
+                        help='Minimum label agreement for int8 backends')
+    args = parser.parse_args()
+
+    faces = load_calibration_faces(args.faces_dir, args.limit)
+    reference = load_emotion_model('keras').predict(faces)
+    expected = np.argmax(reference, axis=-1)
+
+    failed = False
+    compared = 0
+    for backend in args.backends:
+        try:
+            probabilities = load_emotion_model(backend).predict(faces)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"{backend:<12} SKIPPED ({e})")
+            continue
+
+        compared += 1
+        agreement = float(np.mean(np.argmax(probabilities, axis=-1) == expected))
+        max_diff = float(np.max(np.abs(probabilities - reference)))
+        threshold = args.min_agreement_int8 if backend.endswith('int8') else args.min_agreement
+        ok = agreement >= threshold
+        failed |= not ok
+        print(f"{backend:<12} {'PASS' if ok else 'FAIL'}  agreement {agreement * 100:6.2f}% "
+              f"(min {threshold * 100:.0f}%)  max |dp| {max_diff:.4f}")
+
+    if not compared:
+        # Keras plus at least one exported backend must actually run
+        print("FAIL  no backend could be compared against keras")
+        return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
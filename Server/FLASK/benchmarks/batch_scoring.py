@@ -0,0 +1,114 @@
+# Run from Server/FLASK: python -m benchmarks.batch_scoring --resumes 1000 --pdfs
+import argparse
+import random
+import sys
+import time
+
+from AnalyzeResume import resume_analyzer
+from AnalyzeResume.batch_scoring import analyze_resumes_batch, score_texts
+
+JOB_TITLE = "Backend Developer"
+JOB_DESCRIPTION = "Python services on AWS with Docker, Kubernetes, PostgreSQL and Redis"
+
+
+def synthetic_resume(rng, index):
+    skills = rng.sample(sorted(resume_analyzer.SKILL_TO_ROLE), rng.randint(5, 25))
+    roles = "\n".join(
+        f"Engineer, Company {rng.randint(1, 99)} {rng.randint(2005, 2015)} - {rng.randint(2016, 2024)}\n"
+        f"- Developed services with {', '.join(rng.sample(skills, min(3, len(skills))))}; improved latency by {rng.randint(5, 60)}%"
+        for _ in range(rng.randint(1, 5))
+    )
+    return (f"Candidate {index}\ncandidate{index}@example.com +1 555-000-{index % 10000:04d}\n"
+            f"Summary\nEngineer with {rng.randint(1, 15)} years of experience.\n"
+            f"Experience\n{roles}\nSkills\n{', '.join(skills)}\n"
+            f"Education\nB.Tech Computer Science, State University 2010 - 2014\n")
+
+
+def make_pdf(text):
+    """Minimal one-page PDF with the text drawn line by line (Helvetica)"""
+    lines = [line.replace("\\", "").replace("(", "").replace(")", "") for line in text.split("\n")]
+    content = "BT /F1 10 Tf 12 TL 40 760 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out, offsets = "%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n" + "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def parity_mismatches(texts, job_description):
+    """Resumes whose batch scores differ from the single-resume report, for every known role"""
+    mismatches = []
+    for job_title in resume_analyzer.CRITICAL_SKILLS:
+        for index, text in enumerate(texts):
+            report = resume_analyzer.build_full_report(text, None, job_title, job_description)
+            single = (report["jobMatchScore"], report["atsCompatibility"]["breakdown"]["keywordOptimization"])
+            ranked = score_texts([text], None, job_title, job_description)[0]
+            batch = (ranked["jobMatchScore"], ranked["keywordScore"])
+            if single != batch:
+                mismatches.append((job_title, index, single, batch))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch resume ranking vs one report per resume')
+    parser.add_argument('--resumes', type=int, default=1000, help='Synthetic resumes in the batch')
+    parser.add_argument('--sequential-sample', type=int, default=100,
+                        help='Resumes actually run through the per-resume path (time is extrapolated)')
+    parser.add_argument('--pdfs', action='store_true', help='Also time end to end from PDF bytes')
+    parser.add_argument('--parity-sample', type=int, default=50,
+                        help='Resumes checked against the single-resume report (jobMatchScore, keywordScore)')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [synthetic_resume(rng, i) for i in range(args.resumes)]
+    sample = texts[:args.sequential_sample]
+
+    started = time.perf_counter()
+    for text in sample:
+        resume_analyzer.build_full_report(text, None, JOB_TITLE, JOB_DESCRIPTION)
+    sequential = (time.perf_counter() - started) * len(texts) / len(sample)
+
+    started = time.perf_counter()
+    ranked = score_texts(texts, None, JOB_TITLE, JOB_DESCRIPTION)
+    batch = time.perf_counter() - started
+
+    print(f"{len(texts)} resumes, text already extracted")
+    print(f"  per-resume reports: {sequential:8.2f}s (extrapolated from {len(sample)})")
+    print(f"  batch scoring:      {batch:8.2f}s  ({sequential / batch:.0f}x)")
+    print(f"  top candidate: {ranked[0]['fileName']} (job match {ranked[0]['jobMatchScore']})")
+
+    mismatches = parity_mismatches(texts[:args.parity_sample], JOB_DESCRIPTION)
+    checked = min(args.parity_sample, len(texts)) * len(resume_analyzer.CRITICAL_SKILLS)
+    print(f"  parity with single reports: {checked - len(mismatches)}/{checked} match")
+    for job_title, index, single, batch in mismatches[:10]:
+        print(f"    FAIL resume-{index + 1} as {job_title}: single (job, keyword) {single}, batch {batch}")
+
+    if args.pdfs:
+        pdfs = [make_pdf(text) for text in texts]
+        started = time.perf_counter()
+        for data in pdfs[:len(sample)]:
+            resume_analyzer.analyze_resume1(data, JOB_TITLE, JOB_DESCRIPTION)
+        sequential = (time.perf_counter() - started) * len(pdfs) / len(sample)
+
+        started = time.perf_counter()
+        result = analyze_resumes_batch(pdfs, JOB_TITLE, JOB_DESCRIPTION)
+        batch = time.perf_counter() - started
+        print(f"\n{len(pdfs)} resumes from PDF bytes")
+        print(f"  analyze_resume1 loop:  {sequential:8.2f}s (extrapolated from {len(sample)})")
+        print(f"  analyze_resumes_batch: {batch:8.2f}s  ({sequential / batch:.0f}x, {result['scored']} scored)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# Run from Server/FLASK: python -m benchmarks.camera_pipeline --video interview.mp4 --workers 1 2 4
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from ConfidenceAnalyzer.camera import CameraPipeline, emotion_labels
+from ConfidenceAnalyzer.inference import load_emotion_model, preprocess_face
+
+
+def sequential(video, model, max_frames=None):
+    """The previous camera.py loop: full-resolution detection and one predict() per face"""
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+    capture = cv2.VideoCapture(video)
+    frames, started = 0, time.perf_counter()
+    while max_frames is None or frames < max_frames:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        for (x, y, w, h) in face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5):
+            face = preprocess_face(cv2.resize(gray[y:y + h, x:x + w], (48, 48)))
+            np.argmax(model.predict(face))
+        frames += 1
+    capture.release()
+    return frames / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='camera.py throughput: sequential loop vs staged pipeline')
+    parser.add_argument('--video', required=True, help='Recorded video to replay headless')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--pace', action='store_true', help='Replay at the recorded frame rate (live-camera load)')
+    parser.add_argument('--backend', help='Emotion runtime backend (default: EMOTION_BACKEND or keras)')
+    args = parser.parse_args()
+
+    model = load_emotion_model(args.backend, labels=emotion_labels)
+    print(f"sequential loop: {sequential(args.video, model, args.max_frames):.1f} fps (every frame processed)\n")
+
+    print(f"{'workers':>7} {'capture fps':>12} {'inference fps':>14} {'dropped':>8} {'e2e p50 ms':>11} {'e2e p99 ms':>11}")
+    for workers in args.workers:
+        summary = CameraPipeline(args.video, model.predict, emotion_labels, workers=workers, pace=args.pace,
+                                 display=False, max_frames=args.max_frames).run()
+        e2e = summary['endToEnd']
+        print(f"{workers:>7} {summary['capture']['fps']:>12} {summary['inference']['fps']:>14} "
+              f"{summary['capture']['dropped']:>8} {e2e.get('p50LatencyMs', '-'):>11} {e2e.get('p99LatencyMs', '-'):>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
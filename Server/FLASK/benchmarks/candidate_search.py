@@ -0,0 +1,74 @@
+# Run from Server/FLASK: python -m benchmarks.candidate_search --candidates 20000
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from AnalyzeResume.batch_scoring import score_texts
+from AnalyzeResume.candidate_index import CandidateIndex
+from benchmarks.batch_scoring import synthetic_resume
+
+JOBS = [
+    ("Backend Developer", "Python services on AWS with Docker, Kubernetes, PostgreSQL and Redis"),
+    ("Data Scientist", "Machine learning with pandas, numpy, scikit-learn and TensorFlow; SQL"),
+    ("Frontend Developer", "React and TypeScript single page apps, HTML, CSS, GraphQL"),
+    ("DevOps Engineer", "Terraform, Jenkins CI/CD, Prometheus and Grafana on GCP or Azure"),
+]
+
+
+def percentile_ms(samples, q):
+    return np.percentile(samples, q) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Candidate index: indexing rate and top-K job search latency')
+    parser.add_argument('--candidates', type=int, default=20000, help='Synthetic resumes to index')
+    parser.add_argument('--queries', type=int, default=200, help='Search queries to time')
+    parser.add_argument('--k', type=int, default=10, help='Candidates returned per query')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [synthetic_resume(rng, i) for i in range(args.candidates)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'candidates.sqlite3')
+        index = CandidateIndex(db_path)
+        started = time.perf_counter()
+        for i, text in enumerate(texts):
+            index.add(f"candidate-{i}", text, f"Candidate {i}")
+        elapsed = time.perf_counter() - started
+        print(f"indexed {args.candidates} resumes in {elapsed:.1f}s ({args.candidates / elapsed:.0f}/s, incremental adds)")
+
+        started = time.perf_counter()
+        reopened = CandidateIndex(db_path)
+        print(f"reopened from disk: {len(reopened)} candidates in {time.perf_counter() - started:.2f}s")
+
+        job_texts = [f"{title} {description}" for title, description in JOBS]
+        reopened.search(job_texts[0], args.k)  # first query computes document norms
+        latencies = []
+        for i in range(args.queries):
+            started = time.perf_counter()
+            reopened.search(job_texts[i % len(job_texts)], args.k)
+            latencies.append(time.perf_counter() - started)
+        print(f"index search top-{args.k}: p50 {percentile_ms(latencies, 50):.2f} ms, "
+              f"p99 {percentile_ms(latencies, 99):.2f} ms")
+
+        started = time.perf_counter()
+        index.add("candidate-new", texts[0], "New candidate")
+        reopened.search(job_texts[0], args.k)
+        print(f"search right after an update from another connection: {(time.perf_counter() - started) * 1000:.0f} ms (replayed from the change log)")
+
+    # The alternative: rescore every stored resume text for each job
+    title, description = JOBS[0]
+    started = time.perf_counter()
+    score_texts(texts, None, title, description)
+    print(f"rescoring all {args.candidates} texts for one job (batch scoring): {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
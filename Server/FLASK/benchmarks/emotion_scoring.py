@@ -0,0 +1,83 @@
+# Run from Server/FLASK: python -m benchmarks.emotion_scoring --minutes 60 --fps 30
+import argparse
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from ConfidenceAnalyzer.inference import EMOTION_LABELS
+from ConfidenceAnalyzer.result import CONFIDENCE_BY_EMOTION, score_probabilities
+
+
+def synthetic_timeline(frames, fps, no_face=0.1, seed=0):
+    """Dirichlet probabilities with a slowly drifting favourite emotion and some faceless frames"""
+    rng = np.random.default_rng(seed)
+    k = len(EMOTION_LABELS)
+    favourite = (np.arange(frames) // int(fps * 45)) % k
+    alpha = np.ones((frames, k))
+    alpha[np.arange(frames), favourite] = 4
+    probabilities = rng.gamma(alpha)
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    probabilities[rng.random(frames) < no_face] = np.nan
+    return probabilities, np.arange(frames) / fps
+
+
+def per_frame_loop(probabilities, timestamps, window_seconds, step_seconds):
+    """Reference: the same statistics with a Python loop over frames (and over frames per window)"""
+    labels = []
+    total = np.zeros(probabilities.shape[1])
+    seconds = 0.0
+    for i, probs in enumerate(probabilities):
+        if np.isnan(probs).any():
+            continue
+        duration = timestamps[i + 1] - timestamps[i] if i + 1 < len(timestamps) else timestamps[1] - timestamps[0]
+        labels.append(EMOTION_LABELS[int(np.argmax(probs))])
+        total += probs * duration
+        seconds += duration
+    most_common = Counter(labels).most_common(1)[0][0]
+    windows = []
+    start = timestamps[0]
+    while start <= timestamps[-1]:
+        in_window = [EMOTION_LABELS[int(np.argmax(p))] for t, p in zip(timestamps, probabilities)
+                     if start <= t < start + window_seconds and not np.isnan(p).any()]
+        windows.append(Counter(in_window).most_common(1)[0][0] if in_window else None)
+        if start + window_seconds >= timestamps[-1]:
+            break
+        start += step_seconds
+    return most_common, CONFIDENCE_BY_EMOTION.get(most_common, 1), total / seconds, windows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized emotion scoring vs a per-frame Python loop')
+    parser.add_argument('--minutes', type=float, nargs='+', default=[1, 10, 60])
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--window', type=float, default=30)
+    parser.add_argument('--step', type=float, default=10)
+    parser.add_argument('--loop-max-minutes', type=float, default=10,
+                        help='Skip the (slow) loop reference for longer timelines')
+    args = parser.parse_args()
+
+    print(f"{'minutes':>7} {'frames':>8} {'vectorized ms':>14} {'loop ms':>10} {'speedup':>8} {'agrees':>7}")
+    for minutes in args.minutes:
+        frames = int(minutes * 60 * args.fps)
+        probabilities, timestamps = synthetic_timeline(frames, args.fps)
+        started = time.perf_counter()
+        score = score_probabilities(probabilities, EMOTION_LABELS, timestamps, window_seconds=args.window,
+                                    step_seconds=args.step)
+        vectorized = (time.perf_counter() - started) * 1000
+        if minutes > args.loop_max_minutes:
+            print(f"{minutes:>7} {frames:>8} {vectorized:>14.1f} {'-':>10} {'-':>8} {'-':>7}")
+            continue
+        started = time.perf_counter()
+        most_common, confidence, average, windows = per_frame_loop(probabilities, timestamps, args.window, args.step)
+        loop = (time.perf_counter() - started) * 1000
+        agrees = (most_common == score['mostCommonEmotion'] and confidence == score['confidence']
+                  and np.allclose(average, list(score['averageProbabilities'].values()), atol=1e-4)
+                  and windows == score['windows']['emotion'])
+        print(f"{minutes:>7} {frames:>8} {vectorized:>14.1f} {loop:>10.1f} {loop / vectorized:>7.0f}x {str(agrees):>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
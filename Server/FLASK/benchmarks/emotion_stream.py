@@ -0,0 +1,98 @@
+# Run from Server/FLASK: python -m benchmarks.emotion_stream --video interview.mp4 --fps 10 30
+# In-process (no server needed): the /ws/emotions stream against the screenshot
+# path it replaces (JPEG written to disk, read back, one HTTP POST per frame).
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import cv2
+import numpy as np
+from starlette.testclient import TestClient
+
+import asgi
+from app import app as flask_app
+
+
+def read_jpegs(path, max_frames, quality=80):
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])[1].tobytes())
+    capture.release()
+    return frames
+
+
+def per_frame_http(jpegs, fps):
+    """Disk hop + one /predict-faces request per frame, sent as fast as answered (at most fps)"""
+    client = flask_app.test_client()
+    latencies, started = [], time.perf_counter()
+    with tempfile.TemporaryDirectory() as directory:
+        for i, jpeg in enumerate(jpegs):
+            time.sleep(max(0.0, started + i / fps - time.perf_counter()))
+            sent = time.perf_counter()
+            path = os.path.join(directory, f'{i}.jpg')
+            with open(path, 'wb') as f:
+                f.write(jpeg)
+            with open(path, 'rb') as f:
+                client.post('/predict-faces', data={'image': (f, f'{i}.jpg')})
+            os.remove(path)
+            latencies.append(time.perf_counter() - sent)
+    return len(jpegs) / (time.perf_counter() - started), np.array(latencies) * 1000, 0
+
+
+def websocket_stream(client, jpegs, fps):
+    """Frames paced at fps over /ws/emotions; results are read concurrently"""
+    sent_at = {}
+    latencies, summary = [], {}
+    with client.websocket_connect('/ws/emotions') as ws:
+        ws.receive_json()
+
+        def receive():
+            while True:
+                event = ws.receive_json()
+                if event['type'] == 'emotion':
+                    latencies.append(time.perf_counter() - sent_at[event['seq']])
+                elif event['type'] == 'summary':
+                    summary.update(event)
+                    return
+
+        receiver = threading.Thread(target=receive)
+        receiver.start()
+        started = time.perf_counter()
+        for i, jpeg in enumerate(jpegs):
+            time.sleep(max(0.0, started + i / fps - time.perf_counter()))
+            sent_at[i] = time.perf_counter()
+            ws.send_bytes(jpeg)
+        ws.send_text('{"type": "end"}')
+        receiver.join()
+    return summary['analyzed'] / (time.perf_counter() - started), np.array(latencies) * 1000, summary['dropped']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Live frames: WebSocket stream vs per-frame disk + HTTP')
+    parser.add_argument('--video', required=True, help='Recorded interview video used as the webcam feed')
+    parser.add_argument('--fps', type=float, nargs='+', default=[5, 15, 30], help='Client send rates')
+    parser.add_argument('--frames', type=int, default=150)
+    args = parser.parse_args()
+
+    jpegs = read_jpegs(args.video, args.frames)
+    print(f"{len(jpegs)} frames, {np.mean([len(j) for j in jpegs]) / 1024:.0f} KiB JPEG each\n")
+    print(f"{'send fps':>8} {'mode':<12} {'results/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'dropped':>8}")
+    # One client for every run: leaving it shuts the ASGI app's pools down
+    with TestClient(asgi.app) as client:
+        for fps in args.fps:
+            for name, run in (('http+disk', per_frame_http), ('websocket', lambda *a: websocket_stream(client, *a))):
+                rate, latencies, dropped = run(jpegs, fps)
+                print(f"{fps:>8} {name:<12} {rate:>10.1f} {np.percentile(latencies, 50):>8.1f} "
+                      f"{np.percentile(latencies, 99):>8.1f} {dropped:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+# Run from Server/FLASK: python -m benchmarks.face_detection --image face.jpg
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from ConfidenceAnalyzer.face_pipeline import FaceDetector, crop_faces
+
+
+def frame_of_size(image, width, height):
+    """The image scaled to the frame height and centred on a grey canvas, like a webcam frame"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    side = height
+    canvas = np.full((height, width), 128, dtype=np.uint8)
+    left = max(0, (width - side) // 2)
+    canvas[:, left:left + side] = cv2.resize(gray, (side, side))[:, :width - left]
+    return canvas
+
+
+def time_ms(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Face detection cost: full-resolution vs downscaled-first')
+    parser.add_argument('--image', required=True, help='Photo containing a face')
+    parser.add_argument('--sizes', nargs='+', default=['640x480', '1280x720', '1920x1080'])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    image = cv2.imread(args.image)
+    if image is None:
+        parser.error(f"could not read {args.image}")
+
+    # Full resolution with the old camera.py settings (no minimum size) vs the pipeline default
+    full = FaceDetector(max_side=100000, min_size=0)
+    downscaled = FaceDetector()
+    print(f"{'frame':<11} {'full ms':>8} {'faces':>6} {'downscaled ms':>14} {'faces':>6} {'crop ms':>8}")
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split('x'))
+        gray = frame_of_size(image, width, height)
+        full_ms, full_boxes = time_ms(lambda: full.detect(gray), args.repeat)
+        fast_ms, boxes = time_ms(lambda: downscaled.detect(gray), args.repeat)
+        crop_ms, _ = time_ms(lambda: crop_faces(gray, boxes), args.repeat)
+        print(f"{size:<11} {full_ms:>8.1f} {len(full_boxes):>6} {fast_ms:>14.1f} {len(boxes):>6} {crop_ms:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
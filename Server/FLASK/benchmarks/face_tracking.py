@@ -0,0 +1,104 @@
+# Run from Server/FLASK: python -m benchmarks.face_tracking --videos interview1.mp4 interview2.mp4
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from ConfidenceAnalyzer.camera import emotion_labels
+from ConfidenceAnalyzer.face_pipeline import FaceDetector, crop_faces
+from ConfidenceAnalyzer.inference import load_emotion_model
+from ConfidenceAnalyzer.tracking import FaceTracker, iou
+
+
+def read_gray_frames(path, max_frames):
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    capture.release()
+    return frames
+
+
+def largest(boxes, labels):
+    """(box, label) of the largest face, or (None, None)"""
+    if not len(boxes):
+        return None, None
+    i = int(np.argmax([w * h for _, _, w, h in boxes]))
+    return tuple(boxes[i]), labels[i]
+
+
+def run_every_frame(frames, detector, predict):
+    """Reference: detect and classify every face on every frame"""
+    results = []
+    for gray in frames:
+        boxes = detector.detect(gray)
+        labels = [int(i) for i in np.argmax(predict(crop_faces(gray, boxes)), axis=-1)] if len(boxes) else []
+        results.append(largest(boxes, labels))
+    return results
+
+
+def run_tracking(frames, tracker):
+    results = []
+    for gray in frames:
+        tracks = tracker.update(gray)
+        results.append(largest(tracker.boxes(), [int(np.argmax(t.probabilities)) for t in tracks]))
+    return results
+
+
+def timed(fn):
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = fn()
+    return result, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def agreement(reference, results):
+    """Face presence agreement, mean IoU and label agreement against the every-frame reference"""
+    presence = np.mean([(a[0] is None) == (b[0] is None) for a, b in zip(reference, results)])
+    both = [(a, b) for a, b in zip(reference, results) if a[0] is not None and b[0] is not None]
+    mean_iou = np.mean([iou(a[0], b[0]) for a, b in both]) if both else 0.0
+    labels = np.mean([a[1] == b[1] for a, b in both]) if both else 0.0
+    return presence, mean_iou, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tracking mode vs detect+classify on every frame')
+    parser.add_argument('--videos', nargs='+', required=True, help='Recorded interview videos')
+    parser.add_argument('--max-frames', type=int, default=900)
+    parser.add_argument('--detect-every', type=int, nargs='+', default=[5, 10, 30])
+    parser.add_argument('--classify-every', type=int, default=5)
+    parser.add_argument('--fps', type=float, default=30, help='Stream frame rate used for the streams/core estimate')
+    parser.add_argument('--backend', help='Emotion runtime backend (default: EMOTION_BACKEND or keras)')
+    args = parser.parse_args()
+
+    model = load_emotion_model(args.backend, labels=emotion_labels)
+    detector = FaceDetector()
+    print(f"{'video / mode':<34} {'fps':>7} {'cpu ms/f':>9} {'streams/core':>13} "
+          f"{'presence':>9} {'IoU':>6} {'label':>6}")
+    for path in args.videos:
+        frames = read_gray_frames(path, args.max_frames)
+        if not frames:
+            print(f"{path}: no frames")
+            continue
+        reference, wall, cpu = timed(lambda: run_every_frame(frames, detector, model.predict))
+        rows = [('every frame', wall, cpu, (1.0, 1.0, 1.0))]
+        for every in args.detect_every:
+            tracker = FaceTracker(detector, model.predict, detect_every=every, classify_every=args.classify_every)
+            results, wall, cpu = timed(lambda: run_tracking(frames, tracker))
+            rows.append((f"track detect/{every} classify/{args.classify_every}", wall, cpu,
+                         agreement(reference, results)))
+
+        print(f"{path} ({len(frames)} frames)")
+        for name, wall, cpu, (presence, mean_iou, labels) in rows:
+            cpu_per_frame = cpu / len(frames)
+            print(f"  {name:<32} {len(frames) / wall:>7.1f} {cpu_per_frame * 1000:>9.2f} "
+                  f"{1 / (cpu_per_frame * args.fps):>13.1f} {presence:>9.3f} {mean_iou:>6.3f} {labels:>6.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# Run from Server/FLASK: python -m benchmarks.inference_latency
+import argparse
+import statistics
+import time
+
+import numpy as np
+from tensorflow.keras.models import load_model
+
+from ConfidenceAnalyzer.inference import EmotionModel, INPUT_SHAPE, MODEL_PATH
+
+
+def time_calls(fn, batch, iterations, warmup=5):
+    """Return per-call latencies in milliseconds"""
+    for _ in range(warmup):
+        fn(batch)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(batch)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(name, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    print(f"{name:<28} mean {statistics.mean(latencies):8.3f} ms   "
+          f"p50 {statistics.median(latencies):8.3f} ms   p99 {p99:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare model.predict against the compiled EmotionModel path')
+    parser.add_argument('--model', default=MODEL_PATH, help='Path to the Keras .h5 model')
+    parser.add_argument('--iterations', '-n', type=int, default=200, help='Timed calls per configuration')
+    parser.add_argument('--batch-sizes', default='1,8,32', help='Comma-separated batch sizes to test')
+    args = parser.parse_args()
+
+    keras_model = load_model(args.model)
+    compiled = EmotionModel(args.model)
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+        batch = np.random.rand(batch_size, *INPUT_SHAPE).astype(np.float32)
+        print(f"\nbatch size {batch_size}")
+        summarize("model.predict", time_calls(lambda x: keras_model.predict(x, verbose=0), batch, args.iterations))
+        summarize("EmotionModel.predict", time_calls(compiled.predict, batch, args.iterations))
+
+        expected = np.argmax(keras_model.predict(batch, verbose=0), axis=-1)
+        actual = np.argmax(compiled.predict(batch), axis=-1)
+        print(f"label agreement: {np.mean(expected == actual) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Run from Server/FLASK against servers that are already running, e.g.
+#   python app.py                         (Flask dev server on :5000)
+#   uvicorn asgi:app --port 8000          (ASGI mode on :8000)
+#   python -m benchmarks.load_test --file sample_resume.pdf --endpoint /analyze-resume --field resume \
+#       --target flask=http://127.0.0.1:5000 --target asgi=http://127.0.0.1:8000
+import argparse
+import mimetypes
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+
+
+def encode_multipart(field, filename, data):
+    boundary = uuid.uuid4().hex
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f'Content-Type: {content_type}\r\n\r\n'
+    ).encode() + data + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def run_level(url, body, content_type, concurrency, total):
+    """Fire total requests from concurrency threads; return latencies (s), status counts and wall time"""
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    remaining = [total]
+
+    def worker():
+        while True:
+            with lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type})
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=120) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            except Exception:
+                status = 'error'
+            elapsed = time.perf_counter() - started
+            with lock:
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sorted(latencies), statuses, time.perf_counter() - started
+
+
+def percentile(values, p):
+    if not values:
+        return float('nan')
+    return values[min(len(values) - 1, int(p * len(values)))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare concurrency and tail latency between serving modes')
+    parser.add_argument('--file', required=True, help='File to upload with every request')
+    parser.add_argument('--endpoint', default='/predict', help='Endpoint path to hit')
+    parser.add_argument('--field', default='image', help='Multipart field name for the file')
+    parser.add_argument('--target', action='append', required=True,
+                        help='name=base_url of a running server; repeat to compare')
+    parser.add_argument('--concurrency', default='1,8,32,64', help='Comma-separated client concurrency levels')
+    parser.add_argument('--requests', '-n', type=int, default=200, help='Requests per concurrency level')
+    args = parser.parse_args()
+
+    with open(args.file, 'rb') as f:
+        body, content_type = encode_multipart(args.field, os.path.basename(args.file), f.read())
+
+    print(f"{'target':<10} {'conc':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ok':>6} {'429':>5} {'err':>5}")
+    for target in args.target:
+        name, base_url = target.split('=', 1)
+        for concurrency in [int(c) for c in args.concurrency.split(',')]:
+            latencies, statuses, wall = run_level(base_url.rstrip('/') + args.endpoint, body, content_type,
+                                                  concurrency, args.requests)
+            errors = sum(n for s, n in statuses.items() if s not in (200, 429))
+            print(f"{name:<10} {concurrency:>5} {len(latencies) / wall:>8.1f} {percentile(latencies, 0.50):>9.1f} "
+                  f"{percentile(latencies, 0.95):>9.1f} {percentile(latencies, 0.99):>9.1f} "
+                  f"{statuses[200]:>6} {statuses[429]:>5} {errors:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# Run from Server/FLASK: python -m benchmarks.pdf_backends path/to/resumes/
+import argparse
+import difflib
+import glob
+import os
+import sys
+import time
+
+from AnalyzeResume.pdf_extraction import PDF_MAX_PAGES, TEXT_BACKENDS
+
+
+def similarity(a, b):
+    """Token-level similarity (0-1) so whitespace/line-break differences don't count"""
+    return difflib.SequenceMatcher(None, a.split(), b.split(), autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare PDF text backends on a corpus of resumes')
+    parser.add_argument('corpus', help='Directory (searched recursively) or glob of PDF files')
+    parser.add_argument('--max-pages', type=int, default=PDF_MAX_PAGES, help='Page cap per document')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes over the corpus per backend')
+    args = parser.parse_args()
+
+    pattern = os.path.join(args.corpus, '**', '*.pdf') if os.path.isdir(args.corpus) else args.corpus
+    paths = sorted(glob.glob(pattern, recursive=True))
+    if not paths:
+        print(f"No PDFs found in {args.corpus}")
+        return 1
+    documents = [(p, open(p, 'rb').read()) for p in paths]
+
+    texts = {name: {} for name in TEXT_BACKENDS}
+    print(f"{len(documents)} documents\n")
+    print(f"{'backend':<12} {'pages':>7} {'seconds':>9} {'pages/s':>9} {'failed':>7}")
+    for name, extract in TEXT_BACKENDS.items():
+        pages = failed = 0
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            for path, data in documents:
+                try:
+                    page_texts, _ = extract(data, args.max_pages)
+                except Exception:
+                    failed += 1
+                    continue
+                pages += len(page_texts)
+                texts[name][path] = "\n".join(page_texts)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<12} {pages:>7} {elapsed:>9.2f} {pages / elapsed:>9.1f} {failed // args.repeat:>7}")
+
+    base, fast = texts['pdfplumber'], texts['pdfium']
+    scores = sorted((similarity(base[p], fast[p]), p) for p in base if p in fast)
+    if scores:
+        mean = sum(s for s, _ in scores) / len(scores)
+        empty = sum(1 for p in fast if not fast[p].strip())
+        print(f"\ntext similarity pdfium vs pdfplumber: mean {mean:.3f}, min {scores[0][0]:.3f}")
+        print(f"documents where pdfium found no text (auto falls back): {empty}")
+        for score, path in scores[:5]:
+            print(f"  {score:.3f}  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
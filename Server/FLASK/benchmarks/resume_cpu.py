@@ -0,0 +1,106 @@
+# Run from Server/FLASK: python -m benchmarks.resume_cpu --baseline HEAD~1
+import argparse
+import importlib.util
+import json
+import subprocess
+import sys
+import time
+
+from AnalyzeResume import resume_analyzer
+
+MODULE_PATH = 'AnalyzeResume/resume_analyzer.py'
+
+SAMPLE_RESUME = """John Doe
+john.doe@example.com +1 555-123-4567 linkedin.com/in/johndoe github.com/jdoe
+Professional Summary
+Backend engineer with 6 years of experience building APIs in Python and Go.
+Experience
+Senior Engineer, Acme Corp Jan 2019 - Present
+- Developed microservices with Python, Django, Flask and Docker on AWS
+- Led a team of 5 developers; improved latency by 40%
+- Implemented CI/CD with Jenkins and Kubernetes
+Engineer, Beta Inc 2015 - 2018
+- Built REST API services in Java and Spring; managed PostgreSQL and Redis
+Skills
+Languages: Python, Java, Go, JavaScript, SQL
+Tools: Docker, Kubernetes, Terraform, Git, React, node.js, scikit-learn
+Education
+B.Tech Computer Science, State University 2011 - 2015 CGPA: 8.5
+Projects
+- Machine learning pipeline with TensorFlow and pandas
+Certifications
+AWS Certified Solutions Architect
+"""
+
+EXTRA_ROLE = """Engineer, Gamma Ltd Mar 2012 - Dec 2014
+- Designed data pipelines with Spark, Kafka and Airflow; reduced cost by $20000
+- Created dashboards in Tableau for 300 users and maintained MongoDB clusters
+"""
+
+
+def sample_resume(extra_roles):
+    """The sample resume with extra experience entries to make it longer"""
+    head, tail = SAMPLE_RESUME.split("Skills\n")
+    return head + EXTRA_ROLE * extra_roles + "Skills\n" + tail
+
+
+def load_baseline(ref):
+    """Import resume_analyzer.py as it was at a git ref, alongside the current one"""
+    source = subprocess.check_output(['git', 'show', f'{ref}:./{MODULE_PATH}'], text=True)
+    spec = importlib.util.spec_from_loader(f'resume_analyzer_{ref}', loader=None)
+    module = importlib.util.module_from_spec(spec)
+    exec(compile(source, f'{ref}:{MODULE_PATH}', 'exec'), module.__dict__)
+    return module
+
+
+def normalized(report):
+    """Report without its timestamp, with list order ignored (skills come from sets)"""
+    def norm(value):
+        if isinstance(value, dict):
+            return {k: norm(v) for k, v in value.items() if k != "analysisDate"}
+        if isinstance(value, list):
+            items = [norm(v) for v in value]
+            return sorted(items, key=lambda v: json.dumps(v, sort_keys=True))
+        return value
+    return norm(report)
+
+
+def report(module, text):
+    return module.build_full_report(text, "resume.pdf", "Backend Developer", "python docker aws")
+
+
+def cpu_ms_per_resume(module, text, iterations):
+    report(module, text)
+    started = time.process_time()
+    for _ in range(iterations):
+        report(module, text)
+    return (time.process_time() - started) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-resume CPU time of the rule-based resume report')
+    parser.add_argument('--baseline', help='Git ref of resume_analyzer.py to compare against (e.g. HEAD~1)')
+    parser.add_argument('--sizes', default='0,10,50', help='Comma-separated extra experience entries per resume')
+    parser.add_argument('--iterations', type=int, default=200, help='Reports per measurement')
+    args = parser.parse_args()
+
+    modules = {'current': resume_analyzer}
+    if args.baseline:
+        modules['baseline'] = load_baseline(args.baseline)
+
+    print(f"{'words':>6} " + ' '.join(f"{name + ' ms':>12}" for name in modules) + f" {'speedup':>8} {'same report':>12}")
+    mismatches = 0
+    for extra in [int(s) for s in args.sizes.split(',')]:
+        text = sample_resume(extra)
+        timings = {name: cpu_ms_per_resume(m, text, args.iterations) for name, m in modules.items()}
+        row = f"{len(text.split()):>6} " + ' '.join(f"{t:>12.3f}" for t in timings.values())
+        if 'baseline' in modules:
+            same = normalized(report(modules['baseline'], text)) == normalized(report(resume_analyzer, text))
+            mismatches += not same
+            row += f" {timings['baseline'] / timings['current']:>7.2f}x {'yes' if same else 'NO':>12}"
+        print(row)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# Run from Server/FLASK: python -m benchmarks.semantic_search --resumes 20000 --queries 200
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from AnalyzeResume import resume_analyzer
+from AnalyzeResume.semantic_index import HashedTfidfEncoder, VectorCollection, _hnswlib_available
+from benchmarks.batch_scoring import synthetic_resume
+
+
+def synthetic_job(rng):
+    role = rng.choice(sorted({r for roles in resume_analyzer.SKILL_TO_ROLE.values() for r in roles}))
+    skills = rng.sample(sorted(resume_analyzer.SKILL_TO_ROLE), rng.randint(3, 8))
+    return f"{role}\nWe are hiring a {role} experienced with {', '.join(skills)}."
+
+
+def measure(collection, queries, k, truth, **search_args):
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        rows, _ = collection.search(query, k, **search_args)
+        latencies.append(time.perf_counter() - started)
+        hits += len(set(rows.tolist()) & expected)
+    latencies = np.array(latencies) * 1000
+    return hits / (k * len(queries)), np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Semantic resume search: ANN recall@K and latency vs brute force')
+    parser.add_argument('--resumes', type=int, default=20000, help='Synthetic resumes indexed')
+    parser.add_argument('--queries', type=int, default=200, help='Synthetic job descriptions searched')
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--fit-sample', type=int, default=5000, help='Resumes the encoder is fitted on')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [synthetic_resume(rng, i) for i in range(args.resumes)]
+    jobs = [synthetic_job(rng) for _ in range(args.queries)]
+
+    started = time.perf_counter()
+    encoder = HashedTfidfEncoder().fit(texts[:args.fit_sample])
+    fitted = time.perf_counter() - started
+    started = time.perf_counter()
+    vectors = np.concatenate([encoder.encode(texts[i:i + 1000]) for i in range(0, len(texts), 1000)])
+    encoded = time.perf_counter() - started
+    queries = encoder.encode(jobs)
+    print(f"{encoder.name}: fitted on {min(args.fit_sample, len(texts))} in {fitted:.1f}s, "
+          f"encoded {len(texts)} resumes in {encoded:.1f}s\n")
+
+    exact = VectorCollection(vectors.shape[1], ann='exact')
+    for i, vector in enumerate(vectors):
+        exact.add(i, None, vector, rebuild=False)
+    truth = [set(exact.search(q, args.k, exact=True)[0].tolist()) for q in queries]
+
+    print(f"{'index':<24} {'build s':>8} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p99 ms':>8}")
+    recall, p50, p99 = measure(exact, queries, args.k, truth, exact=True)
+    print(f"{'brute force':<24} {'-':>8} {recall:>10.3f} {p50:>8.2f} {p99:>8.2f}")
+
+    kinds = ['ivf'] + (['hnsw'] if _hnswlib_available() else [])
+    for ann in kinds:
+        collection = VectorCollection(vectors.shape[1], ann=ann)
+        for i, vector in enumerate(vectors):
+            collection.add(i, None, vector, rebuild=False)
+        started = time.perf_counter()
+        collection.rebuild()
+        build = time.perf_counter() - started
+        for effort in ((8, 16, 32, 48) if ann == 'ivf' else (16, 64, 128)):
+            recall, p50, p99 = measure(collection, queries, args.k, truth, effort=effort)
+            label = f"{ann} {'nprobe' if ann == 'ivf' else 'ef'}={effort}"
+            print(f"{label:<24} {build:>8.2f} {recall:>10.3f} {p50:>8.2f} {p99:>8.2f}")
+    if 'hnsw' not in kinds:
+        print("(install hnswlib to compare HNSW)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
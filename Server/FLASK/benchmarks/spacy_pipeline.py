@@ -0,0 +1,80 @@
+# Run from Server/FLASK: python -m benchmarks.spacy_pipeline --resumes 500 [--model en_core_web_sm]
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from benchmarks.batch_scoring import synthetic_resume
+
+
+def child(model, components, resumes, batch_size, n_process):
+    """Load one configuration in a fresh process and time it; prints one JSON line"""
+    from model_registry import current_rss_mb
+    from AnalyzeResume import nlp as resume_nlp
+
+    rng = random.Random(0)
+    texts = [f"Jane Doe {i}\n" + synthetic_resume(rng, i) for i in range(resumes)]
+    try:
+        import spacy  # noqa: F401 - import cost is the same for both configurations
+    except ImportError:
+        pass
+    rss = current_rss_mb()
+    started = time.perf_counter()
+    nlp = resume_nlp.load_nlp(model, components)
+    if nlp is None:
+        print(json.dumps({"error": f"could not load {model}"}))
+        return 1
+    result = {"load_s": time.perf_counter() - started, "rss_mb": current_rss_mb() - rss, "pipes": nlp.pipe_names}
+
+    # Before: every resume tagged in full, one nlp() call at a time
+    started = time.perf_counter()
+    for text in texts:
+        nlp(text)
+    result["loop_full_per_s"] = len(texts) / (time.perf_counter() - started)
+
+    # After: only the header, streamed through nlp.pipe
+    started = time.perf_counter()
+    docs = nlp.pipe((text[:resume_nlp.NAME_SEARCH_CHARS] for text in texts),
+                    batch_size=batch_size, n_process=n_process)
+    for _ in docs:
+        pass
+    result["pipe_header_per_s"] = len(texts) / (time.perf_counter() - started)
+    print(json.dumps(result))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='spaCy load cost and throughput: full pipeline vs configured components')
+    parser.add_argument('--model', default=os.environ.get('SPACY_MODEL', 'en_core_web_sm'))
+    parser.add_argument('--components', default='ner', help='Configured components to compare with the full pipeline')
+    parser.add_argument('--resumes', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.model, args.child, args.resumes, args.batch_size, args.n_process)
+
+    print(f"{args.model}, {args.resumes} resumes, nlp.pipe batch_size={args.batch_size} n_process={args.n_process}\n")
+    print(f"{'components':<12} {'load s':>7} {'RSS +MB':>8} {'loop full/s':>12} {'pipe header/s':>14}  pipes")
+    for components in ('all', args.components):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.spacy_pipeline', '--child', components, '--model', args.model,
+             '--resumes', str(args.resumes), '--batch-size', str(args.batch_size), '--n-process', str(args.n_process)],
+            capture_output=True, text=True
+        ).stdout.strip().splitlines()
+        result = json.loads(output[-1]) if output else {"error": "no output"}
+        if "error" in result:
+            print(f"{components:<12} {result['error']}")
+            continue
+        print(f"{components:<12} {result['load_s']:>7.2f} {result['rss_mb']:>8.1f} {result['loop_full_per_s']:>12.0f} "
+              f"{result['pipe_header_per_s']:>14.0f}  {','.join(result['pipes'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
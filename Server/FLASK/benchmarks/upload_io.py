@@ -0,0 +1,105 @@
+# Run from Server/FLASK: python -m benchmarks.upload_io --concurrency 16
+import argparse
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from flask import Flask, jsonify, request
+
+from AnalyzeResume.pdf_extraction import read_source
+from app import SpooledUploadRequest
+
+
+def process_io_counters():
+    """Bytes written/read at the storage layer and write syscalls for this process (Linux)"""
+    counters = {}
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                name, value = line.split(':')
+                counters[name] = int(value)
+    except OSError:
+        pass
+    return counters
+
+
+def make_app(upload_dir):
+    """Both upload paths with identical (trivial) processing, so only the I/O differs"""
+    bench = Flask(__name__)
+    bench.request_class = SpooledUploadRequest
+
+    @bench.route('/disk', methods=['POST'])
+    def disk():
+        # Previous behaviour: save under uploads/ and reopen by path
+        file = request.files['file']
+        path = os.path.join(upload_dir, f"{threading.get_ident()}-{file.filename}")
+        file.save(path)
+        return jsonify({'sha256': hashlib.sha256(read_source(path)).hexdigest()})
+
+    @bench.route('/spooled', methods=['POST'])
+    def spooled():
+        file = request.files['file']
+        return jsonify({'sha256': hashlib.sha256(read_source(file.stream)).hexdigest()})
+
+    return bench
+
+
+def run(client_app, route, payload, requests_total, concurrency):
+    errors = []
+
+    def worker(count):
+        client = client_app.test_client()
+        for _ in range(count):
+            response = client.post(route, data={'file': (io.BytesIO(payload), 'resume.pdf')})
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    per_thread = requests_total // concurrency
+    threads = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(concurrency)]
+    before = process_io_counters()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    after = process_io_counters()
+    delta = {k: after.get(k, 0) - before.get(k, 0) for k in ('write_bytes', 'syscw')}
+    return per_thread * concurrency / elapsed, delta, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upload handling cost: save-to-disk vs spooled in memory')
+    parser.add_argument('--pdf', help='Upload payload (default: 200 KB of random bytes)')
+    parser.add_argument('--requests', type=int, default=2000, help='Total uploads per mode')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client threads')
+    parser.add_argument('--upload-dir', default='uploads-bench',
+                        help='Directory for the disk mode; use a real disk, not tmpfs, for realistic numbers')
+    args = parser.parse_args()
+
+    payload = open(args.pdf, 'rb').read() if args.pdf else os.urandom(200 * 1024)
+    created_dir = not os.path.isdir(args.upload_dir)
+    os.makedirs(args.upload_dir, exist_ok=True)
+    upload_dir = tempfile.mkdtemp(dir=args.upload_dir)
+    try:
+        bench = make_app(upload_dir)
+        print(f"{len(payload) // 1024} KB uploads, {args.requests} requests, {args.concurrency} threads\n")
+        print(f"{'mode':<9} {'req/s':>8} {'MB written':>11} {'write calls':>12} {'files left':>11} {'errors':>7}")
+        for route in ('/disk', '/spooled'):
+            files_before = len(os.listdir(upload_dir))
+            rate, io_delta, errors = run(bench, route, payload, args.requests, args.concurrency)
+            files_left = len(os.listdir(upload_dir)) - files_before
+            print(f"{route[1:]:<9} {rate:>8.0f} {io_delta['write_bytes'] / 1e6:>11.1f} "
+                  f"{io_delta['syscw']:>12} {files_left:>11} {errors:>7}")
+    finally:
+        shutil.rmtree(args.upload_dir if created_dir else upload_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# Run from Server/FLASK: python -m benchmarks.video_scoring --video interview.mp4 --sample-fps 1 2 5
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from ConfidenceAnalyzer.face_pipeline import FaceDetector, crop_faces
+from ConfidenceAnalyzer.inference import EMOTION_LABELS, load_emotion_model
+from ConfidenceAnalyzer.video_scoring import sample_frames, score_video, video_info
+
+
+def sequential(video, detector, predict, sample_fps):
+    """Reference: read every frame in one thread, one predict() per sampled face"""
+    fps, frame_count = video_info(video)
+    wanted = set(sample_frames(fps, frame_count, sample_fps).tolist())
+    capture = cv2.VideoCapture(video)
+    started, index = time.perf_counter(), 0
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        if index in wanted:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            boxes = detector.detect(gray)[:1]
+            if len(boxes):
+                np.argmax(predict(crop_faces(gray, boxes)))
+        index += 1
+    capture.release()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline video scoring: sequential read vs sampled, pipelined')
+    parser.add_argument('--video', required=True, help='Recorded interview video')
+    parser.add_argument('--sample-fps', type=float, nargs='+', default=[1, 2, 5])
+    parser.add_argument('--decode-workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--backend', help='Emotion runtime backend (default: EMOTION_BACKEND or keras)')
+    args = parser.parse_args()
+
+    model = load_emotion_model(args.backend)
+    detector = FaceDetector()
+    fps, frame_count = video_info(args.video)
+    duration = frame_count / fps
+    print(f"{args.video}: {duration:.1f} s, {frame_count} frames at {fps:.1f} fps\n")
+    print(f"{'sample fps':>10} {'mode':<20} {'seconds':>8} {'x realtime':>11} {'with face':>10}")
+    for sample_fps in args.sample_fps:
+        seconds = sequential(args.video, detector, model.predict, sample_fps)
+        print(f"{sample_fps:>10} {'sequential':<20} {seconds:>8.2f} {duration / seconds:>11.1f} {'':>10}")
+        for workers in args.decode_workers:
+            result = score_video(args.video, model.predict, EMOTION_LABELS, sample_fps=sample_fps,
+                                 decode_workers=workers, detector=detector)
+            seconds = result['processing']['seconds']
+            print(f"{sample_fps:>10} {f'pipelined x{workers}':<20} {seconds:>8.2f} {duration / seconds:>11.1f} "
+                  f"{result['samplesWithFace']:>6}/{result['samples']:<3}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# Run from Server/FLASK: python -m benchmarks.worker_memory --launch --workers 8
+# or against a running server: python -m benchmarks.worker_memory --pid <gunicorn master pid>
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+def smaps_rollup(pid):
+    """Return memory counters (MB) for one process from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[-1] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+
+    private = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    shared = fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)
+    return {'rss': fields.get('Rss', 0), 'pss': fields.get('Pss', 0), 'uss': private, 'shared': shared}
+
+
+def child_pids(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(p) for p in f.read().split()]
+
+
+def report(master_pid):
+    print(f"{'process':<16} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9} {'shared MB':>10}")
+    master = smaps_rollup(master_pid)
+    print(f"{'master ' + str(master_pid):<16} {master['rss']:>9.1f} {master['pss']:>9.1f} "
+          f"{master['uss']:>9.1f} {master['shared']:>10.1f}")
+
+    totals = {'rss': master['rss'], 'pss': master['pss']}
+    workers = child_pids(master_pid)
+    for pid in workers:
+        m = smaps_rollup(pid)
+        totals['rss'] += m['rss']
+        totals['pss'] += m['pss']
+        print(f"{'worker ' + str(pid):<16} {m['rss']:>9.1f} {m['pss']:>9.1f} {m['uss']:>9.1f} {m['shared']:>10.1f}")
+
+    # PSS sums to the real footprint; RSS double-counts shared pages
+    print(f"\n{len(workers)} workers: total PSS {totals['pss']:.1f} MB (naive RSS sum {totals['rss']:.1f} MB)")
+
+
+def warm(url, paths):
+    """Hit endpoints so lazily loaded models are resident before measuring"""
+    for path in paths:
+        try:
+            urllib.request.urlopen(url + path, timeout=30).read()
+        except Exception as e:
+            print(f"warm-up {path}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report per-worker unique vs shared memory (USS/PSS)')
+    parser.add_argument('--pid', type=int, help='PID of a running gunicorn master')
+    parser.add_argument('--launch', action='store_true', help='Start gunicorn with gunicorn.conf.py and measure it')
+    parser.add_argument('--workers', type=int, default=8, help='Workers to launch with --launch')
+    parser.add_argument('--bind', default='127.0.0.1:5055', help='Bind address for --launch')
+    parser.add_argument('--settle', type=float, default=20.0, help='Seconds to wait for workers to boot')
+    args = parser.parse_args()
+
+    if not args.pid and not args.launch:
+        parser.error('pass --pid or --launch')
+
+    if args.pid:
+        report(args.pid)
+        return 0
+
+    env = dict(os.environ, GUNICORN_WORKERS=str(args.workers), GUNICORN_BIND=args.bind)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'], env=env)
+    try:
+        time.sleep(args.settle)
+        warm(f"http://{args.bind}", ['/predict/stats'] * args.workers)
+        report(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class Overloaded(Exception):
+    """Raised when a BoundedExecutor has no free worker or queue slot"""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} pool is saturated")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool that rejects work instead of queueing it forever.
+
+    At most max_workers tasks run and max_queue more wait; submit() raises
+    Overloaded beyond that so callers can shed load (e.g. HTTP 429) rather
+    than let latency grow without bound.
+    """
+
+    def __init__(self, name, max_workers, max_queue, processes=False, retry_after=1):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self._pool = pool_cls(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise Overloaded(self.name, self.retry_after)
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'maxWorkers': self.max_workers,
+                'maxQueue': self.max_queue,
+                'inFlight': self._in_flight,
+                'queued': max(0, self._in_flight - self.max_workers),
+                'rejected': self._rejected,
+            }
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,40 @@
+# Pre-forked multi-worker deployment. Run from Server/FLASK:
+#   pip install gunicorn
+#   gunicorn -c gunicorn.conf.py app:app
+#
+# Fork-safe artifacts (sklearn pickles, spaCy) are loaded once in the master
+# and inherited copy-on-write by every worker. The emotion model is loaded per
+# worker after fork; with the TFLite backend its weights are mmapped from the
+# .tflite file, so all workers share the same page-cache pages.
+# Use benchmarks/worker_memory.py to check per-worker USS/PSS.
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ConfidenceAnalyzer.inference import BACKEND_MODEL_PATHS
+from model_registry import registry
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 8))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+
+# app.py warms PRELOAD_MODELS at import, which happens in the master here
+os.environ.setdefault('PRELOAD_MODELS', ','.join(registry.fork_safe_names()))
+if os.path.exists(BACKEND_MODEL_PATHS['tflite']):
+    os.environ.setdefault('EMOTION_BACKEND', 'tflite')
+    os.environ.setdefault('EMOTION_TFLITE_SHARED_WEIGHTS', '1')
+
+
+def when_ready(server):
+    # Move everything the master has loaded into the permanent GC generation.
+    # Otherwise the collector in each worker writes to those objects' headers
+    # and gradually un-shares their pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    registry.warm_up(os.environ.get('WORKER_PRELOAD_MODELS', 'emotion'))
@@ -0,0 +1,162 @@
+import importlib
+import logging
+import pickle
+import threading
+import time
+
+logger = logging.getLogger('model_registry')
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (Linux /proc, falls back to peak RSS)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class ModelRegistry:
+    """
+    Named model artifacts that are loaded on first use.
+
+    Each artifact is registered with a zero-argument loader. get() runs the
+    loader at most once, even under concurrent requests, so a worker only
+    pays for the models it actually serves. warm_up() lets a worker preload
+    a known set of models at boot instead.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._instances = {}
+        self._locks = {}
+        self._load_times = {}
+        self._fork_safe = set()
+
+    def register(self, name, loader, fork_safe=True):
+        """fork_safe marks artifacts that may be loaded in a pre-fork master and shared copy-on-write"""
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+        if fork_safe:
+            self._fork_safe.add(name)
+
+    def names(self):
+        return list(self._loaders)
+
+    def fork_safe_names(self):
+        return [name for name in self._loaders if name in self._fork_safe]
+
+    def is_loaded(self, name):
+        return name in self._instances
+
+    def get(self, name):
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            if name not in self._instances:
+                started = time.perf_counter()
+                self._instances[name] = self._loaders[name]()
+                self._load_times[name] = time.perf_counter() - started
+                logger.info(f"Loaded {name} in {self._load_times[name]:.2f}s")
+        return self._instances[name]
+
+    def warm_up(self, names=None):
+        """Preload the given models (comma-separated string or list); all models if 'all'"""
+        if isinstance(names, str):
+            names = [n.strip() for n in names.split(',') if n.strip()]
+        if names == ['all']:
+            names = self.names()
+        for name in names or []:
+            self.get(name)
+
+    def load_times(self):
+        return {name: round(seconds, 3) for name, seconds in self._load_times.items()}
+
+
+def _load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _load_emotion_model():
+    from ConfidenceAnalyzer.inference import load_emotion_model
+    return load_emotion_model()
+
+
+def _load_spacy():
+    # Only the components in SPACY_COMPONENTS are loaded, none by default (see AnalyzeResume.nlp)
+    from AnalyzeResume.nlp import load_nlp
+    return load_nlp()
+
+
+def _load_face_detector():
+    from ConfidenceAnalyzer.face_pipeline import FaceDetector
+    return FaceDetector()
+
+
+registry = ModelRegistry()
+# TensorFlow/onnxruntime start thread pools that don't survive fork(), so the
+# emotion model is always loaded inside the worker process
+registry.register('emotion', _load_emotion_model, fork_safe=False)
+registry.register('role_vectorizer', lambda: _load_pickle("models/vectorizer.pkl"))
+registry.register('role_classifier', lambda: _load_pickle("models/logistic_model.pkl"))
+registry.register('spacy', _load_spacy)
+# Cheap to load; kept per worker so OpenCV's thread pool starts after fork
+registry.register('face_detector', _load_face_detector, fork_safe=False)
+
+# Modules timed by --profile-startup, in import order
+STARTUP_COMPONENTS = [
+    'numpy',
+    'flask',
+    'ConfidenceAnalyzer.inference',
+    'resume_analyzer.analyzer',
+    'AnalyzeResume.resume_analyzer',
+    'app',
+]
+
+
+def profile_startup(models=None):
+    """Print import time per component and load time/RSS growth per model. Run in a fresh process."""
+    print(f"{'component':<40} {'seconds':>8} {'RSS +MB':>9}")
+    for module in STARTUP_COMPONENTS:
+        rss = current_rss_mb()
+        started = time.perf_counter()
+        importlib.import_module(module)
+        print(f"{'import ' + module:<40} {time.perf_counter() - started:>8.3f} {current_rss_mb() - rss:>9.1f}")
+
+    for name in models or registry.names():
+        rss = current_rss_mb()
+        try:
+            registry.get(name)
+        except Exception as e:
+            print(f"{'load ' + name:<40} failed: {e}")
+            continue
+        print(f"{'load ' + name:<40} {registry.load_times()[name]:>8.3f} {current_rss_mb() - rss:>9.1f}")
+
+    print(f"{'total RSS':<40} {'':>8} {current_rss_mb():>9.1f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect model loading for the Flask service')
+    parser.add_argument('--profile-startup', action='store_true', help='Report import and load time per component')
+    parser.add_argument('--models', help='Comma-separated models to load (default: all)')
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        # Go through the importable module so app.py shares this registry
+        import model_registry
+        model_registry.profile_startup(args.models.split(',') if args.models else None)
+    else:
+        parser.print_help()
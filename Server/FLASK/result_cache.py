@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from AnalyzeResume.pdf_extraction import PDF_MAX_PAGES, PDF_TEXT_BACKEND, PdfExtractionError, read_source
+
+logger = logging.getLogger('result_cache')
+
+# In-memory entries per process (0 disables the cache)
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 256))
+# Seconds an entry stays valid (0 keeps entries until evicted by size)
+RESULT_CACHE_TTL = float(os.environ.get('RESULT_CACHE_TTL', 24 * 3600))
+# Optional SQLite file shared by all workers, e.g. cache/results.sqlite3
+RESULT_CACHE_DB = os.environ.get('RESULT_CACHE_DB', '')
+RESULT_CACHE_DB_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_DB_MAX_ENTRIES', 10000))
+
+
+class ResultCache:
+    """
+    Two-tier cache of JSON-serializable values.
+
+    An LRU dict per process in front of an optional SQLite table (values
+    stored as zlib-compressed JSON) that survives restarts and is shared by
+    every worker. Entries expire after ttl seconds; each tier evicts its least
+    recently used entries beyond its size limit.
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL, db_path=RESULT_CACHE_DB,
+                 db_max_entries=RESULT_CACHE_DB_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.db_max_entries = db_max_entries
+        self._reset()
+        self._counters = dict.fromkeys(['memoryHits', 'diskHits', 'misses', 'expired', 'evictions', 'puts'], 0)
+        # A forked worker must open its own SQLite connection
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._db = None
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def _expired(self, created, now):
+        return self.ttl > 0 and now - created > self.ttl
+
+    def _connection(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+        return self._db
+
+    def get(self, key):
+        """Cached value or None"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self._counters['memoryHits'] += 1
+                    return value
+                # The disk copy (if any) has the same age and is dropped below
+                del self._memory[key]
+                if not self.db_path:
+                    self._counters['expired'] += 1
+
+            if self.db_path:
+                value = self._disk_get(key, now)
+                if value is not None:
+                    self._counters['diskHits'] += 1
+                    return value
+            self._counters['misses'] += 1
+        return None
+
+    def _disk_get(self, key, now):
+        try:
+            db = self._connection()
+            row = db.execute('SELECT value, created FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            blob, created = row
+            if self._expired(created, now):
+                db.execute('DELETE FROM results WHERE key = ?', (key,))
+                db.commit()
+                self._counters['expired'] += 1
+                return None
+            db.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache read failed: {e}")
+            return None
+        value = json.loads(zlib.decompress(blob))
+        self._memory_put(key, created, value)
+        return value
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._counters['puts'] += 1
+            self._memory_put(key, now, value)
+            if self.db_path:
+                self._disk_put(key, now, value)
+
+    def _memory_put(self, key, created, value):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _disk_put(self, key, now, value):
+        blob = zlib.compress(json.dumps(value).encode('utf-8'))
+        try:
+            db = self._connection()
+            db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)', (key, blob, now, now))
+            if self.ttl > 0:
+                db.execute('DELETE FROM results WHERE created < ?', (now - self.ttl,))
+            excess = db.execute('SELECT COUNT(*) FROM results').fetchone()[0] - self.db_max_entries
+            if excess > 0:
+                db.execute(
+                    'DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed LIMIT ?)',
+                    (excess,)
+                )
+                self._counters['evictions'] += excess
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.db_path:
+                db = self._connection()
+                db.execute('DELETE FROM results')
+                db.commit()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._memory)
+        lookups = counters['memoryHits'] + counters['diskHits'] + counters['misses']
+        return {
+            'enabled': self.enabled,
+            'maxEntries': self.max_entries,
+            'ttlSeconds': self.ttl,
+            'entries': entries,
+            'disk': bool(self.db_path),
+            **counters,
+            'hitRatio': round((counters['memoryHits'] + counters['diskHits']) / lookups, 3) if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+    return _cache
+
+
+def cache_key(*parts):
+    """Stable key for JSON-serializable parts (digests, versions, parameters)"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def cached_text(data, extract_text, cache=None):
+    """Extracted text of PDF bytes, reusing earlier extractions; raises PdfExtractionError"""
+    cache = cache or get_cache()
+    text_key = cache_key('text', PDF_TEXT_BACKEND, PDF_MAX_PAGES, hashlib.sha256(data).hexdigest())
+    text = cache.get(text_key)
+    if text is None:
+        text = extract_text(data)
+        cache.put(text_key, text)
+    return text
+
+
+def cached_analysis(source, analyzer, version, extract_text, analyze_text, params=None, cache=None):
+    """
+    Run extract_text(bytes) -> text and analyze_text(text) -> result for an
+    uploaded PDF, reusing earlier work for identical bytes.
+
+    Results are keyed by the SHA-256 of the upload, the analyzer name and
+    version, and params (e.g. job title). Extracted text is cached separately,
+    keyed by the upload alone, so a new job title only reruns the scoring.
+    Error results are not cached.
+    """
+    cache = cache or get_cache()
+    data = read_source(source)
+    digest = hashlib.sha256(data).hexdigest()
+
+    result_key = cache_key('result', analyzer, version, digest, params or {})
+    result = cache.get(result_key)
+    if result is not None:
+        return result
+
+    try:
+        text = cached_text(data, extract_text, cache)
+    except PdfExtractionError as e:
+        logger.error(f"Error extracting text from PDF: {e.message}")
+        return e.to_dict()
+
+    result = analyze_text(text)
+    if "error" not in result:
+        cache.put(result_key, result)
+    return result
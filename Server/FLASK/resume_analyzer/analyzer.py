@@ -1,18 +1,12 @@
-import pdfplumber
 import re
-import pickle
 import os
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.linear_model import LogisticRegression
+from model_registry import registry
+from AnalyzeResume.pdf_extraction import PdfExtractionError, extract_pdf
 
+# Pre-trained vectorizer/classifier are loaded lazily through the registry
 
-
-# Load pre-trained models
-with open("models/vectorizer.pkl", "rb") as f:
-    vectorizer = pickle.load(f)
-
-with open("models/logistic_model.pkl", "rb") as f:
-    model = pickle.load(f)
+# Bump when results change so cached results are not reused
+ANALYZER_VERSION = "1"
 
 # Skill-to-role mapping
 skill_to_role_mapping = {
@@ -59,12 +53,8 @@ def has_linkedin(text):
     return bool(re.search(pattern, text.lower()))
 
 def extract_text_from_pdf(pdf_path):
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            return '\n'.join(page.extract_text() or '' for page in pdf.pages)
-    except Exception as e:
-        print(f"Error extracting text: {e}")
-        return ""
+    # Runs in a worker process with a hard timeout; raises PdfExtractionError
+    return extract_pdf(pdf_path)["text"]
 
 
 def extract_skills(text):
@@ -149,7 +139,15 @@ def format_score_breakdown(skills):
 
 
 def analyze_resume(pdf_path):
-    resume_text = extract_text_from_pdf(pdf_path)
+    try:
+        resume_text = extract_text_from_pdf(pdf_path)
+    except PdfExtractionError as e:
+        print(f"Error extracting text: {e}")
+        return e.to_dict()
+    return analyze_resume_text(resume_text)
+
+
+def analyze_resume_text(resume_text):
     if not resume_text:
         return {"error": "Empty resume text extracted"}
 
@@ -157,6 +155,8 @@ def analyze_resume(pdf_path):
     skill_categories = categorize_skills(skills)
     suggested_roles = predict_roles(skills)
 
+    vectorizer = registry.get('role_vectorizer')
+    model = registry.get('role_classifier')
     resume_vector = vectorizer.transform([" ".join(skills)]) if skills else vectorizer.transform([resume_text])
     predicted_role = model.predict(resume_vector)[0]
 
@@ -11,55 +11,45 @@ const handleScreenshotUpload = async (req, res) => {
 
         console.log(`✅ Received ${req.files.length} images`);
 
-        let emotions = [];
+        // ✅ Send every screenshot in one request so Flask scores them as a single batch
+        const form = new FormData();
+        const filepaths = req.files.map(file => path.join(__dirname, '../uploads/screenshots', file.filename));
+        filepaths.forEach(filepath => form.append('images', fs.createReadStream(filepath)));
 
-        for (const file of req.files) {
-            const filepath = path.join(__dirname, '../uploads/screenshots', file.filename);
-            const form = new FormData();
-            form.append('image', fs.createReadStream(filepath));
+        let score = { mostCommonEmotion: null, confidence: null, emotionBreakdown: {} };
 
-            try {
-                const response = await axios.post('http://localhost:5000/predict', form, {
-                    headers: form.getHeaders(),
-                });
+        try {
+            const response = await axios.post('http://localhost:5000/predict-batch', form, {
+                headers: form.getHeaders(),
+                maxBodyLength: Infinity,
+            });
 
-                const emotion = response.data.emotion;
-                console.log(`📸 ${file.filename} → 😐 ${emotion}`);
-                emotions.push(emotion);
-            } catch (err) {
-                console.error(`❌ Failed to process ${file.filename}`, err);
+            for (const prediction of response.data.predictions) {
+                console.log(`📸 ${prediction.filename} → 😐 ${prediction.emotion}`);
             }
+            // ✅ Flask scores the batch (most common emotion → 1-5 confidence)
+            const { mostCommonEmotion, confidence, emotionBreakdown } = response.data;
+            score = { mostCommonEmotion, confidence, emotionBreakdown };
+        } catch (err) {
+            console.error(`❌ Failed to process ${req.files.length} images`, err);
+        }
 
-            // ✅ Delete file after it's been sent and processed
+        // ✅ Delete files after they've been sent and processed
+        for (const filepath of filepaths) {
             fs.unlink(filepath, (err) => {
                 if (err) {
-                    console.error(`❌ Failed to delete ${file.filename}`, err);
+                    console.error(`❌ Failed to delete ${path.basename(filepath)}`, err);
                 } else {
-                    console.log(`🧹 Deleted ${file.filename}`);
+                    console.log(`🧹 Deleted ${path.basename(filepath)}`);
                 }
             });
         }
 
-        // Emotion analysis
-        const emotionCount = {};
-        for (let emo of emotions) {
-            emotionCount[emo] = (emotionCount[emo] || 0) + 1;
-        }
-
-        const mostCommon = Object.entries(emotionCount).reduce((a, b) => a[1] > b[1] ? a : b)[0];
-
-        let confidence;
-        if (mostCommon === 'happy') confidence = 5;
-        else if (mostCommon === 'neutral') confidence = 4;
-        else if (mostCommon === 'surprise') confidence = 3;
-        else if (['angry', 'disgust'].includes(mostCommon)) confidence = 2;
-        else confidence = 1;
-
         res.status(200).json({
             message: 'Emotions processed',
-            mostCommonEmotion: mostCommon,
-            confidence,
-            emotionBreakdown: emotionCount
+            mostCommonEmotion: score.mostCommonEmotion,
+            confidence: score.confidence,
+            emotionBreakdown: score.emotionBreakdown
         });
 
     } catch (error) {